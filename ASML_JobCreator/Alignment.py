@@ -163,6 +163,337 @@ class Alignment(object):
     #end add_strategy()
     
     
+    def optimize_Strategy(self, ID, num=4, backups=0, marks=None, required_marks=None):
+        """
+        Create a new Alignment Strategy, choosing the preferred & backup Marks that give the best geometric spread over the wafer.
+        
+        Subsets of `num` Marks are scored by the sum of an angular-spread term (1 minus the largest angular gap between the marks, as a fraction of 360 degrees) and a radial term (mean mark radius, as a fraction of the wafer radius).  Every pair of preferred Marks must be at least `Defaults.AlignmentStrategy_MIN_MARK_DISTANCE_COARSE` apart, and at least one pair must be `Defaults.AlignmentStrategy_MIN_MARK_DISTANCE` apart - the values written to the WFR_ALIGN_STRATEGY section.
+        All subsets are grown together as arrays, one Mark at a time, dropping those that break the distance rule or that can't beat the best score found so far.  Backup Marks are then chosen one at a time, farthest from the Marks already chosen.
+        
+        Parameters
+        ----------
+        ID : string
+            Name of the new Strategy.
+        
+        num : int, optional
+            Number of preferred Marks. Defaults to 4.
+        
+        backups : int, optional
+            Number of backup Marks. Defaults to 0.
+        
+        marks : iterable of Mark objects, optional
+            Marks to choose from.  Defaults to all Marks in this Alignment, `MarkList`.
+        
+        required_marks : int, optional
+            Passed to `Strategy.set_required_marks()`. Defaults to `num`.
+        
+        Returns
+        -------
+        Strategy object, added to this Alignment.
+        
+        Raises
+        ------
+        ValueError : if there are not enough Marks, or no subset of Marks satisfies the distance rules.
+        """
+        marks = self.MarkList if marks is None else list(marks)
+        num, backups = int(num), int(backups)
+        if num < 1 or len(marks) < num + backups:
+            errstr = "optimize_Strategy(): Need %i Marks (%i preferred + %i backup), but %i Marks were provided." % ( num+backups, num, backups, len(marks) )
+            raise ValueError(errstr)
+        
+        # sort Marks by radius, largest first, for bounding the radial term:
+        XY = np.array( [m.waferXY for m in marks], dtype=float )
+        order = np.argsort( -np.hypot(XY[:,0], XY[:,1]), kind='stable' )
+        marks, XY = [marks[i] for i in order], XY[order]
+        M = len(marks)
+        theta = np.arctan2( XY[:,1], XY[:,0] )
+        Rnorm = np.hypot( XY[:,0], XY[:,1] ) / ( self.parent.get_WaferDiameter()/2.0 )
+        csum = np.concatenate( ([0.0], np.cumsum(Rnorm)) )
+        dist = np.hypot( XY[:,0,None] - XY[None,:,0], XY[:,1,None] - XY[None,:,1] )
+        pairOK = dist >= self.parent.defaults.AlignmentStrategy_MIN_MARK_DISTANCE_COARSE
+        
+        def score(sets):
+            # angular + radial spread score for each row of `sets`
+            t = np.sort( theta[sets], axis=1 )
+            gaps = np.diff( np.concatenate( (t, t[:,:1] + 2*pi), axis=1 ), axis=1 )
+            return ( 1.0 - gaps.max(axis=1)/(2*pi) ) + Rnorm[sets].mean(axis=1)
+        #end score()
+        
+        def spanOK(sets):
+            # whether any pair in each row of `sets` is MIN_MARK_DISTANCE apart
+            d = dist[ sets[:,:,None], sets[:,None,:] ].reshape(len(sets), -1)
+            return d.max(axis=1) >= self.parent.defaults.AlignmentStrategy_MIN_MARK_DISTANCE
+        #end spanOK()
+        
+        ## Starting score to beat, from a greedy pick of the largest-radius Marks:
+        best = -np.inf
+        greedy = [0]
+        for j in range(1, M):
+            if len(greedy) == num: break
+            if np.all( pairOK[greedy, j] ): greedy.append(j)
+        if len(greedy) == num and spanOK( np.array([greedy]) )[0]:
+            best = score( np.array([greedy]) )[0]
+        
+        ## Grow all subsets one Mark at a time:
+        best_ang = 1.0 - 1.0/num    # angular term for evenly spaced marks
+        sets = np.arange(M).reshape(-1,1)
+        for k in range(1, num):
+            ok = np.all( pairOK[sets], axis=1 ) & ( np.arange(M)[None,:] > sets[:,-1:] )
+            i, j = np.nonzero(ok)
+            sets = np.column_stack( (sets[i], j) )
+            # prune subsets that can't be completed, or can't beat `best`:
+            rem = num - k - 1
+            last = sets[:,-1]
+            bound = best_ang + ( Rnorm[sets].sum(axis=1) + csum[np.minimum(last+1+rem, M)] - csum[last+1] ) / num
+            sets = sets[ (last + rem < M) & (bound >= best - 1e-9) ]
+            if DEBUG(): print( "optimize_Strategy(): %i subsets of %i Marks" % (len(sets), k+1) )
+        #end for(k)
+        
+        if len(sets):
+            sets = sets[ spanOK(sets) ] if num > 1 else sets
+        if len(sets) == 0:
+            errstr = "optimize_Strategy(): No set of %i Marks meets the minimum mark distances (%0.1f mm between all marks, %0.1f mm between any two)." % ( num, self.parent.defaults.AlignmentStrategy_MIN_MARK_DISTANCE_COARSE, self.parent.defaults.AlignmentStrategy_MIN_MARK_DISTANCE )
+            raise ValueError(errstr)
+        chosen = [ int(i) for i in sets[ np.argmax( score(sets) ) ] ]
+        
+        ## Backup Marks, farthest from those already chosen:
+        backup = []
+        for n in range(backups):
+            dmin = np.min( dist[:, chosen + backup], axis=1 )
+            dmin[ chosen + backup ] = -np.inf
+            backup.append( int(np.argmax(dmin)) )
+        #end for(backups)
+        
+        S = Strategy( ID, parent=self )
+        S.add_mark( *[marks[i] for i in chosen], preference="preferred" )
+        if backup:
+            S.add_mark( *[marks[i] for i in backup], preference="backup" )
+        S.set_required_marks( num if required_marks is None else required_marks )
+        if DEBUG(): print( "optimize_Strategy(): Strategy `%s` uses Marks" % S.get_ID(), [m.MarkID for m in S.MarkList] )
+        return S
+    #end optimize_Strategy()
+
+
+
+    ##############################################
+    #       Mark Placement
+    ##############################################
+    def find_MarkLocations(self, num=4, MarkType="PM", radii=None, angles=72, lanes=True, clearance=0.5, min_distance=None, layers=None):
+        """
+        Find wafer locations for new alignment marks that do not collide with any distributed Image, existing Mark or the wafer edge clearance.
+        
+        A spatial index (`geomlib.GridIndex`) of all Image footprints, from `Image.get_distribution()` and `Image.sizeXY`, is built once.  Candidate locations on concentric rings and (optionally) in the lanes between Cells are then tested against it all at once.  Locations are chosen greedily: the candidate at the largest radius first, then each following location maximizes it's distance to those already chosen, giving a good spread around the wafer.
+        
+        Parameters
+        ----------
+        num : int, optional
+            Number of mark locations to find. Defaults to 4.
+        
+        MarkType : {"PM", "SPM_X", "SPM_Y"}, optional
+            Type of mark to be placed, used for the mark size. Defaults to "PM".  See `help(Mark.set_marktype)`.
+        
+        radii : iterable of floats, optional
+            Radii (mm) of the candidate rings. Defaults to rings spaced by 1mm, from the wafer center to the edge clearance.
+        
+        angles : int, optional
+            Number of candidate locations on each ring. Defaults to 72 (every 5 degrees).
+        
+        lanes : { True | False }, optional
+            Also try the corners and edge-centers of every Cell, which lie in the lanes between Cells. Defaults to True.
+        
+        clearance : float, optional
+            Minimum spacing (mm) to keep between a mark and any Image or Mark. Defaults to 0.5mm.
+        
+        min_distance : float, optional
+            Minimum distance (mm) between chosen mark locations. Defaults to `Defaults.AlignmentStrategy_MIN_MARK_DISTANCE_COARSE`.
+        
+        layers : Layer object or list of Layer objects, optional
+            Only avoid Images exposed on these Layers. Defaults to None, avoiding all exposed Images.
+        
+        Returns
+        -------
+        waferXY : float array, shape (num,2)
+            Wafer [X,Y] coordinates of the chosen mark locations.  May contain less than `num` locations if not enough space was found.
+        
+        Examples
+        --------
+        >>> for i,XY in enumerate( MyJob.Alignment.find_MarkLocations(num=4) ):
+        >>>     MyJob.Alignment.Mark( "M%i"%i, "PM", waferXY=XY )
+        """
+        from . import Images    # Image library from ./Images/
+        from .geomlib import get_ShotRects, GridIndex
+        
+        MarkImg = {"pm":Images.PM, "spm_x":Images.SPM_X, "spm_y":Images.SPM_Y}.get( str(MarkType).strip().lower().replace("-","_") )
+        if MarkImg is None:
+            errstr = "Passed argument option `%s` is not in the list of valid options, which are:\n\t" % (MarkType) + str(["PM", "SPM_X", "SPM_Y"])
+            raise ValueError(errstr)
+        half = np.asarray(MarkImg.sizeXY, dtype=float)/2.0 + clearance
+        if min_distance is None: min_distance = self.parent.defaults.AlignmentStrategy_MIN_MARK_DISTANCE_COARSE
+        
+        Job = self.parent
+        r_max = Job.get_WaferDiameter()/2.0 - Job.Cell.get_RoundEdgeClearance()
+        
+        ## Candidate locations:
+        if radii is None: radii = np.arange( 1.0, r_max, 1.0 )
+        radii = np.asarray(radii, dtype=float)
+        phi = np.linspace( 0, 2*pi, int(angles), endpoint=False )
+        cand = [ np.column_stack( ( np.outer(radii, np.cos(phi)).ravel(), np.outer(radii, np.sin(phi)).ravel() ) ) ]
+        if lanes:
+            CellSize = np.asarray( Job.Cell.get_CellSize(), dtype=float )
+            MatrixShift = np.asarray( Job.Cell.get_MatrixShift(), dtype=float )
+            N = np.ceil( r_max / CellSize ).astype(int) + 1
+            hx = np.arange( -2*N[0], 2*N[0]+1 ) * CellSize[0]/2.0 + MatrixShift[0]   # cell centers & edges
+            hy = np.arange( -2*N[1], 2*N[1]+1 ) * CellSize[1]/2.0 + MatrixShift[1]
+            HX, HY = np.meshgrid(hx, hy)
+            onlane = ( np.arange(len(hx)) % 2 == 1 )[None,:] | ( np.arange(len(hy)) % 2 == 1 )[:,None]  # not a cell center
+            cand.append( np.column_stack( (HX[onlane], HY[onlane]) ) )
+        cand = np.concatenate(cand)
+        
+        ## Keep candidates fully inside the edge clearance:
+        cx = cand[:,0,None] + np.array([-half[0], half[0], -half[0], half[0]])
+        cy = cand[:,1,None] + np.array([-half[1], -half[1], half[1], half[1]])
+        inside = np.all( cx*cx + cy*cy < r_max*r_max, axis=1 ) & np.all( cy > Job.Cell.get_FlatEdgeClearanceY(), axis=1 )
+        cand = cand[inside]
+        
+        ## Remove candidates overlapping Images or existing Marks:
+        centers, halfsizes = get_ShotRects(Job, layers=layers)[0:2]
+        if self.MarkList:
+            centers = np.concatenate( (centers, [m.waferXY for m in self.MarkList]) )
+            halfsizes = np.concatenate( (halfsizes, [np.asarray(m.Image.sizeXY)/2.0 for m in self.MarkList]) )
+        index = GridIndex( centers[:,0]-halfsizes[:,0], centers[:,1]-halfsizes[:,1], centers[:,0]+halfsizes[:,0], centers[:,1]+halfsizes[:,1], binsize=max(Job.Cell.get_CellSize()) )
+        hit = index.any_overlap( cand[:,0]-half[0], cand[:,1]-half[1], cand[:,0]+half[0], cand[:,1]+half[1] )
+        cand = cand[~hit]
+        if DEBUG(): print( "find_MarkLocations(): %i free candidate locations" % len(cand) )
+        
+        ## Greedy farthest-point selection:
+        chosen = []
+        if len(cand):
+            r = np.hypot( cand[:,0], cand[:,1] )
+            existing = np.array( [m.waferXY for m in self.MarkList], dtype=float ).reshape(-1,2)
+            if len(existing):
+                dmin = np.min( np.hypot( cand[:,0,None] - existing[:,0], cand[:,1,None] - existing[:,1] ), axis=1 )
+            else:
+                dmin = np.full( len(cand), np.inf )
+            for n in range( int(num) ):
+                score = np.where( np.isinf(dmin), r, dmin + 1e-3*r )   # radius breaks ties
+                score[ dmin < min_distance ] = -np.inf
+                best = np.argmax(score)
+                if not np.isfinite( score[best] ): break
+                chosen.append( cand[best] )
+                dmin = np.minimum( dmin, np.hypot( cand[:,0] - cand[best,0], cand[:,1] - cand[best,1] ) )
+            #end for(num)
+        #end if(cand)
+        
+        if len(chosen) < num:
+            if WARN(): print( "WARNING: find_MarkLocations(): only found %i of %i mark locations." % ( len(chosen), num ) )
+        return np.array(chosen, dtype=float).reshape(-1,2)
+    #end find_MarkLocations()
+    
+    
+    
+    ##############################################
+    #       Optical Prealignment
+    ##############################################
+    def check_PreAlignLocation(self, waferXY, markXY=None):
+        """
+        Return whether the given wafer location(s) are allowed for Optical Prealignment marks. All locations are evaluated at once.
+        
+        A location is allowed if all four corners of the mark lie outside of the angular sectors unreachable by the prealignment camera (see `Defaults.AlignmentMark_PreAlignLocation_ExcludedAngles`), outside of the minimum radius `Defaults.AlignmentMark_PreAlignLocation_MinRadius`, and inside of the round & flat edge clearances of the Cell structure.
+        
+        Parameters
+        ----------
+        waferXY : two-valued iterable, or array-like of shape (N,2)
+            Wafer [X,Y] coordinates of the mark center(s), relative to wafer center.
+        
+        markXY : two-valued iterable, optional
+            Size [X,Y] of the mark, in mm.  Defaults to the size of the Primary Mark, `Images.PM`.
+        
+        Returns
+        -------
+        allowed : boolean ndarray of shape (N,)
+            True for each location allowed for prealignment.
+        """
+        if markXY is None:
+            from . import Images    # Image library from ./Images/
+            markXY = Images.PM.sizeXY
+        XY = np.asarray(waferXY, dtype=float).reshape(-1,2)
+        dx, dy = markXY[0]/2.0, markXY[1]/2.0
+        
+        # mark corners, shape (N,4):
+        X = XY[:,0,None] + np.array([-dx, dx, -dx, dx])
+        Y = XY[:,1,None] + np.array([-dy, -dy, dy, dy])
+        
+        # angle folded into first quadrant, 0-90 degrees:
+        theta = np.abs( np.rad2deg( np.arctan2(Y, X) ) )
+        theta = np.minimum( theta, 180.0 - theta )
+        A1, A2 = self.parent.defaults.AlignmentMark_PreAlignLocation_ExcludedAngles
+        bad = (theta >= A1) & (theta <= A2)
+        
+        r2 = X*X + Y*Y
+        r_min = self.parent.defaults.AlignmentMark_PreAlignLocation_MinRadius # mm
+        r_max = self.parent.get_WaferDiameter()/2 - self.parent.Cell.get_RoundEdgeClearance()
+        bad |= (r2 <= r_min*r_min) | (r2 >= r_max*r_max)
+        bad |= ( Y <= self.parent.Cell.get_FlatEdgeClearanceY() )
+        
+        return ~np.any(bad, axis=1)
+    #end check_PreAlignLocation()
+    
+    
+    def get_PreAlignmentMap(self, resolution=0.5, markXY=None):
+        """
+        Evaluate `check_PreAlignLocation()` on a dense grid of points covering the wafer, to find the regions allowed for Optical Prealignment marks.
+        
+        Parameters
+        ----------
+        resolution : float, optional
+            Grid spacing in mm. Defaults to 0.5mm.
+        
+        markXY : two-valued iterable, optional
+            Size [X,Y] of the mark, in mm.  Defaults to the size of the Primary Mark, `Images.PM`.
+        
+        Returns
+        -------
+        X, Y : 1-D float arrays
+            Wafer X and Y coordinates of the grid points.
+        allowed : 2-D boolean array of shape (len(Y), len(X))
+            True where the grid point is an allowed prealignment mark location.
+        """
+        R = self.parent.get_WaferDiameter()/2.0
+        X = np.arange( -R, R + resolution/2.0, resolution )
+        Y = np.arange( -R, R + resolution/2.0, resolution )
+        XX, YY = np.meshgrid(X, Y)
+        allowed = self.check_PreAlignLocation( np.column_stack( (XX.ravel(), YY.ravel()) ), markXY=markXY )
+        if DEBUG(): print( "get_PreAlignmentMap(): %i of %i grid points allowed" % ( np.count_nonzero(allowed), allowed.size ) )
+        return X, Y, allowed.reshape( XX.shape )
+    #end get_PreAlignmentMap()
+    
+    
+    def get_PreAlignmentPairs(self, marks=None):
+        """
+        Return all pairs of Marks that can be used together for Optical Prealignment, via `Layer.set_PreAlignment()`.  Both Marks must be in allowed prealignment locations (see `check_PreAlignLocation()`), and on opposite sides of the wafer (angular separation greater than `Defaults.AlignmentMark_PreAlignLocation_MinSeparation`).
+        
+        Parameters
+        ----------
+        marks : iterable of Mark objects, optional
+            Marks to choose from.  Defaults to all Marks in this Alignment, `MarkList`.
+        
+        Returns
+        -------
+        pairs : list of two-valued tuples of Mark objects
+        """
+        marks = self.MarkList if marks is None else list(marks)
+        if len(marks) < 2: return []
+        XY = np.array( [m.waferXY for m in marks], dtype=float )
+        allowed = np.array( [ self.check_PreAlignLocation(m.waferXY, markXY=m.Image.sizeXY)[0] for m in marks ] )
+        
+        theta = np.rad2deg( np.arctan2(XY[:,1], XY[:,0]) )
+        dtheta = np.abs( theta[:,None] - theta[None,:] )
+        dtheta = np.minimum( dtheta, 360.0 - dtheta )
+        ok = ( dtheta > self.parent.defaults.AlignmentMark_PreAlignLocation_MinSeparation ) & allowed[:,None] & allowed[None,:]
+        
+        i, j = np.nonzero( np.triu(ok, k=1) )
+        return [ (marks[a], marks[b]) for a,b in zip(i,j) ]
+    #end get_PreAlignmentPairs()
     
     
   
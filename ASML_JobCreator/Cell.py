@@ -34,9 +34,14 @@ class Cell(object):
     def __init__(self, parent=None):
         '''Creates empty object.'''
         self.parent = parent    # parent Job object
-        self.RoundEdgeClearance = Defaults.ROUND_EDGE_CLEARANCE
-        self.FlatEdgeClearance = Defaults.FLAT_EDGE_CLEARANCE
-        self.EdgeExclusion = Defaults.EDGE_EXCLUSION
+        self.RoundEdgeClearance = self.parent.defaults.ROUND_EDGE_CLEARANCE
+        self.FlatEdgeClearance = self.parent.defaults.FLAT_EDGE_CLEARANCE
+        self.EdgeExclusion = self.parent.defaults.EDGE_EXCLUSION
+        # None: use the Defaults when first needed, see the `get_*()` methods:
+        self.CellSize = None
+        self.MatrixShift = None
+        self.NumberDiePerCell = None
+        self.MinNumberDie = None
     #end __init__
     
     
@@ -67,8 +72,8 @@ class Cell(object):
     def set_CellSize(self, xy=[10,10] ):
         '''Set the Cell Size in millimeters, [x,y].'''
         if len(xy)==2: 
-            if (xy[0] < Defaults.Cell_MinCellSize) or (xy[1] < Defaults.Cell_MinCellSize):
-                raise ValueError( "Cell size [%f,%f]mm " %( xy[0], xy[1]) + "is too small, minimum is %f mm." % (Defaults.Cell_MinCellSize)  )
+            if (xy[0] < self.parent.defaults.Cell_MinCellSize) or (xy[1] < self.parent.defaults.Cell_MinCellSize):
+                raise ValueError( "Cell size [%f,%f]mm " %( xy[0], xy[1]) + "is too small, minimum is %f mm." % (self.parent.defaults.Cell_MinCellSize)  )
             self.CellSize = (xy[0], xy[1])
         else:
             raise ValueError("Expected x,y pair of numbers, instead got: " + str(xy))
@@ -76,12 +81,10 @@ class Cell(object):
     
     def get_CellSize(self):
         '''Return Cell Size in mm, as two-valued list.'''
-        try:
-            return self.CellSize
-        except AttributeError:
+        if self.CellSize is None:
             if WARN(): print("Cell: Using default values for `CellSize`.")
-            self.set_CellSize( Defaults.CELL_SIZE)
-            return self.CellSize
+            self.set_CellSize( self.parent.defaults.CELL_SIZE)
+        return self.CellSize
     #end
     
     
@@ -95,12 +98,10 @@ class Cell(object):
     
     def get_MatrixShift(self):
         '''Return Cell Matrix Shift in mm, as two-valued list.'''
-        try:
-            return self.MatrixShift
-        except AttributeError:
+        if self.MatrixShift is None:
             if WARN(): print("Cell: Using default values for `MatrixShift`.")
-            self.set_MatrixShift( Defaults.MATRIX_SHIFT )
-            return self.MatrixShift
+            self.set_MatrixShift( self.parent.defaults.MATRIX_SHIFT )
+        return self.MatrixShift
     #end
     
     
@@ -118,12 +119,10 @@ class Cell(object):
     
     def get_NumberDiePerCell(self):
         '''Return Number of Die per Cell, as two-valued Col/Row list.'''
-        try:
-            return self.NumberDiePerCell
-        except AttributeError:
+        if self.NumberDiePerCell is None:
             if WARN(): print("Cell: Using default values for `NumberDiePerCell`.")
-            self.NumberDiePerCell =  Defaults.NUMBER_DIES
-            return self.NumberDiePerCell
+            self.NumberDiePerCell =  self.parent.defaults.NUMBER_DIES
+        return self.NumberDiePerCell
     #end
     
     
@@ -139,12 +138,10 @@ class Cell(object):
     
     def get_MinNumberDie(self):
         '''Return Minimum Number of Die on the wafer to force exposure.'''
-        try:
-            return self.MinNumberDie
-        except AttributeError:
+        if self.MinNumberDie is None:
             if WARN(): print("Cell: Using default values for `MinNumberDie`.")
-            self.MinNumberDie =  Defaults.MIN_NUMBER_DIES
-            return self.MinNumberDie
+            self.MinNumberDie =  self.parent.defaults.MIN_NUMBER_DIES
+        return self.MinNumberDie
     #end
     
     
@@ -169,6 +166,11 @@ class Cell(object):
         return self.FlatEdgeClearance
     #end
     
+    def get_FlatEdgeClearanceY(self):
+        '''Return the Y-coordinate of the wafer flat edge clearance, in mm - any point below this is invalid. Uses the Round & Flat Edge Clearances, and the flat or notch of the Job's WaferProfile.'''
+        return self.parent.get_WaferProfile().get_FlatY( self.get_RoundEdgeClearance(), self.get_FlatEdgeClearance() )
+    #end get_FlatEdgeClearanceY()
+    
     
     
     def set_EdgeExclusion(self, mm):
@@ -254,7 +256,7 @@ class Cell(object):
             XY[ii] = XY[ii] * cellSize[ii]          # scale to mm
             XY[ii] = XY[ii] - cellSize[ii]/2        # shift back to cell-center reference
 
-        if DEBUG(): print("wafer X,Y = ", waferXY[0] , waferXY[1] )
+        if DEBUG(): print("wafer X,Y = ", WaferXY[0] , WaferXY[1] )
         if DEBUG(): print("C,R scaled = ", CR_[0], CR_[1] )
         if DEBUG(): print("C,R round  = ", CR[0], CR[1] )
         if DEBUG(): print("cell X,Y = ", XY[0], XY[1] )
@@ -266,9 +268,9 @@ class Cell(object):
     def get_ValidCells( self ):
         '''Return on-wafer Cells, for use in Image.distribute().
     
-        Uses CellSize, MatrixShift, and RoundEdgeClearance.
+        Uses CellSize, MatrixShift, and RoundEdgeClearance, on the Job's wafer (see `Job.set_WaferProfile()`).
         Accounts for FlatEdgeClearance (wafer flat exclusion), ExposeEdgeDie (shoot die that are partially on-wafer)
-        Not yet able to be passed directly to Image.distribute(get_valid_cells()).  Currently must iterate through valid_cells and pass each [col,row] to Image.distribute().
+        Cells are listed in a spiral order, outward from the center column/row - see `iter_ValidCells()` for other orders.  The table of valid Cells is cached per Cell structure by `WaferProfile.get_ValidCellTable()`.
         
         Parameters
         ----------
@@ -279,81 +281,330 @@ class Cell(object):
         valid_cells: a List of valid cell indices (indices are two-valued Lists of [col,row]).
     
         Contributed by Miguel Daal 2022, Ben Mazin group, U.California Santa Barbara, Physics Dept.'''
-    
-        #from numpy import floor, array, linalg.norm
-        import numpy as np
-    
-        #find whole die
-        cell_x, cell_y = self.get_CellSize()
-        matrix_shift_x, matrix_shift_y = self.get_MatrixShift()
-        wafer_diameter = self.parent.get_WaferDiameter() - 2*self.get_RoundEdgeClearance()
-        wafer_flat_clearance = self.get_FlatEdgeClearance()
-    
-        max_num_cell_x = np.floor(wafer_diameter/cell_x)   
-        max_num_cell_y = np.floor(wafer_diameter/cell_y)
-    
-        def get_cell_vertices(index_i, index_j):
-                '''
-                Given the  cell center point (center_x, center_y) and the matrix shift (matrix_shift_x, matrix_shift_y)
-                return the four vertices of the cell as a list of numpy arrays in order: [UL, UR, LL, LR] (meaning "Upper/Lower + Left/Right").
-                '''
-                UL = np.array([cell_x/2,cell_y/2]) + np.array([index_i*cell_x, index_j*cell_y]) + np.array([matrix_shift_x, matrix_shift_y])
-                UR = np.array([-cell_x/2, cell_y/2]) + np.array([index_i*cell_x, index_j*cell_y]) + np.array([matrix_shift_x, matrix_shift_y])
-                LL = np.array([-cell_x/2, -cell_y/2]) + np.array([index_i*cell_x, index_j*cell_y]) + np.array([matrix_shift_x, matrix_shift_y])
-                LR= np.array([cell_x/2, -cell_y/2]) + np.array([index_i*cell_x, index_j*cell_y]) + np.array([matrix_shift_x, matrix_shift_y])
-                return [UL, UR, LL, LR]
-        #end get_cell_vertices()
-        
-        def get_flat_edge_clearance_y():
-            ''' return a y-coordinate representing the bottom wafer flat edge clearance - any point below this is invalid.'''
-            F = Defaults.WFR_FLAT_LENGTH    # wafer flat length, mm
-            D = Defaults.WFR_DIAMETER   # wafer diameter, mm
-            Fc = F - self.get_FlatEdgeClearance()
-            Dc = D - 2*self.get_RoundEdgeClearance()
-            #Arc Angles:
-            if Defaults.WFR_NOTCH.upper() == "N":
-                Ac = np.rad2deg(  np.arcsin( (Fc/2) / (Dc/2) )  ) # arc angle corresponding to 1/2 of wafer flat clearance
-            else:
-                Ac = 2
-            return -1 * np.cos( np.deg2rad(Ac) ) * (Dc/2)
-        #end get_flat_edge_clearance_y()
-        flat_edge_clearance_y = get_flat_edge_clearance_y()
-        
-        valid_cells = []
-        cell_index_i = 0
-        cell_index_j = 0
-        cell_count_i = 0
-        cell_count_j = 0
-        sign_i = -1
-        sign_j = -1
-    
-        while cell_index_i < max_num_cell_x+1:
-            while cell_index_j < max_num_cell_y+1:
-                vertices = get_cell_vertices(cell_index_i, cell_index_j)
-                if self.parent.ExposeEdgeDie == False:
-                    if not np.any(np.linalg.norm(vertices, axis = 1) > wafer_diameter/2):
-                        if not np.any( [y for x,y in vertices] < flat_edge_clearance_y):
-                            valid_cells.append([cell_index_i, cell_index_j])
-                elif self.parent.ExposeEdgeDie == True:
-                    if np.any( np.linalg.norm(vertices, axis = 1) <= wafer_diameter/2 ):
-                        if np.any( [y for x,y in vertices] >= flat_edge_clearance_y ):
-                            valid_cells.append([cell_index_i, cell_index_j])
-                
-                cell_count_j += 1
-                sign_j *= -1
-                cell_index_j = cell_index_j + cell_count_j * sign_j
-            cell_count_i += 1
-            sign_i *= -1
-            cell_index_i = cell_index_i + cell_count_i * sign_i
-            cell_index_j = 0
-            cell_count_j = 0
-            sign_j = -1
-        #end while(cell_index)
-    
-        return  valid_cells 
+        return list( self.iter_ValidCells() )
     #end get_valid_cells()
     
     
+    def get_ValidCellMap(self, MatrixShift=None):
+        '''Return the on-wafer Cells as a boolean grid, instead of the list from `get_ValidCells()`.
+        Applies the same Round/FlatEdgeClearance and ExposeEdgeDie rules, vectorized over all Cells - see `geomlib.valid_cell_map()`.  Tables are cached, see `WaferProfile.get_ValidCellTable()`; the returned arrays are read-only.
+        
+        Parameters
+        ----------
+        MatrixShift : 2-valued iterable of floats, optional
+            Matrix Shift [X,Y] to evaluate, in mm.  Defaults to the current `get_MatrixShift()`.
+        
+        Returns
+        -------
+        cols, rows : int arrays
+            Cell column & row indices.
+        valid : bool array, shape (len(cols), len(rows))
+            True for each valid Cell, `valid[i,j]` corresponding to Cell [cols[i], rows[j]].
+        '''
+        if MatrixShift is None: MatrixShift = self.get_MatrixShift()
+        return self.parent.get_WaferProfile().get_ValidCellTable( self.get_CellSize(), MatrixShift, self.get_RoundEdgeClearance(), self.get_FlatEdgeClearance(), self.parent.ExposeEdgeDie, defaults=self.parent.defaults )
+    #end get_ValidCellMap()
+    
+    
+    def optimize_MatrixShift(self, resolution=0.1, processes=None, apply=False):
+        '''Find the Matrix Shift that fits the most valid Cells on the wafer.
+        Every shift on a grid with spacing `resolution` is tested, over one Cell period (-CellSize/2 to +CellSize/2) - any other shift is equivalent to one of these with the Cell indices renumbered.  Ties are broken by choosing the shift closest to [0,0].
+        
+        Parameters
+        ----------
+        resolution : float, or 2-valued iterable of floats, optional
+            Spacing of the candidate shifts in mm, as one value or [X,Y].  Defaults to 0.1 mm.
+        
+        processes : int, optional
+            If greater than 1, split the candidate shifts among this many worker processes.  Defaults to None, evaluate in this process.
+            Scripts using this on Windows/Mac OS must call it from within an `if __name__ == '__main__':` block.
+        
+        apply : { True | False }, optional
+            If True, set the Matrix Shift to the best shift found, with `set_MatrixShift()`.  Defaults to False.
+        
+        Returns
+        -------
+        best : 2-valued list of floats
+            The Matrix Shift [X,Y] with the most valid Cells.
+        shiftX, shiftY : float arrays
+            The candidate X and Y shifts tested.
+        counts : int array, shape (len(shiftY), len(shiftX))
+            Number of valid Cells for each candidate shift.
+        '''
+        from .geomlib import _count_valid_cells
+        
+        cell = np.asarray( self.get_CellSize(), dtype=float )
+        res = np.broadcast_to( np.asarray(resolution, dtype=float), (2,) )
+        if np.any(res <= 0):
+            raise ValueError( "optimize_MatrixShift(): `resolution` must be > 0, got " + str(resolution) )
+        n = np.maximum( np.round( cell/res ).astype(int), 1 )
+        shiftX = -cell[0]/2 + np.arange(n[0]) * cell[0]/n[0]
+        shiftY = -cell[1]/2 + np.arange(n[1]) * cell[1]/n[1]
+        SX, SY = np.meshgrid( shiftX, shiftY )
+        shifts = np.column_stack( (SX.ravel(), SY.ravel()) )
+        
+        D = self.parent.get_WaferDiameter() - 2*self.get_RoundEdgeClearance()
+        N = ( int(np.floor(D/cell[0])), int(np.floor(D/cell[1])) )
+        args = [ cell, None, self.parent.get_WaferDiameter(), self.get_RoundEdgeClearance(), self.get_FlatEdgeClearanceY(), self.parent.ExposeEdgeDie, N ]
+        
+        if processes is not None and processes > 1 and len(shifts) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            chunks = np.array_split( shifts, min(processes, len(shifts)) )
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                counts = np.concatenate( list( pool.map( _count_valid_cells, [ tuple(args[:1] + [c] + args[2:]) for c in chunks ] ) ) )
+        else:
+            counts = _count_valid_cells( tuple(args[:1] + [shifts] + args[2:]) )
+        #end if(processes)
+        counts = counts.reshape( SX.shape )
+        
+        # most Cells, then closest to zero shift:
+        cand = np.flatnonzero( counts.ravel() == counts.max() )
+        i = cand[ np.argmin( np.hypot( shifts[cand,0], shifts[cand,1] ) ) ]
+        best = [ round(float(shifts[i,0]), 6), round(float(shifts[i,1]), 6) ]
+        if DEBUG(): print( "optimize_MatrixShift(): best shift", best, "gives %i Cells (from %i to %i over %i shifts)." % (counts.max(), counts.min(), counts.max(), counts.size) )
+        
+        if apply: self.set_MatrixShift( best )
+        return best, shiftX, shiftY, counts
+    #end optimize_MatrixShift()
+
+
+    def get_DieMap(self, min_fraction=1.0, MatrixShift=None):
+        '''Return a Die-level map of the wafer: every Die of every Cell that is at least partly on the wafer, with the fraction of its area inside the Round/FlatEdgeClearance.
+        Each Cell is divided into `get_NumberDiePerCell()` Die.  Area fractions are exact, see `geomlib.die_area_map()`.
+        
+        Parameters
+        ----------
+        min_fraction : float, optional
+            Die with at least this on-wafer area fraction are marked valid.  Defaults to 1.0, only Die entirely on the wafer.
+        
+        MatrixShift : 2-valued iterable of floats, optional
+            Matrix Shift [X,Y] to evaluate, in mm.  Defaults to the current `get_MatrixShift()`.
+        
+        Returns
+        -------
+        XY : float array, shape (M,2)
+            Wafer-coordinates [X,Y] of each Die center, in mm.
+        cellCR : int array, shape (M,2)
+            Cell [col,row] containing each Die.
+        dieCR : int array, shape (M,2)
+            Die [col,row] within its Cell, from 0 at the Cell's lower-left.
+        fraction : float array, shape (M,)
+            On-wafer area fraction of each Die, 0 to 1.
+        valid : bool array, shape (M,)
+            True for Die with `fraction >= min_fraction`.
+        '''
+        from .geomlib import die_area_map
+        if MatrixShift is None: MatrixShift = self.get_MatrixShift()
+        cell = np.asarray( self.get_CellSize(), dtype=float )
+        nd = np.asarray( self.get_NumberDiePerCell(), dtype=int )
+        cols, rows, frac = die_area_map( cell, nd, MatrixShift, self.parent.get_WaferDiameter(), self.get_RoundEdgeClearance(), self.get_FlatEdgeClearanceY() )
+        
+        i, a, j, b = np.nonzero( frac > 0 )
+        cellCR = np.column_stack( (cols[i], rows[j]) ).astype(np.int32)
+        dieCR = np.column_stack( (a, b) ).astype(np.int32)
+        XY = np.asarray(MatrixShift, dtype=float) + cellCR * cell - cell/2 + (dieCR + 0.5) * cell/nd
+        fraction = frac[i, a, j, b]
+        return XY, cellCR, dieCR, fraction, fraction >= min_fraction
+    #end get_DieMap()
+
+
+    def get_CoverMap(self, MatrixShift=None):
+        '''Predict which Cells the stepper will expose, from the Cell Structure written to the job: CellSize, MatrixShift, NumberDiePerCell, MinNumberDie & Round/FlatEdgeClearance.
+        Models `COVER_MODE` "W" (the only mode written by this package, `Defaults.COVER_MODE`): each Cell is divided into `NumberDiePerCell` Die, and the Cell is exposed if at least `MinNumberDie` of those Die lie entirely within the edge clearances.  With `Job.set_ExposeEdgeDie()` (50x50 Die, minimum 1), a Cell is therefore exposed if any 1/50th of it is on the wafer.
+        Evaluated for all Cells at once, see `geomlib.die_count_map()`.
+        
+        Parameters
+        ----------
+        MatrixShift : 2-valued iterable of floats, optional
+            Matrix Shift [X,Y] to evaluate, in mm.  Defaults to the current `get_MatrixShift()`.
+        
+        Returns
+        -------
+        cols, rows : int arrays
+            Cell column & row indices.
+        exposed : bool array, shape (len(cols), len(rows))
+            True for each Cell predicted to be exposed.
+        dies : int array, shape (len(cols), len(rows))
+            Number of Die of each Cell within the edge clearances.
+        '''
+        from .geomlib import die_count_map
+        if self.parent.defaults.COVER_MODE != "W":
+            if WARN(): print( "get_CoverMap(): Prediction assumes COVER_MODE 'W', but `Defaults.COVER_MODE` is '%s'." % self.parent.defaults.COVER_MODE )
+        if MatrixShift is None: MatrixShift = self.get_MatrixShift()
+        cols, rows, dies = die_count_map( self.get_CellSize(), self.get_NumberDiePerCell(), MatrixShift, self.parent.get_WaferDiameter(), self.get_RoundEdgeClearance(), self.get_FlatEdgeClearanceY() )
+        return cols, rows, dies >= max( self.get_MinNumberDie(), 1 ), dies
+    #end get_CoverMap()
+    
+    
+    def predict_Shots(self, layers=None):
+        '''Predict the shots the stepper will make for each Layer, using the Cells predicted to be exposed by `get_CoverMap()`.  Image distributions in Cells that are not covered are skipped by the stepper.
+        
+        Parameters
+        ----------
+        layers : Layer object or list of Layer objects, optional
+            Layers to predict.  Defaults to all Layers in the Job.
+        
+        Returns
+        -------
+        shots : dict
+            Number of shots exposed on each Layer, keyed by LayerID.
+        skipped : list of tuples
+            (Layer, Image, [col,row]) for each distributed Image that will not be exposed.
+        '''
+        cols, rows, exposed, dies = self.get_CoverMap()
+        if layers is None: layers = self.parent.LayerList
+        if not np.iterable(layers): layers = [layers]
+        
+        shots, skipped = {}, []
+        for L in layers:
+            shots[L.get_LayerID()] = 0
+            for I in L.ImageList:
+                if not I.Cells: continue
+                CR = np.asarray( I.Cells, dtype=int ).reshape(-1,2)
+                i, j = CR[:,0] - cols[0], CR[:,1] - rows[0]
+                inside = (i >= 0) & (i < len(cols)) & (j >= 0) & (j < len(rows))
+                ok = np.zeros( len(CR), dtype=bool )
+                ok[inside] = exposed[ i[inside], j[inside] ]
+                shots[L.get_LayerID()] += int( ok.sum() )
+                skipped.extend( (L, I, list(I.Cells[k])) for k in np.flatnonzero(~ok) )
+            #end for(ImageList)
+        #end for(layers)
+        if DEBUG(): print( "predict_Shots(): shots per Layer", shots, "; %i distributions skipped." % len(skipped) )
+        return shots, skipped
+    #end predict_Shots()
+
+
+    def plan_Layout(self, CellSizes, NumberDiePerCell=None, MinNumberDie=None, MatrixShift=None, processes=None):
+        '''Compare Cell layouts by the number of usable Die they put on the wafer.
+        Every combination of the given Cell sizes, Die per Cell and Minimum Number of Die is evaluated against this Job's wafer diameter, RoundEdgeClearance & FlatEdgeClearance.  A Die is usable if it lies entirely within the clearances, and a Cell is exposed if it contains at least `MinNumberDie` usable Die.  Results are cached for the session, keyed by the geometry, so repeated or overlapping sweeps only evaluate new layouts.
+        
+        Parameters
+        ----------
+        CellSizes : iterable
+            Cell sizes to test, each a float (square Cell) or [X,Y] pair, in mm.
+        
+        NumberDiePerCell : iterable of 2-valued iterables of ints, optional
+            Die per Cell [Cols,Rows] to test.  Defaults to the current `get_NumberDiePerCell()`.
+        
+        MinNumberDie : iterable of ints, optional
+            Minimum Number of Die values to test.  Defaults to the current `get_MinNumberDie()`.  Values larger than the number of Die per Cell are skipped.
+        
+        MatrixShift : 2-valued iterable of floats, optional
+            Matrix Shift [X,Y] in mm.  Defaults to the current `get_MatrixShift()`.
+        
+        processes : int, optional
+            If greater than 1, evaluate the layouts in this many worker processes.  Defaults to None, evaluate in this process.
+            Scripts using this on Windows/Mac OS must call it from within an `if __name__ == '__main__':` block.
+        
+        Returns
+        -------
+        table : numpy structured array, one row per layout, sorted by most Die then fewest Cells.  Fields are:
+            'CellSize' (2 floats), 'NumberDiePerCell' (2 ints), 'MinNumberDie', 'DieSize' (2 floats), 'Cells' (number of exposed Cells), 'Die' (number of usable Die).
+        
+        Examples
+        --------
+        >>> table = MyJob.Cell.plan_Layout( CellSizes=[10, 12, [15,10]], NumberDiePerCell=[[1,1],[2,2],[4,4]], MinNumberDie=[1,4] )
+        >>> best = table[0]
+        >>> MyJob.Cell.set_CellSize( best['CellSize'] )
+        '''
+        from .geomlib import _plan_layout, _LayoutCache
+        
+        if NumberDiePerCell is None: NumberDiePerCell = [ self.get_NumberDiePerCell() ]
+        if MinNumberDie is None: MinNumberDie = [ self.get_MinNumberDie() ]
+        if MatrixShift is None: MatrixShift = self.get_MatrixShift()
+        shift = ( float(MatrixShift[0]), float(MatrixShift[1]) )
+        D = float( self.parent.get_WaferDiameter() )
+        REC = float( self.get_RoundEdgeClearance() )
+        flatY = float( self.get_FlatEdgeClearanceY() )
+        
+        layouts = []
+        for cs in CellSizes:
+            cs = np.broadcast_to( np.asarray(cs, dtype=float), (2,) )
+            if np.any( cs < self.parent.defaults.Cell_MinCellSize ):
+                raise ValueError( "plan_Layout(): Cell size [%f,%f]mm " %( cs[0], cs[1]) + "is too small, minimum is %f mm." % (self.parent.defaults.Cell_MinCellSize) )
+            for nd in NumberDiePerCell:
+                nd = ( int(nd[0]), int(nd[1]) )
+                for mn in MinNumberDie:
+                    if int(mn) > nd[0]*nd[1]: continue
+                    layouts.append( ( (float(cs[0]), float(cs[1])), nd, shift, D, REC, flatY, None, int(mn) ) )
+        #end for(CellSizes)
+        layouts = list( dict.fromkeys(layouts) )    # remove duplicates, keep order
+        
+        todo = [ L for L in layouts if L not in _LayoutCache ]
+        if DEBUG(): print( "plan_Layout(): evaluating %i of %i layouts (%i cached)." % (len(todo), len(layouts), len(layouts)-len(todo)) )
+        if processes is not None and processes > 1 and len(todo) > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list( pool.map( _plan_layout, todo, chunksize=max(1, len(todo)//(4*processes)) ) )
+        else:
+            results = [ _plan_layout(L) for L in todo ]
+        #end if(processes)
+        _LayoutCache.update( zip(todo, results) )
+        
+        dtype = [ ('CellSize', float, 2), ('NumberDiePerCell', int, 2), ('MinNumberDie', int), ('DieSize', float, 2), ('Cells', int), ('Die', int) ]
+        table = np.array( [ ( L[0], L[1], L[-1], (L[0][0]/L[1][0], L[0][1]/L[1][1]) ) + _LayoutCache[L] for L in layouts ], dtype=dtype )
+        return table[ np.lexsort( (table['Cells'], -table['Die']) ) ]
+    #end plan_Layout()
+
+
+    def iter_ValidCells(self, order="spiral", where=None, mask=None):
+        '''Iterate over the on-wafer Cells one at a time, in a chosen order, without building the list of Cells.
+        Validity is the same as `get_ValidCells()`.  The order of iteration is the order in which distributions are added by `Image.distribute()`, and so the order of the IMAGE_DISTRIBUTION sections in the exported job.
+        
+        Parameters
+        ----------
+        order : { "spiral" | "raster" | "serpentine" }, optional
+            "spiral" : outward from the center column/row, alternating sides - the same order as `get_ValidCells()`.  Default.
+            "raster" : row by row from the bottom (flat) up, left to right in each row.
+            "serpentine" : row by row from the bottom up, alternating left-to-right and right-to-left, for the shortest stage travel.
+        
+        where : function, optional
+            Only yield Cells for which `where( [col,row] )` returns True.
+        
+        mask : CellMask object, optional
+            Only yield Cells selected in this mask.  See `help(asml.CellMask)`.
+        
+        Returns
+        -------
+        Generator, yielding [col,row] lists of integers.
+        
+        Examples
+        --------
+        >>> for cr in MyJob.Cell.iter_ValidCells( order="serpentine", where=lambda cr: cr[0] % 4 == 0 ):
+        ...     ImageA.distribute( cr )
+        '''
+        cols, rows, valid = self.get_ValidCellMap()
+        N0, N1 = int(cols[-1]), int(rows[-1])
+        
+        def spiral(n):
+            # 0, 1, -1, 2, -2, ... n, -n
+            yield 0
+            for k in range(1, n+1):
+                yield k
+                yield -k
+        #end spiral()
+        
+        if order == "spiral":
+            cells = ( (c, r) for c in spiral(N0) for r in spiral(N1) )
+        elif order == "raster":
+            cells = ( (c, r) for r in range(-N1, N1+1) for c in range(-N0, N0+1) )
+        elif order == "serpentine":
+            cells = ( (c, r) for k, r in enumerate( range(-N1, N1+1) ) for c in ( range(-N0, N0+1) if k%2 == 0 else range(N0, -N0-1, -1) ) )
+        else:
+            raise ValueError( 'iter_ValidCells(): Unrecognized `order` "%s", expected "spiral", "raster" or "serpentine".' % order )
+        #end if(order)
+        
+        def generate():
+            for c, r in cells:
+                if not valid[c + N0, r + N1]: continue
+                if (mask is not None) and ( [c, r] not in mask ): continue
+                if (where is not None) and not where( [c, r] ): continue
+                yield [c, r]
+        #end generate()
+        return generate()
+    #end iter_ValidCells()
+
+
     def is_ValidCell(self, cellCR):
         '''Return True/False whether specified Cell ([c,r] index) is valid for exposure.
         Uses get_ValidCells(), which accounts for Round/FlatEdgeClearance (wafer flat exclusion), ExposeEdgeDie (shoot die that are partially on-wafer).
@@ -0,0 +1,269 @@
+"""
+This file is part of the ASML_JobCreator package for Python 3.x.
+
+CellMask.py
+    Class 'CellMask', a selection of Cells stored as a boolean grid, for building distribution maps.
+
+- - - - - - - - - - - - - - -
+
+ASML_JobCreator contributors; 2026
+
+"""
+
+####################################################
+# Module setup etc.
+
+from .__globals import *    # global variables/methods to the module.
+
+
+####################################################
+
+
+class CellMask(object):
+    """
+    Selection of Cells, stored as a boolean array aligned with the Cell grid.
+    
+    CellMask( Cell, fill=False )
+    
+    Masks are usually made with one of the constructors below, and combined with set operations:
+        `|` union, `&` intersection, `-` difference, `^` symmetric difference, `~` complement.
+    The resulting mask can be passed directly to `Image.distribute()`.
+    
+    Constructors
+    ------------
+    CellMask.Valid( Cell )  :  on-wafer Cells, as `Cell.get_ValidCells()`
+    CellMask.Rectangle( Cell, cellCR1, cellCR2 )  :  rectangular region of Cells
+    CellMask.Annulus( Cell, r_outer, r_inner=0 )  :  Cells with centers in a ring
+    CellMask.Quadrant( Cell, *quadrants )  :  Cells with centers in the wafer quadrant(s) 1-4
+    CellMask.Polygon( Cell, verticesXY )  :  Cells with centers inside a polygon
+    CellMask.Modulo( Cell, colmod, colrem, rowmod, rowrem )  :  repeating pattern of Cells
+    CellMask.Cells( Cell, cellsCR )  :  explicit list of Cells, eg. for exclusion lists
+    
+    Parameters
+    ----------
+    Cell : Cell object
+        The Job's Cell object, defining the Cell size & Matrix Shift.
+    fill : { True | False }, optional
+        Initial value of all Cells. Defaults to False, an empty mask.
+    
+    Attributes
+    ----------
+    cols, rows : int arrays
+        Cell column & row indices covered by the grid, enough to cover the whole wafer.
+    mask : bool array, shape (len(cols), len(rows))
+        True for each selected Cell, `mask[i,j]` corresponding to Cell [cols[i], rows[j]].
+    
+    Examples
+    --------
+    >>> valid = asml.CellMask.Valid( MyJob.Cell )
+    >>> inner = valid & asml.CellMask.Annulus( MyJob.Cell, r_outer=30 )
+    >>> ImageA.distribute( inner & asml.CellMask.Modulo( MyJob.Cell, colmod=4, colrem=0 ) )
+    >>> ImageB.distribute( valid - inner - asml.CellMask.Cells( MyJob.Cell, [[0,-4], [1,-4]] ) )
+    """
+    
+    def __init__(self, Cell, fill=False):
+        '''CellMask constructor. See `help(CellMask)` for parameters.'''
+        self.parent = Cell    # parent Cell object
+        self.CellSize = tuple( float(v) for v in Cell.get_CellSize() )
+        self.MatrixShift = tuple( float(v) for v in Cell.get_MatrixShift() )
+        R = Cell.parent.get_WaferDiameter()/2.0
+        N = ( int(np.ceil( R/self.CellSize[0] )) + 1, int(np.ceil( R/self.CellSize[1] )) + 1 )
+        self.cols = np.arange( -N[0], N[0]+1 )
+        self.rows = np.arange( -N[1], N[1]+1 )
+        self.mask = np.full( (len(self.cols), len(self.rows)), bool(fill) )
+    #end __init__
+    
+    
+    def __str__(self, tab=0):
+        '''Return string to `print` this object. Indent the text with the `tab` argument, which will indent by the specified number of spaces (defaults to 0).'''
+        s = " "*tab + "CellMask: %i of %i Cells selected, grid cols %i to %i, rows %i to %i.\n" % ( len(self), self.mask.size, self.cols[0], self.cols[-1], self.rows[0], self.rows[-1] )
+        return s
+    #end __str__
+    
+    
+    def copy(self):
+        ''' Returns a copy of this object, sharing the parent Cell but with it's own mask array.'''
+        from copy import copy
+        new = copy(self)
+        new.mask = self.mask.copy()
+        return new
+    #end copy()
+    
+    
+    def _new(self, mask):
+        '''Return a new CellMask on the same grid as this one, with the boolean array `mask`.'''
+        new = self.copy()
+        new.mask = mask
+        return new
+    #end _new()
+    
+    
+    def get_CellCenters(self):
+        '''Return wafer-coordinates of every Cell center on the grid, as float arrays X & Y of shape (len(cols), len(rows)).'''
+        X = self.MatrixShift[0] + self.cols * self.CellSize[0]
+        Y = self.MatrixShift[1] + self.rows * self.CellSize[1]
+        return np.meshgrid( X, Y, indexing='ij' )
+    #end get_CellCenters()
+    
+    
+    def get_Cells(self):
+        '''Return the selected Cells, as a list of [col,row] lists, ordered by column then row.'''
+        i, j = np.nonzero(self.mask)
+        return np.column_stack( (self.cols[i], self.rows[j]) ).tolist()
+    #end get_Cells()
+    
+    
+    def __len__(self):
+        '''Return the number of selected Cells.'''
+        return int( np.count_nonzero(self.mask) )
+    #end __len__
+    
+    
+    def __iter__(self):
+        '''Iterate over the selected Cells, as [col,row] lists.  See `get_Cells()`.'''
+        return iter( self.get_Cells() )
+    #end __iter__
+    
+    
+    def __contains__(self, cellCR):
+        '''Whether Cell `cellCR` ([col,row]) is selected.'''
+        i, j = int(cellCR[0]) - self.cols[0], int(cellCR[1]) - self.rows[0]
+        return bool( 0 <= i < len(self.cols) and 0 <= j < len(self.rows) and self.mask[i,j] )
+    #end __contains__
+    
+    
+    
+    ##############################################
+    #       Set Operations
+    ##############################################
+    
+    def _check_grid(self, other):
+        '''Raise ValueError if `other` is not a CellMask on the same Cell grid as this one.'''
+        if not isinstance(other, CellMask):
+            raise ValueError( "Expected `CellMask` object, instead got: " + str(type(other)) )
+        if (other.CellSize != self.CellSize) or (other.MatrixShift != self.MatrixShift) or (other.mask.shape != self.mask.shape):
+            errstr = "CellMasks have different Cell grids: CellSize %s & %s, MatrixShift %s & %s." % ( self.CellSize, other.CellSize, self.MatrixShift, other.MatrixShift )
+            raise ValueError(errstr)
+    #end _check_grid()
+    
+    def __or__(self, other):
+        '''Union: Cells selected in either mask.'''
+        self._check_grid(other)
+        return self._new( self.mask | other.mask )
+    #end __or__
+    
+    def __and__(self, other):
+        '''Intersection: Cells selected in both masks.'''
+        self._check_grid(other)
+        return self._new( self.mask & other.mask )
+    #end __and__
+    
+    def __sub__(self, other):
+        '''Difference: Cells selected in this mask but not in `other`.'''
+        self._check_grid(other)
+        return self._new( self.mask & ~other.mask )
+    #end __sub__
+    
+    def __xor__(self, other):
+        '''Symmetric difference: Cells selected in exactly one of the masks.'''
+        self._check_grid(other)
+        return self._new( self.mask ^ other.mask )
+    #end __xor__
+    
+    def __invert__(self):
+        '''Complement: all Cells on the grid that are not selected.'''
+        return self._new( ~self.mask )
+    #end __invert__
+    
+    
+    
+    ##############################################
+    #       Constructors
+    ##############################################
+    
+    @classmethod
+    def Valid(cls, Cell):
+        '''Return CellMask of the on-wafer Cells, the same Cells as `Cell.get_ValidCells()` (accounting for Round/FlatEdgeClearance and ExposeEdgeDie).'''
+        from .geomlib import valid_cell_map
+        new = cls(Cell)
+        N = ( new.cols[-1], new.rows[-1] )
+        cols, rows, new.mask = valid_cell_map( new.CellSize, new.MatrixShift, Cell.parent.get_WaferDiameter(), Cell.get_RoundEdgeClearance(), Cell.get_FlatEdgeClearanceY(), Cell.parent.ExposeEdgeDie, N=N )
+        return new
+    #end Valid()
+    
+    
+    @classmethod
+    def Rectangle(cls, Cell, cellCR1, cellCR2):
+        '''Return CellMask of a rectangular region of Cells, with opposite corner Cells `cellCR1` & `cellCR2` ([col,row]), inclusive.'''
+        new = cls(Cell)
+        c0, c1 = sorted( ( cellCR1[0], cellCR2[0] ) )
+        r0, r1 = sorted( ( cellCR1[1], cellCR2[1] ) )
+        new.mask = ( (new.cols >= c0) & (new.cols <= c1) )[:,None] & ( (new.rows >= r0) & (new.rows <= r1) )[None,:]
+        return new
+    #end Rectangle()
+    
+    
+    @classmethod
+    def Annulus(cls, Cell, r_outer, r_inner=0.0, center=[0.0, 0.0]):
+        '''Return CellMask of the Cells whose centers lie in a ring, `r_inner <= r < r_outer` (in mm) from wafer coordinate `center`.  Use `r_inner=0` for a disk.'''
+        new = cls(Cell)
+        X, Y = new.get_CellCenters()
+        r = np.hypot( X - center[0], Y - center[1] )
+        new.mask = (r >= r_inner) & (r < r_outer)
+        return new
+    #end Annulus()
+    
+    
+    @classmethod
+    def Quadrant(cls, Cell, *quadrants):
+        '''Return CellMask of the Cells whose centers lie in wafer quadrant(s) 1 to 4 (counter-clockwise from +X/+Y).  Cells centered on an axis belong to the quadrant on their positive side, eg. [+X, 0] is in quadrant 1.'''
+        new = cls(Cell)
+        X, Y = new.get_CellCenters()
+        Q = np.where( X >= 0, np.where(Y >= 0, 1, 4), np.where(Y >= 0, 2, 3) )
+        for q in quadrants:
+            if q not in (1,2,3,4):
+                raise ValueError( "Quadrant(): Expected quadrants from 1 to 4, instead got: " + str(q) )
+        new.mask = np.isin( Q, quadrants )
+        return new
+    #end Quadrant()
+    
+    
+    @classmethod
+    def Polygon(cls, Cell, verticesXY):
+        '''Return CellMask of the Cells whose centers lie inside a polygon, with vertices given as wafer-coordinates [[X1,Y1], [X2,Y2], ...].'''
+        from .geomlib import points_in_polygon
+        new = cls(Cell)
+        X, Y = new.get_CellCenters()
+        new.mask = points_in_polygon( X, Y, verticesXY )
+        return new
+    #end Polygon()
+    
+    
+    @classmethod
+    def Modulo(cls, Cell, colmod=None, colrem=0, rowmod=None, rowrem=0):
+        '''Return CellMask of a repeating pattern of Cells: columns where `col % colmod == colrem`, and rows where `row % rowmod == rowrem`.  Either `colmod` or `rowmod` can be None, to select all columns or rows.'''
+        new = cls(Cell, fill=True)
+        if colmod is not None: new.mask &= ( new.cols % colmod == colrem % colmod )[:,None]
+        if rowmod is not None: new.mask &= ( new.rows % rowmod == rowrem % rowmod )[None,:]
+        return new
+    #end Modulo()
+    
+    
+    @classmethod
+    def Cells(cls, Cell, cellsCR):
+        '''Return CellMask of an explicit list of Cells, `cellsCR` as [[col,row], ...].  Cells outside of the grid (off the wafer) are ignored.'''
+        new = cls(Cell)
+        CR = np.asarray( cellsCR, dtype=int ).reshape(-1,2)
+        i, j = CR[:,0] - new.cols[0], CR[:,1] - new.rows[0]
+        inside = (i >= 0) & (i < len(new.cols)) & (j >= 0) & (j < len(new.rows))
+        if WARN() and not np.all(inside): print( "CellMask.Cells(): Ignoring %i Cells outside of the wafer." % np.count_nonzero(~inside) )
+        new.mask[ i[inside], j[inside] ] = True
+        return new
+    #end Cells()
+
+#end class(CellMask)
+
+
+
+################################################
+################################################
@@ -79,6 +79,9 @@ class Defaults(object):
         self.Plotting_MarkFace = "black"
         self.Plotting_MarkLineWidth = 2.0
         self.Plotting_MarkAlpha = 1.0
+        self.Plotting_ExposureColorMap = "viridis"
+        self.Plotting_PreAlignColor = "limegreen"
+        self.Plotting_PreAlignAlpha = 0.3
         
         self.Plotting_ReticleTableColor = self.Plotting_WaferEdgeColor
         self.Plotting_LensColor = "None"
@@ -95,6 +98,8 @@ class Defaults(object):
         self.Cell_MinCellSize = 1.020 # mm
         # self.Cell_MaxCellSize = 100.0 # mm <-- not checked currently
         self.AlignmentMark_PreAlignLocation_MinRadius = 32.5 # mm <-- prealignment marks must be outside of this radius
+        self.AlignmentMark_PreAlignLocation_ExcludedAngles = [20.0, 70.0] # degrees <-- prealignment marks can't be within this angle of the X-axis, in each quadrant
+        self.AlignmentMark_PreAlignLocation_MinSeparation = 140.0 # degrees <-- prealignment marks must be separated by more than this angle
 
         # For plotting only:
         self.RETICLE_TABLE_WINDOW = [22, 27]    # mm
@@ -115,6 +120,24 @@ class Defaults(object):
         self.CELL_SIZE = [10, 10]    #mm
         self.MATRIX_SHIFT = [0.0, 0.0]
         
+        ## Wafer Profiles:
+        self.WaferProfile_CacheDir = ""     # directory for cached valid-Cell tables & machine profiles, shared between processes. "": no disk cache (default), None: system temp. directory
+        
+        ## Machine profile laid over these defaults, see `load_MachineProfile()`:
+        self.Profile_Name = None
+        
+        ## Machine timing, for tool-time estimates (`Job.estimate_Throughput()`):
+        self.Timing_Intensity = 400.0       # mW/cm^2 at the wafer; dose time = Energy / Intensity
+        self.Timing_ShotOverhead = 0.05     # s per shot: shutter, leveling
+        self.Timing_StageSpeed = 200.0      # mm/s
+        self.Timing_StepSettle = 0.10       # s per stage step: acceleration & settling
+        self.Timing_ImageChange = 0.5       # s per change of Image on the same reticle (blade move)
+        self.Timing_ReticleChange = 25.0    # s per reticle exchange
+        self.Timing_AlignMark = 1.0         # s per global-alignment mark
+        self.Timing_PreAlign = 8.0          # s per wafer, prealignment
+        self.Timing_WaferExchange = 30.0    # s per wafer, unload + load
+        self.Timing_LotOverhead = 60.0      # s per lot per Layer: lot setup, first reticle load
+        
         
         ## Machine Defaults Hard-Coded here:
         self.MACHINE_TYPE = "PAS5500/300"
@@ -14,6 +14,7 @@ Demis D. John, Univ. of California Santa Barbara; Nanofabrication Facility; 2019
 # Module setup etc.
 
 from .__globals import *    # global variables/methods to the module.
+from .copylib import unshare    # copy-on-write lists
 
 
 ####################################################
@@ -50,6 +51,8 @@ class Image(object):
         - (future) logic if Cell is outside wafer diam?  
     """
     
+    __slots__ = ( "parent", "ImageID", "BaseImageID", "ReticleID", "sizeXY", "shiftXY", "Cells", "Shifts", "Layers", "_Shared" )
+    
     def __init__(self, ImageID="", ReticleID="", sizeXY=[10,10], shiftXY=[0,0], parent=None):
         """
         Image object constructor.
@@ -59,6 +62,7 @@ class Image(object):
         self.parent = parent    # parent Job object
         self.set_ImageID(ImageID)
         self.BaseImageID = None
+        self.ReticleID = None
         self.set_ReticleID( ReticleID )
         if len(sizeXY) == 2 and np.isscalar(sizeXY[0]) and np.isscalar(sizeXY[1]):
             self.sizeXY = (sizeXY[0], sizeXY[1])
@@ -75,6 +79,7 @@ class Image(object):
         self.Cells = []
         self.Shifts = []
         self.Layers = []
+        self._Shared = None     # lists shared with copies, see `copylib`
         
         # add this Image to the parent Job, if the Job is defined. `Images` image library objects don't have a `parent` set.
         if self.parent:
@@ -116,11 +121,17 @@ class Image(object):
     
     
     def copy(self):
-        ''' Returns a copy of this object.  Uses copy.deepcopy() to ensure all pointers are actually copied instead of referenced.'''
+        ''' Returns a copy of this object.  Uses copy.deepcopy(), with the distribution lists shared copy-on-write, see `__deepcopy__()`.'''
         from copy import deepcopy   # to make copies instead of only references
         return deepcopy(self)
     #end copy()
 
+    def __deepcopy__(self, memo):
+        '''Copy for `copy.deepcopy()`: the distribution lists `Cells` & `Shifts` are shared with the copy until either one is distributed again.'''
+        from .copylib import shared_deepcopy
+        return shared_deepcopy( self, memo, shared=("Cells", "Shifts") )
+    #end __deepcopy__()
+
 
 
     ##############################################
@@ -184,11 +195,16 @@ class Image(object):
         return self.ReticleID
     
     def set_ReticleID(self, ReticleID):
-        '''Set ReticleID, as string.'''
-        self.ReticleID = str(ReticleID)
-        if self.ReticleID == "":
-            errstr = "Invalid ReticleID: `%s`" % self.ReticleID
+        '''Set ReticleID, as string. Updates the reticle index of the parent Job, see `Job.get_Reticles()`.'''
+        ReticleID = str(ReticleID)
+        if ReticleID == "":
+            errstr = "Invalid ReticleID: `%s`" % ReticleID
             raise ValueError( errstr )
+        oldReticleID = self.ReticleID
+        self.ReticleID = ReticleID
+        # re-index if this Image was already added to a Job:
+        if self.parent and (oldReticleID is not None) and any( I is self for I in self.parent.get_ReticleImages(oldReticleID) ):
+            self.parent._index_Reticle( self, oldReticleID=oldReticleID )
     #end set_ReticleID()
     
     
@@ -202,11 +218,13 @@ class Image(object):
         Distribute this Image to specified cells with specified Image-to-Cell-Shift.
         
         distribute( [Col,Row], shiftXY=[x,y] )
+        distribute( CellMask, shiftXY=[x,y] )
         
         Parameters
         ---------
-        CellCR : 2-valued array-like of integers
+        CellCR : 2-valued array-like of integers, or list of them, or CellMask object
             Cell coordinates to distribute this Image to. An Image can only be distributed into a Cell once.  To distribute the same reticle image onto a Cell multiple times, define separate Images for each insertion. Eg. [1,3] or [-5,10]
+            To distribute to many Cells at once, pass a list of Cells, eg. [[1,3], [-5,10]], or a `CellMask` object - see `help(asml.CellMask)`.  All Cells get the same `shiftXY`.
         ShiftXY : 2-valued array-like of coordinates, optional
             X/Y coordinates for shifting the image insertion, with respect to the center of the Cell (aka. "Image-to-Cell Shift"). Defaults to [0,0]
             (future) logic if Cell is outside wafer diam?  
@@ -216,15 +234,22 @@ class Image(object):
         -------
         ValueError is raised if an Image is distributed too many times on a wafer, as defined by PAS software limit. See Defaults.py : `Defaults.ImageDistribution_MaxDistPerImage`.
         """
+        from .CellMask import CellMask
+        if isinstance(cellCR, CellMask):
+            return self._distribute_many( cellCR.get_Cells(), shiftXY )
+        elif np.ndim(cellCR) == 2:
+            return self._distribute_many( cellCR, shiftXY )
+        
         if len(cellCR) != 2:
             raise ValueError( "Expected x,y pair of numbers for cellCR, instead got: " + str(cellCR) )
         elif ( cellCR[0] != int(cellCR[0]) ) or ( cellCR[1] != int(cellCR[1]) ):
             ErrStr = "Expected x,y to be integers, instead got: " + str(cellCR)
             raise ValueError( ErrStr )
         else:
-            if len(self.Cells) >= Defaults.ImageDistribution_MaxDistPerImage:
-                ErrStr = "Image `%s`: "%(self.get_ID()) + "Too many distributions, software limited to %i distributions per Image." %(Defaults.ImageDistribution_MaxDistPerImage)
+            if len(self.Cells) >= get_Defaults(self).ImageDistribution_MaxDistPerImage:
+                ErrStr = "Image `%s`: "%(self.get_ID()) + "Too many distributions, software limited to %i distributions per Image." %(get_Defaults(self).ImageDistribution_MaxDistPerImage)
                 raise ValueError( ErrStr )
+            unshare( self, "Cells", "Shifts" )
             self.Cells.append(   ( cellCR[0], cellCR[1] )   )
         #end if(cellCR)
         
@@ -233,14 +258,39 @@ class Image(object):
             raise ValueError( ErrStr )
         else:
             self.Shifts.append(   ( shiftXY[0], shiftXY[1] )   )
+        if self.parent: self.parent._index_Cell( self, self.Cells[-1], self.Shifts[-1] )
         if DEBUG(): print( "Image `%s`: "%self.get_ImageID() + "Distributed at Cells " + str(self.Cells[-1]) + " w/ Shift " + str(self.Shifts[-1]) )
     #end Distribute()
     
+    
+    def _distribute_many(self, cellsCR, shiftXY=[0,0]):
+        '''Distribute this Image to every Cell in the list `cellsCR` ([[col,row], ...]) with the same `shiftXY`.  All arguments are checked before any distribution is added.  See `distribute()`.'''
+        CR = np.asarray( cellsCR ).reshape(-1,2)
+        if not np.all( CR == np.round(CR) ):
+            ErrStr = "Expected Cells to be integers, instead got: " + str( CR[ np.any(CR != np.round(CR), axis=1) ][:5].tolist() )
+            raise ValueError( ErrStr )
+        if len(shiftXY) != 2:
+            ErrStr = "Expected x,y pair of numbers for shiftXY, instead got: " + str(shiftXY)
+            raise ValueError( ErrStr )
+        if len(self.Cells) + len(CR) > get_Defaults(self).ImageDistribution_MaxDistPerImage:
+            ErrStr = "Image `%s`: "%(self.get_ID()) + "Too many distributions (%i + %i), software limited to %i distributions per Image." %( len(self.Cells), len(CR), get_Defaults(self).ImageDistribution_MaxDistPerImage )
+            raise ValueError( ErrStr )
+        
+        cells = [ (c, r) for c, r in CR.astype(int).tolist() ]
+        shift = ( shiftXY[0], shiftXY[1] )
+        unshare( self, "Cells", "Shifts" )
+        self.Cells.extend( cells )
+        self.Shifts.extend( [shift] * len(cells) )
+        if self.parent:
+            for cell in cells: self.parent._index_Cell( self, cell, shift )
+        if DEBUG(): print( "Image `%s`: "%self.get_ImageID() + "Distributed at %i Cells w/ Shift " % len(cells) + str(shift) )
+    #end _distribute_many()
+    
     def get_distribution(self):
         '''Return list of [CellC,CellR], [ShiftX,ShiftY] pairs corresponding to each distribution of this Image.'''
         out = list( zip(self.Cells, self.Shifts) )
-        if len(out) >= Defaults.ImageDistribution_MaxDistPerImage :
-            ErrStr = "Image `%s`: "%(self.get_ID()) + "[Warning] Too many distributions, software limited to %i distributions per Image." %(Defaults.ImageDistribution_MaxDistPerImage)
+        if len(out) >= get_Defaults(self).ImageDistribution_MaxDistPerImage :
+            ErrStr = "Image `%s`: "%(self.get_ID()) + "[Warning] Too many distributions, software limited to %i distributions per Image." %(get_Defaults(self).ImageDistribution_MaxDistPerImage)
             if WARN(): print( ErrStr )
         return out
     
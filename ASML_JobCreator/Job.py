@@ -20,6 +20,7 @@ from .Image import Image                    # Class Image
 from .Alignment import Alignment            # Class Alignment
 from .Layer import Layer                    # Class Layer
 from .Plot import Plot                      # Class Plot
+from .Wafer import WaferProfile, WaferProfiles, get_DefaultsProfile   # wafer geometry
 
 ####################################################
 
@@ -32,12 +33,24 @@ class Job(object):
         
     MyJob = Job( )
     
+    Parameters
+    ----------
+    defaults : Defaults object, optional
+        Default & machine settings for this Job.  The Job keeps its own copy, taken when it is created.  Defaults to the current Defaults, see `get_Defaults()` & `local_settings()`.
+    
+    profile : string, optional
+        Machine profile to use: a TOML/JSON file of settings laid over the built-in Defaults (or over `defaults`, if given), or the name of a profile in the `ASML_JobCreator/Profiles/` folder.  See `help(asml.load_MachineProfile)`.
+    
     Attributes
     ----------
     Cell : `Cell` object, containing Wafer Cell parameters.
     ImageList : List of Image objects added to this Job.
+    ReticleDict : Dictionary of {ReticleID : [Image objects]}, kept up-to-date as Images are added or their ReticleID's are changed.  Use `get_Reticles()` to access it.
+    CellDict : Dictionary of {(col,row) : {Layer : [(Image, shiftXY)]}}, kept up-to-date as Images are distributed and exposed.  Use `get_CellExposures()` etc. to query it.
     LayerList : List of Layer objects added to this Job. Layers will utilize the Image objects in the ImageList.
     Alignment : Alignment object that contains Alignment Marks & Alignment Strategies.
+    WaferProfile : WaferProfile object describing the wafer diameter & flat/notch, or None to use the Defaults. See `set_WaferProfile()`.
+    defaults : This Job's copy of the Defaults object, with the machine & default settings used by all of the Job's objects.
     
     - - - - - - - 
     TO DO: 
@@ -45,15 +58,26 @@ class Job(object):
     - MyJob.CellCRtoWaferXY / WaferXYtoCellCR   - convert between cell and wafer coords.
     '''
     
-    def __init__(self):
+    def __init__(self, defaults=None, profile=None):
         '''Job object constructor.  See `help(Job)` for parameters.'''
+        # this Job's own copy of the Defaults, so that changes elsewhere don't affect it:
+        if profile is not None:
+            from .profilelib import load_MachineProfile
+            self.defaults = load_MachineProfile( profile, defaults )
+        else:
+            self.defaults = ( get_Defaults() if defaults is None else defaults ).copy()
         self.Alignment = Alignment(parent=self)    # Alignment object
         self.Cell = Cell(parent=self)      # Cell object
         self.ImageList = []
+        self.ReticleDict = {}   # index of Images per ReticleID
+        self.CellDict = {}      # index of exposures per Cell
         self.LayerList = []
-        self.defaults = Defaults    # imported in .__globals
         self.Plot = Plot(parent=self)
         self.ExposeEdgeDie = False
+        self.WaferProfile = None    # use Defaults
+        self.comment_line1 = self.comment_line2 = self.comment_line3 = None  # use Defaults, see `get_comment()`
+        self.LensReduction = None   # use Defaults, see `get_LensReduction()`
+        self.combined_zerofirst = False
     #end __init__
     
     
@@ -78,12 +102,22 @@ class Job(object):
     
     
     def copy(self):
-        ''' Returns a copy of this object.  Uses copy.deepcopy() to ensure all pointers are actually copied instead of referenced.'''
+        ''' Returns a copy of this object.  Uses copy.deepcopy(), with the Images' distribution lists and the Layers' exposure settings shared copy-on-write (see `copylib`).  Every Image, Layer, Mark & Strategy is still a new object, so the time to copy grows with the number of these objects, but not with the number of distributions.'''
         from copy import deepcopy   # to make copies instead of only references
         return deepcopy(self)
     #end copy()
     
     
+    def __deepcopy__(self, memo):
+        '''Copy for `copy.deepcopy()`.  The copy gets its own Defaults, the WaferProfile object is shared with the copy, and the copy's Cell index is rebuilt when first needed.'''
+        from .copylib import shared_deepcopy
+        if self.WaferProfile is not None: memo[ id(self.WaferProfile) ] = self.WaferProfile
+        new = shared_deepcopy( self, memo, skip=("CellDict",) )
+        new.CellDict = None     # see `_get_CellDict()`
+        return new
+    #end __deepcopy__()
+    
+    
     
     ##############################################
     #       Setters/Getters
@@ -104,13 +138,11 @@ class Job(object):
     
     def get_comment(self):
         '''Return job comment lines, as three separate strings.'''
-        try:
-            return (self.comment_line1, self.comment_line2, self.comment_line3)
-        except AttributeError:
+        if self.comment_line1 is None:
             if WARN(): print("Using default values for Job `comment`.")
             self.comment_line1, self.comment_line2, self.comment_line3 = \
-                Defaults.comment_line1, Defaults.comment_line2, Defaults.comment_line3
-            return (self.comment_line1, self.comment_line2, self.comment_line3) 
+                self.defaults.comment_line1, self.defaults.comment_line2, self.defaults.comment_line3
+        return (self.comment_line1, self.comment_line2, self.comment_line3)
     #end
     
     
@@ -134,8 +166,40 @@ class Job(object):
     
     
     def get_WaferDiameter(self):
-        '''Return Wafer Diameter in mm.'''
-        return Defaults.WFR_DIAMETER
+        '''Return Wafer Diameter in mm, from the WaferProfile.'''
+        return self.get_WaferProfile().Diameter
+    #end
+    
+    
+    def set_WaferProfile(self, profile):
+        '''
+        Set the wafer geometry (diameter, flat or notch) for this Job.
+        
+        Parameters
+        ----------
+        profile : string or WaferProfile object
+            Name of a standard profile in `asml.WaferProfiles` ("100mm", "150mm", "200mm", "300mm"), or a custom WaferProfile object.  See `help(asml.WaferProfile)`.
+        '''
+        if isinstance(profile, str):
+            if profile not in WaferProfiles:
+                errstr = "Unrecognized WaferProfile `%s`, expected one of: %s" % ( profile, list(WaferProfiles.keys()) )
+                raise ValueError(errstr)
+            profile = WaferProfiles[profile]
+        elif not isinstance(profile, WaferProfile):
+            raise ValueError( "Expected WaferProfile object or name, instead got: " + str(type(profile)) )
+        self.WaferProfile = profile
+    #end
+    
+    def unset_WaferProfile(self):
+        '''Use the wafer geometry from `Defaults.WFR_DIAMETER`, `WFR_NOTCH` and `WFR_FLAT_LENGTH` (the default).'''
+        self.WaferProfile = None
+    #end
+    
+    def get_WaferProfile(self):
+        '''Return the WaferProfile object for this Job.  If none was set with `set_WaferProfile()`, returns the profile described by the Defaults.'''
+        if self.WaferProfile is None:
+            return get_DefaultsProfile( self.defaults )
+        return self.WaferProfile
     #end
     
     
@@ -146,12 +210,10 @@ class Job(object):
     
     def get_LensReduction(self):
         '''Return the Lens Reduction/Magnification.'''
-        try:
-            return self.LensReduction
-        except AttributeError:
-            self.LensReduction = Defaults.ProcessData_LENS_REDUCTION
+        if self.LensReduction is None:
+            self.LensReduction = self.defaults.ProcessData_LENS_REDUCTION
             if WARN(): print(   "Using default value for `LensReduction` : %s" % (self.LensReduction)   )
-            return self.LensReduction
+        return self.LensReduction
     #end
     
     
@@ -165,12 +227,7 @@ class Job(object):
     
     def get_CombinedZeroFirst(self):
         """Return True|False whether Combined Zero and First layer is enabled. Returns False if the parameter has not been set."""
-        try: 
-            return self.combined_zerofirst
-        except AttributeError:
-            self.combined_zerofirst = False
-            return self.combined_zerofirst
-        #end try
+        return self.combined_zerofirst
     #end getCombinedZeroFirst()
     
     
@@ -224,6 +281,8 @@ class Job(object):
                 if not np.isin( I, self.ImageList ):
                     if DEBUG(): print("Adding Image %s to ImageList" % I.__repr__()  )
                     self.ImageList.append( I )
+                    self._index_Reticle( I )
+                    self._index_Cells( I )
                 if I.parent and not (I.parent==self):
                     if WARN(): print(   "WARNING: Image objects can only be part of a single Job object.  Setting parent of Image `%s` to Job `%s`." %( I.ImageID, self.__repr__() )   )
                 I.parent = self
@@ -277,6 +336,370 @@ class Job(object):
     
     
     
+    def generate_FEM(self, Template, Energies, Focuses, Layer=None, mask=None, repeat=1, **exposure):
+        """
+        Generate a Focus-Exposure Matrix (FEM): one copy of the `Template` Image for each (Energy, Focus) combination, distributed to its own Cells, and exposed on a Layer with that Energy & Focus.
+        The Images are created, distributed & exposed in bulk.  Cells are filled row by row from the bottom of the wafer: Focus changes from Cell to Cell along a row, and Energy from row to row.
+        
+        Parameters
+        ----------
+        Template : Image object
+            Image to copy, eg. from the `asml.Images` library or from this Job.  The copies have the same ReticleID, size & shift, with ImageIDs ending in "_E<i>F<j>" for the Energy & Focus indices.  The Template itself is not changed.
+        
+        Energies, Focuses : array-likes of numbers
+            Exposure energies (mJ/cm^2) and focus offsets to combine, eg. `np.linspace(15, 25, 20)`.
+        
+        Layer : Layer object, optional
+            Layer to expose the Images on.  Defaults to a new Layer with LayerID "FEM".
+        
+        mask : CellMask object, optional
+            Cells to use, filled in order row by row.  Defaults to a block of len(Focuses) x len(Energies) Cells centered on the wafer.  See `help(asml.CellMask)`.
+        
+        repeat : int, optional
+            Number of Cells for each combination.  The whole matrix is repeated, so repeats are in separate blocks of rows.  Defaults to 1.
+        
+        **exposure : optional
+            Other arguments for `Layer.expose_Image()`, shared by all Images, eg. `NA=0.48`.
+        
+        Returns
+        -------
+        images : object array of Image objects, shape (len(Energies), len(Focuses))
+        layer : Layer object
+        
+        Examples
+        --------
+        >>> Images, FEM = MyJob.generate_FEM( MyImage, np.linspace(15, 25, 20), np.linspace(-0.4, 0.4, 20) )
+        """
+        from .genlib import generate_FEM
+        return generate_FEM( self, Template, Energies, Focuses, Lyr=Layer, mask=mask, repeat=repeat, **exposure )
+    #end generate_FEM()
+
+
+
+    def generate_RadialCompensation(self, Template, Radii, Energies, Focuses=0.0, bands=10, Layer=None, mask=None, shiftXY=[0,0], **exposure):
+        """
+        Generate a shot map with Energy & Focus varying with radius on the wafer, eg. to compensate for thicker resist near the wafer edge.
+        The Cells are binned into radius bands (by the distance of the shot center from the wafer center), each band gets its own copy of the `Template` Image, and each copy is exposed with the Energy & Focus interpolated from the radial profile at the band center.  Binning is done for all Cells at once, so hundreds of bands are no problem.
+        
+        Parameters
+        ----------
+        Template : Image object
+            Image to copy.  The copies have the same ReticleID, size & shift, with ImageIDs ending in "_R<band>".  The Template itself is not changed.
+        
+        Radii : array-like of numbers
+            Increasing radii in mm at which the profile is given.
+        
+        Energies, Focuses : numbers or array-likes of numbers
+            Exposure energy (mJ/cm^2) and focus offset at each of the `Radii`.  Linearly interpolated in between, and constant beyond the first/last radius.  Focuses defaults to 0.
+        
+        bands : int or array-like of numbers, optional
+            Number of equal-width bands from the wafer center to the outermost shot, or the band edges in mm.  Cells outside the band edges are not exposed.  Defaults to 10.
+        
+        Layer : Layer object, optional
+            Layer to expose the Images on.  Defaults to a new Layer with LayerID "RADIAL".
+        
+        mask : CellMask object, optional
+            Cells to use.  Defaults to all valid Cells.  See `help(asml.CellMask)`.
+        
+        shiftXY : 2-valued array-like, optional
+            Image-to-Cell shift for all distributions.  Defaults to [0,0].
+        
+        **exposure : optional
+            Other arguments for `Layer.expose_Image()`, shared by all Images, eg. `NA=0.48`.
+        
+        Returns
+        -------
+        images : list of Image objects
+            One per non-empty band.  A band with more Cells than `Defaults.ImageDistribution_MaxDistPerImage` is split over several Images.
+        radii : float array
+            The band-center radius used for each Image.
+        layer : Layer object
+        
+        Examples
+        --------
+        >>> Images, radii, Lyr = MyJob.generate_RadialCompensation( MyImage, Radii=[0, 80, 95], Energies=[20, 20, 23], bands=100 )
+        """
+        from .genlib import generate_RadialCompensation
+        return generate_RadialCompensation( self, Template, Radii, Energies, Focuses=Focuses, bands=bands, Lyr=Layer, mask=mask, shiftXY=shiftXY, **exposure )
+    #end generate_RadialCompensation()
+
+
+
+    ##############################################
+    #       Reticle Index
+    ##############################################
+    
+    def _index_Reticle(self, Img, oldReticleID=None):
+        '''Add Image `Img` to the ReticleDict index, under it's current ReticleID.  If `oldReticleID` is passed, the Image is first removed from the entry for that old ReticleID (eg. when the ReticleID of the Image was changed).'''
+        if oldReticleID is not None and oldReticleID in self.ReticleDict:
+            Imgs = [I for I in self.ReticleDict[oldReticleID] if I is not Img]
+            if Imgs:
+                self.ReticleDict[oldReticleID] = Imgs
+            else:
+                del self.ReticleDict[oldReticleID]
+        #end if(oldReticleID)
+        Imgs = self.ReticleDict.setdefault( Img.get_ReticleID(), [] )
+        if not any( I is Img for I in Imgs ):
+            Imgs.append( Img )
+        if DEBUG(): print("Job._index_Reticle(): ReticleDict = \n", self.ReticleDict)
+    #end _index_Reticle()
+    
+    
+    def get_Reticles(self):
+        '''
+        Return the Images on each Reticle in this Job, as a dictionary of { ReticleID : [Image objects] }.
+        The dictionary is updated as Images are added to the Job with `add_Images()` or have their ReticleID changed with `Image.set_ReticleID()`, so no re-scanning of the ImageList is needed.  The returned dictionary is the Job's own index, and should not be modified.
+        
+        Examples
+        --------
+        >>> One = MyJob.Image(ImageID="One", ReticleID="Ret1", ....)
+        >>> Two = MyJob.Image(ImageID="Two", ReticleID="Ret1", ....)
+        >>> Three = MyJob.Image(ImageID="Three", ReticleID="RetTwo", ....)
+        >>> MyJob.get_Reticles()
+        returns:
+        : {"Ret1" : [One,Two] , "RetTwo": [Three]}
+        '''
+        return self.ReticleDict
+    #end get_Reticles()
+    
+    
+    def get_ReticleImages(self, ReticleID):
+        '''Return list of Image objects that are on the reticle `ReticleID`. Returns an empty list if no Images use this ReticleID.'''
+        return self.ReticleDict.get( str(ReticleID), [] )
+    #end get_ReticleImages()
+    
+    
+    def get_ReticleIDs(self):
+        '''Return list of unique ReticleID strings used in this Job, in order of first use.'''
+        return list( self.ReticleDict.keys() )
+    #end get_ReticleIDs()
+    
+    
+    
+    ##############################################
+    #       Cell Index
+    ##############################################
+    
+    def _get_CellDict(self):
+        '''Return the CellDict index, first building it from every Image's distributions if it is not available (eg. in a copy of a Job).'''
+        if self.CellDict is None:
+            self.CellDict = {}
+            for Img in self.ImageList:
+                for cellCR, shiftXY in zip( Img.Cells, Img.Shifts ):
+                    self._index_Cell( Img, cellCR, shiftXY )
+            #end for(ImageList)
+        #end if(CellDict)
+        return self.CellDict
+    #end _get_CellDict()
+    
+    
+    def _index_Cell(self, Img, cellCR, shiftXY, layers=None):
+        '''Add one distribution of Image `Img` (Cell `cellCR` with Image-to-Cell shift `shiftXY`) to the CellDict index, for each of the Layers exposing `Img` (or for the Layers passed in `layers`).  Does nothing if the index has not been built yet, see `_get_CellDict()`.'''
+        if self.CellDict is None: return
+        Layers = self.CellDict.setdefault( ( int(cellCR[0]), int(cellCR[1]) ), {} )
+        for L in ( Img.Layers if layers is None else layers ):
+            Layers.setdefault( L, [] ).append(  ( Img, ( shiftXY[0], shiftXY[1] ) )  )
+    #end _index_Cell()
+    
+    
+    def _index_Exposure(self, Img, Lyr):
+        '''Add every distribution of Image `Img` to the CellDict index, for Layer `Lyr` (eg. when `Lyr` is set to expose `Img`).'''
+        if Img.parent is not self: return
+        for cellCR, shiftXY in zip( Img.Cells, Img.Shifts ):
+            self._index_Cell( Img, cellCR, shiftXY, layers=[Lyr] )
+    #end _index_Exposure()
+    
+    
+    def _index_Cells(self, Img):
+        '''(Re-)build the CellDict entries for all distributions & Layers of Image `Img`, removing any old entries for `Img` first.'''
+        if self.CellDict is None: return
+        for cellCR in set( Img.Cells ):
+            Layers = self.CellDict.get( ( int(cellCR[0]), int(cellCR[1]) ), {} )
+            for L in list(Layers):
+                Layers[L] = [ e for e in Layers[L] if e[0] is not Img ]
+                if not Layers[L]: del Layers[L]
+        #end for(Img.Cells)
+        for cellCR, shiftXY in zip( Img.Cells, Img.Shifts ):
+            self._index_Cell( Img, cellCR, shiftXY )
+    #end _index_Cells()
+    
+    
+    def _match_Layer(self, Lyr, layer):
+        '''Whether Layer `Lyr` matches the `layer` argument of the Cell Index queries: a Layer object, a LayerID string, or None for any Layer.'''
+        if layer is None: return True
+        if isinstance(layer, str): return Lyr.get_LayerID() == layer
+        return Lyr is layer
+    #end _match_Layer()
+    
+    
+    def get_CellExposures(self, cellCR, layer=None):
+        '''
+        Return every exposure placed in a Cell, from the Cell index.  The index is kept up-to-date by `Image.distribute()` and `Layer.expose_Image()`, so each query is a dictionary lookup instead of a scan through every Image's distributions.
+        
+        Parameters
+        ----------
+        cellCR : 2-valued iterable of integers
+            Cell [col,row], eg. [3,-2].
+        
+        layer : Layer object or LayerID string, optional
+            Only return exposures on this Layer.  Defaults to None, all Layers.
+        
+        Returns
+        -------
+        List of (Image, Layer, [shiftX, shiftY]) tuples, one per Image distribution and Layer.
+        
+        Examples
+        --------
+        >>> MyJob.get_CellExposures( [3,-2], layer="LAY2" )
+        '''
+        Layers = self._get_CellDict().get( ( int(cellCR[0]), int(cellCR[1]) ), {} )
+        if layer is not None and not isinstance(layer, str):
+            return [ (I, layer, list(s)) for I,s in Layers.get(layer, []) ]
+        return [ (I, L, list(s)) for L,entries in Layers.items() if self._match_Layer(L, layer) for I,s in entries ]
+    #end get_CellExposures()
+    
+    
+    def get_RegionExposures(self, cellCR1, cellCR2, layer=None):
+        '''
+        Return every exposure placed in a rectangular region of Cells, from the Cell index.  See `get_CellExposures()`.
+        
+        Parameters
+        ----------
+        cellCR1, cellCR2 : 2-valued iterables of integers
+            Opposite corner Cells [col,row] of the region, inclusive.
+        
+        layer : Layer object or LayerID string, optional
+            Only return exposures on this Layer.  Defaults to None, all Layers.
+        
+        Returns
+        -------
+        List of ([col,row], Image, Layer, [shiftX, shiftY]) tuples.
+        '''
+        c0, c1 = sorted( ( int(cellCR1[0]), int(cellCR2[0]) ) )
+        r0, r1 = sorted( ( int(cellCR1[1]), int(cellCR2[1]) ) )
+        out = []
+        if (c1-c0+1) * (r1-r0+1) > len(self._get_CellDict()):
+            # large region: scan the occupied Cells instead
+            cells = sorted( CR for CR in self.CellDict if c0 <= CR[0] <= c1 and r0 <= CR[1] <= r1 )
+        else:
+            cells = [ (c,r) for c in range(c0, c1+1) for r in range(r0, r1+1) ]
+        for CR in cells:
+            out.extend( ( [CR[0],CR[1]], ) + e for e in self.get_CellExposures(CR, layer=layer) )
+        return out
+    #end get_RegionExposures()
+    
+    
+    def get_WaferExposures(self, waferXY, layer=None, search=1):
+        '''
+        Return every exposure whose Image covers a point on the wafer, from the Cell index.  See `get_CellExposures()`.
+        
+        Parameters
+        ----------
+        waferXY : 2-valued iterable of floats
+            Wafer coordinates [X,Y] in mm.
+        
+        layer : Layer object or LayerID string, optional
+            Only return exposures on this Layer.  Defaults to None, all Layers.
+        
+        search : int, optional
+            Number of neighboring Cells to search around the Cell containing `waferXY`, to find Images shifted out of their own Cell.  Defaults to 1.
+        
+        Returns
+        -------
+        List of ([col,row], Image, Layer, [shiftX, shiftY]) tuples.
+        '''
+        CR, XY = self.Cell.Wafer2Cell( waferXY )
+        cellSize = self.Cell.get_CellSize()
+        matrixShift = self.Cell.get_MatrixShift()
+        out = []
+        for e in self.get_RegionExposures( [CR[0]-search, CR[1]-search], [CR[0]+search, CR[1]+search], layer=layer ):
+            (c,r), I, L, s = e
+            for ii, cr in ( (0,c), (1,r) ):
+                if abs( waferXY[ii] - (matrixShift[ii] + cr*cellSize[ii] + s[ii]) ) > I.sizeXY[ii]/2: break
+            else:
+                out.append(e)
+        #end for(exposures)
+        return out
+    #end get_WaferExposures()
+
+
+
+    ##############################################
+    #       Tool Time
+    ##############################################
+    
+    def get_TimingProfile(self, timing=None):
+        '''
+        Return the machine-timing profile used for tool-time estimates, as a dictionary.  Values are taken from the `Timing_*` entries of the Defaults, eg. `Defaults.Timing_StageSpeed` becomes "StageSpeed".
+        
+        Parameters
+        ----------
+        timing : dictionary, optional
+            Entries to override, eg. `{"ReticleChange":40.0}`.
+        '''
+        T = { k[len("Timing_"):]:v for k,v in vars(self.defaults).items() if k.startswith("Timing_") }
+        if timing:
+            for k in timing:
+                if k not in T:
+                    raise ValueError( "Unrecognized timing entry `%s`, expected one of: %s" % (k, list(T.keys())) )
+            T.update( timing )
+        #end if(timing)
+        return T
+    #end get_TimingProfile()
+    
+    
+    def estimate_Throughput(self, wafers=25, layers=None, timing=None):
+        '''
+        Estimate the tool time to expose a lot of wafers with this Job, per Layer and per lot.  See `Layer.estimate_Time()` for the per-wafer model, and `get_TimingProfile()` for the machine timing.
+        Each Layer is a separate pass of the lot through the tool, costing `LotOverhead` plus, for each wafer, the wafer exchange and the Layer's exposure time.
+        
+        Parameters
+        ----------
+        wafers : int, optional
+            Number of wafers in the lot.  Defaults to 25.
+        
+        layers : list of Layer objects or LayerIDs, optional
+            Only estimate these Layers.  Defaults to all Layers in the Job.
+        
+        timing : dictionary, optional
+            Override entries of the timing profile, eg. `{"StageSpeed":250.0}`.
+        
+        Returns
+        -------
+        perlayer : dictionary
+            { LayerID : dictionary from `Layer.estimate_Time()` }, with the additional entries "lot_time" (seconds for the whole lot) and "wafers_per_hour".
+        lot : dictionary
+            Totals over all Layers: "wafers", "shots" (per wafer), "wafer_time" (exposure time per wafer, s), "lot_time" (s) and "hours".
+        
+        Examples
+        --------
+        >>> perlayer, lot = MyJob.estimate_Throughput( wafers=25 )
+        >>> print( "%0.2f hours" % lot["hours"] )
+        '''
+        T = self.get_TimingProfile(timing)
+        wafers = int(wafers)
+        if layers is None: layers = self.LayerList
+        if not np.iterable(layers) or isinstance(layers, str): layers = [layers]
+        layers = [ L for L in self.LayerList if any( self._match_Layer(L, l) for l in layers ) ]
+        
+        perlayer = {}
+        for L in layers:
+            t = L.estimate_Time(timing)
+            t["lot_time"] = T["LotOverhead"] + wafers * ( T["WaferExchange"] + t["wafer_time"] )
+            t["wafers_per_hour"] = 3600.0 * wafers / t["lot_time"] if t["lot_time"] > 0 else np.inf
+            perlayer[L.get_LayerID()] = t
+        #end for(layers)
+        
+        lot = { "wafers": wafers }
+        for k in ("shots", "wafer_time", "lot_time"):
+            lot[k] = sum( t[k] for t in perlayer.values() )
+        lot["hours"] = lot["lot_time"] / 3600.0
+        if DEBUG(): print( "Job.estimate_Throughput(): %i Layers, %i wafers: %0.2f hours." % (len(perlayer), wafers, lot["hours"]) )
+        return perlayer, lot
+    #end estimate_Throughput()
+
+
+
     ##############################################
     #       Exporting to Text
     ##############################################
@@ -323,7 +746,7 @@ class Job(object):
     #end _organizeLayers
     
     
-    def export(self, filepath="ASML_Job.txt", overwrite=False):
+    def export(self, filepath="ASML_Job.txt", overwrite=False, check_overlaps=False):
         """
         Export an ASCII text file of this job, that can be imported by the ASML PAS software.
 
@@ -336,10 +759,27 @@ class Job(object):
             Whether to overwrite the file if it already exists.
             If asml.WARN() is enabled, will pop a warning before overwriting.
             Will fail with IOError if file exists and `overwrite` is False.
+        
+        check_overlaps : {True | False}, optional
+            If True, check every Layer for shots (Image distributions & Marks) that overlap each other, using `Layer.get_ShotOverlaps()`, and raise a ValueError if any are found.  Defaults to False.
         """
         self._organizeLayers()  # check for Zero/CombinedWithZero options
         if DEBUG(): print( "Re-organized Layers:", [L.LayerID for L in self.LayerList] )
         
+        if check_overlaps:
+            def shotname(shot):
+                if shot[1] is None: return "Mark `%s`" % shot[0].get_MarkID()
+                return "Image `%s` in Cell [%i,%i] shifted [%g,%g]" % ( shot[0].get_ImageID(), shot[1][0], shot[1][1], shot[2][0], shot[2][1] )
+            #end shotname()
+            for L in self.LayerList:
+                overlaps = L.get_ShotOverlaps()
+                if overlaps:
+                    errstr = "Layer `%s` has %i overlapping shots, eg. " % ( L.get_LayerID(), len(overlaps) ) + \
+                        "; ".join( "%s & %s" % (shotname(a), shotname(b)) for a,b in overlaps[:5] ) + "."
+                    raise ValueError(errstr)
+            #end for(LayerList)
+        #end if(check_overlaps)
+        
         import os.path
         from .exportlib import _genascii 
     
@@ -363,6 +803,46 @@ class Job(object):
         if DEBUG(): print("Job.export(): ASCII Text file written succesfully.")
     #end export()
     
+    def export_Sweep(self, grid, directory=".", basename="Job", processes=None, overwrite=False):
+        """
+        Export a family of job files that differ only in a few parameters: one file for every combination of the values in `grid`, plus a manifest listing the parameter values of each file.
+        This Job is not changed: the sweep works on one copy of it (see `copy()`), and for each variant only the swept attributes of that copy are replaced, the file exported, and the attributes restored.  With `processes`, the copy is sent once to each worker process and the exports are split among them.
+        
+        Parameters
+        ----------
+        grid : dictionary
+            { parameter : list of values }.  Parameters are:
+                "comment" : comment line 1, or list of the three lines.
+                "MatrixShift" : Cell Matrix Shift [x,y].
+                "LayerShift:<LayerID>" : Layer Shift [x,y] of a Layer.
+                "Energy:<LayerID>", "Focus:<LayerID>" : for all Images of a Layer - a number, or a list with one value per Image of the Layer.
+        
+        directory : string, optional
+            Directory for the files, created if needed.  Defaults to the current directory.
+        
+        basename : string, optional
+            Files are named "<basename>_<index>.txt", the index counting the combinations in order with the last parameter of `grid` changing fastest; the manifest is "<basename>_manifest.json".  Defaults to "Job".
+        
+        processes : int, optional
+            If greater than 1, export in this many worker processes.  Defaults to None, export in this process.
+        
+        overwrite : {True | False}, optional
+            Whether to overwrite existing files.  If False, raises IOError before writing anything if any of the files already exist.  Defaults to False.
+        
+        Returns
+        -------
+        manifest : dictionary
+            { "basename", "parameters", "variants" : [ {"index", "file", "values"}, ... ] }, as written to the manifest file.
+        
+        Examples
+        --------
+        >>> MyJob.export_Sweep( {"Energy:LYR1": [18, 20, 22], "MatrixShift": [[0,0], [2.5,2.5]]}, directory="sweep", processes=4 )
+        """
+        from .genlib import export_Sweep
+        return export_Sweep( self, grid, directory=directory, basename=basename, processes=processes, overwrite=overwrite )
+    #end export_Sweep()
+
+
     ##############################################
     #       Utility Functions
     ##############################################
@@ -15,9 +15,18 @@ Demis D. John, Univ. of California Santa Barbara; Nanofabrication Facility; 2019
 
 from .__globals import *    # global variables/methods to the module.
 from math import atan2, pi
+from .copylib import unshare    # copy-on-write exposure table
 
 ####################################################
 
+## Columns of the Layer exposure table, one row per exposed Image, see `Layer.Exposures`:
+_ExposureDType = np.dtype( [ ("Energy", float), ("Focus", float), ("FocusTilt", float, (2,)), ("NA", float), ("Sig_o", float), ("Sig_i", float), ("IlluminationMode", "U12") ] )
+
+def _ExposureColumn(name, doc):
+    '''Return a property giving the column `name` of a Layer's exposure table as a read-only array, without copying the table.  Change settings with `Layer.get_Exposures(writable=True)` instead.'''
+    return property( lambda self: self.get_Exposures()[name], doc=doc + "  Read-only; change it with `get_Exposures(writable=True)`." )
+#end _ExposureColumn()
+
 
 
 
@@ -40,6 +49,9 @@ class Layer(object):
     
     """
     
+    __slots__ = ( "parent", "LayerID", "combined_zerofirst", "zero", "ImageList", "MarkList", "PreAlignMarksList", "GlobalStrategy", "SMS", "ExposureOrder", "_Exposures",
+                  "LayerShift", "GlobalLevel_Point1", "GlobalLevel_Point2", "GlobalLevel_Point3", "_Shared" )
+    
     def __init__(self, LayerID="", ZeroLayer=False, CombineWithZeroLayer=False, parent=None):
         '''Layer object constructor.  See `help(Layer)` for parameters.
         '''
@@ -62,15 +74,14 @@ class Layer(object):
         self.PreAlignMarksList = None
         self.GlobalStrategy = None
         self.SMS = False
+        self.ExposureOrder = None   # list of Images, or None for the machine default
+        # None: use the Defaults when first needed, see the `get_*()` methods:
+        self.LayerShift = None
+        self.GlobalLevel_Point1 = self.GlobalLevel_Point2 = self.GlobalLevel_Point3 = None
         
-        # "Reticle Data" section:
-        self.EnergyList=[]
-        self.FocusList=[]
-        self.FocusTiltList=[]
-        self.NAList=[]
-        self.Sig_oList=[]
-        self.Sig_iList=[]
-        self.IlluminationModeList=[]
+        # "Reticle Data" section: exposure table, rows for `ImageList` followed by unused rows to grow into
+        self._Exposures = np.zeros( 0, dtype=_ExposureDType )
+        self._Shared = None     # attributes shared with copies, see `copylib`
         
         # add this Layer to the Job:
         self.parent.add_Layers( self )
@@ -87,14 +98,15 @@ class Layer(object):
         s += " "*tab + "  Exposed Images:\n"
 
         if bool( len(self.ImageList) ):
+            X = self.Exposures
             for i in range( len(self.ImageList) ):
                 s += " "*tab + "  %i: '%s'\n" % (i, self.ImageList[i].ImageID)
-                s += " "*tab + "    Energy = %f mJ/cm^2\n" % self.EnergyList[i]
-                s += " "*tab + "    Focus Offset = %0.3f um\n" % self.FocusList[i]
-                s += " "*tab + "    Illuminationmode = `%s`\n" % self.IlluminationModeList[i]
-                s += " "*tab + "    NA = %0.3f\n" % self.NAList[i]
-                s += " "*tab + "    Sig_o = %0.3f\n" % self.Sig_oList[i]
-                if self.Sig_iList[i]: s += " "*tab + "    Sig_i = %0.3f\n" % self.Sig_iList[i]
+                s += " "*tab + "    Energy = %f mJ/cm^2\n" % X["Energy"][i]
+                s += " "*tab + "    Focus Offset = %0.3f um\n" % X["Focus"][i]
+                s += " "*tab + "    Illuminationmode = `%s`\n" % X["IlluminationMode"][i]
+                s += " "*tab + "    NA = %0.3f\n" % X["NA"][i]
+                s += " "*tab + "    Sig_o = %0.3f\n" % X["Sig_o"][i]
+                if np.isfinite(X["Sig_i"][i]) and X["Sig_i"][i]: s += " "*tab + "    Sig_i = %0.3f\n" % X["Sig_i"][i]
             #end for(ImageList)
         else:
             s += " "*tab + "    No Images exposed\n"
@@ -128,11 +140,17 @@ class Layer(object):
     
     
     def copy(self):
-        ''' Returns a copy of this object.  Uses copy.deepcopy() to ensure all pointers are actually copied instead of referenced.'''
+        ''' Returns a copy of this object.  Uses copy.deepcopy(), with the exposure settings shared copy-on-write, see `__deepcopy__()`.'''
         from copy import deepcopy   # to make copies instead of only references
         return deepcopy(self)
     #end copy()
     
+    def __deepcopy__(self, memo):
+        '''Copy for `copy.deepcopy()`: the exposure table (`Exposures`) is shared with the copy until either one changes it.'''
+        from .copylib import shared_deepcopy
+        return shared_deepcopy( self, memo, shared=("_Exposures",) )
+    #end __deepcopy__()
+    
     
     
     ##############################################
@@ -201,12 +219,10 @@ class Layer(object):
     
     def get_LayerShift(self):
         '''Return Layer Shift in mm, as two-valued list.'''
-        try:
-            return self.LayerShift
-        except AttributeError:
+        if self.LayerShift is None:
             if WARN(): print("Using default values for `LayerShift`.")
-            self.set_LayerShift( Defaults.ProcessData_LAYER_SHIFT)
-            return self.LayerShift
+            self.set_LayerShift( self.parent.defaults.ProcessData_LAYER_SHIFT)
+        return self.LayerShift
     #end
     
     
@@ -233,12 +249,10 @@ class Layer(object):
     
     def get_GlobalLevelPoints(self):
         '''Return the three Global Level/Titl points in mm, as three two-valued tuples.'''
-        try:
-            return (self.GlobalLevel_Point1, self.GlobalLevel_Point2, self.GlobalLevel_Point3)
-        except AttributeError:
+        if self.GlobalLevel_Point1 is None:
             if WARN(): print("Using default values for `GlobalLevel_Point1/2/3`.")
             self.set_GlobalLevelPoints(xy1=[0,0], xy2=[0,0], xy3=[0,0] )
-            return (self.GlobalLevel_Point1, self.GlobalLevel_Point2, self.GlobalLevel_Point3)
+        return (self.GlobalLevel_Point1, self.GlobalLevel_Point2, self.GlobalLevel_Point3)
     #end
     
     
@@ -339,19 +353,395 @@ class Layer(object):
         IlluminationMode = self._parse_IllumMode(IlluminationMode)
         
         ## Set the internal attributes
-        self.ImageList.append( Image )
-        self.EnergyList.append( Energy )
-        self.FocusList.append( Focus )
-        self.FocusTiltList.append( FocusTilt )
-        self.NAList.append( NA )
-        self.Sig_oList.append( Sig_o )
-        self.Sig_iList.append( Sig_i )
-        self.IlluminationModeList.append( IlluminationMode )
+        self._add_Exposures( [Image], Energy, Focus, FocusTilt, NA, Sig_o, Sig_i, IlluminationMode )
         
         Image.Layers.append( self )
+        self.parent._index_Exposure( Image, self )
     #end
     
     
+    def expose_Images(self, images, Energy=20, Focus=0.000, FocusTilt=[0,0], NA=0.570, Sig_o=0.750, Sig_i=None, IlluminationMode="Default"):
+        """
+        Set Layer to expose many Images at once, as `expose_Image()` does for one Image.  Each setting is either one value shared by all the Images, or an array with one value per Image.
+        All arguments are checked before any Image is added.
+        
+        Parameters
+        ----------
+        images : list of Image objects
+            The Images to expose.
+        Energy, Focus, NA, Sig_o, Sig_i : numbers or array-likes, optional
+            See `expose_Image()`.  `Sig_i` may contain None for Images without a Sigma Inner setting.
+        FocusTilt : two-valued array-like, or array-like of shape (len(images), 2), optional
+            Rx,Ry focus tilt values.  Defaults to [0,0]
+        IlluminationMode : string, or list of strings, optional
+            See `expose_Image()`.
+        
+        Examples
+        --------
+        >>> Lyr.expose_Images( [Img1, Img2, Img3], Energy=[20, 21, 22], Focus=-0.1 )
+        """
+        images = list(images)
+        exposed = set( id(I) for I in self.ImageList )
+        for I in images:
+            if id(I) in exposed:
+                raise ValueError(   "Image `%s` has already been added to this Layer `%s`."%( I.get_ID(), self.get_ID() )   )
+            exposed.add( id(I) )
+        #end for(images)
+        if isinstance(IlluminationMode, str):
+            IlluminationMode = self._parse_IllumMode(IlluminationMode)
+        else:
+            IlluminationMode = [ self._parse_IllumMode(m) for m in IlluminationMode ]
+        
+        self._add_Exposures( images, Energy, Focus, FocusTilt, NA, Sig_o, Sig_i, IlluminationMode )
+        
+        for I in images:
+            I.Layers.append( self )
+            self.parent._index_Exposure( I, self )
+        #end for(images)
+    #end expose_Images()
+    
+    
+    def _add_Exposures(self, images, Energy, Focus, FocusTilt, NA, Sig_o, Sig_i, IlluminationMode):
+        '''Add `images` to `ImageList`, and a row of exposure settings for each to the exposure table.  The settings are single values or arrays with one value per Image, and `IlluminationMode` must already be parsed.  Raises ValueError, without changing anything, if an array has the wrong length.'''
+        n, used = len(images), len(self.ImageList)
+        rows = np.zeros( n, dtype=_ExposureDType )
+        try:
+            rows["Energy"] = Energy
+            rows["Focus"] = Focus
+            rows["FocusTilt"] = FocusTilt
+            rows["NA"] = NA
+            rows["Sig_o"] = Sig_o
+            Sig_i = np.broadcast_to( np.asarray(Sig_i, dtype=object), (n,) )
+            rows["Sig_i"] = np.where( np.equal(Sig_i, None), np.nan, Sig_i ).astype(float)     # None: not set
+            rows["IlluminationMode"] = IlluminationMode
+        except (ValueError, TypeError) as e:
+            raise ValueError( "Layer `%s`: Exposure settings must be single values or have one value for each of the %i Images: %s" % ( self.get_ID(), n, e ) )
+        
+        unshare( self, "_Exposures" )
+        if used + n > len(self._Exposures):
+            table = np.zeros( max( 2*len(self._Exposures), used + n ), dtype=_ExposureDType )
+            table[:used] = self._Exposures[:used]
+            self._Exposures = table
+        #end if(grow)
+        self._Exposures[used:used+n] = rows
+        self.ImageList.extend( images )
+    #end _add_Exposures()
+    
+    
+    def get_Exposures(self, writable=False):
+        '''
+        Return the exposure settings of the Images in `ImageList`: a numpy structured array with one row per Image, and the fields
+            "Energy", "Focus", "FocusTilt" (Rx,Ry pair), "NA", "Sig_o", "Sig_i" (NaN if not set), "IlluminationMode"
+        
+        Parameters
+        ----------
+        writable : { True | False }, optional
+            If False, return a read-only view, which never copies the table.  If True, return a view for changing the settings in place - the table is first copied if it is still shared with a copy of this Layer (see `Job.copy()`).  Defaults to False.
+        
+        Examples
+        --------
+        Scale all energies by 5%:
+        >>> Lyr.get_Exposures(writable=True)["Energy"] *= 1.05
+        '''
+        if writable: unshare( self, "_Exposures" )
+        X = self._Exposures[ : len(self.ImageList) ]
+        if not writable: X.setflags(write=False)     # a view - the table itself stays writable
+        return X
+    #end get_Exposures()
+    
+    Exposures = property( get_Exposures, doc="Read-only exposure table of the Images in `ImageList`, see `get_Exposures()`." )
+    
+    ## Columns of the exposure table, by their previous list names:
+    EnergyList = _ExposureColumn( "Energy", "Exposure energy of each Image in `ImageList`, a column of `Exposures`." )
+    FocusList = _ExposureColumn( "Focus", "Focus offset of each Image in `ImageList`, a column of `Exposures`." )
+    FocusTiltList = _ExposureColumn( "FocusTilt", "Focus tilt [Rx,Ry] of each Image in `ImageList`, a column of `Exposures`." )
+    NAList = _ExposureColumn( "NA", "Numerical Aperture of each Image in `ImageList`, a column of `Exposures`." )
+    Sig_oList = _ExposureColumn( "Sig_o", "Sigma Outer of each Image in `ImageList`, a column of `Exposures`." )
+    Sig_iList = property( lambda self: [ None if np.isnan(v) else float(v) for v in self.Exposures["Sig_i"] ], doc="List of the Sigma Inner of each Image in `ImageList`, or None if not set.  A new list; change settings with `get_Exposures(writable=True)`." )
+    IlluminationModeList = _ExposureColumn( "IlluminationMode", "Illumination mode of each Image in `ImageList`, a column of `Exposures`." )
+
+
+    ##############################################
+    #       Shot Overlaps
+    ##############################################
+    
+    def get_ShotIndex(self, marks=True):
+        '''
+        Return a spatial index of every shot on this Layer: each distribution of the exposed Images (Cell position + Image-to-Cell shift, with the Image size), and optionally the exposed Alignment Marks.
+        
+        Parameters
+        ----------
+        marks : { True | False }, optional
+            Include the Marks exposed on this Layer, using the size of each Mark's Image.  Defaults to True.
+        
+        Returns
+        -------
+        index : geomlib.GridIndex
+            Index of the shot rectangles.
+        shots : list of tuples
+            Description of each rectangle in `index`: (Image, [col,row], [shiftX,shiftY]) for Image distributions, or (Mark, None, None) for Marks.
+        '''
+        from .geomlib import get_ShotRects, GridIndex
+        centers, halfsizes, images, imgindex, distindex = get_ShotRects( self.parent, layers=self )
+        shots = [ (images[i], list(images[i].Cells[d]), list(images[i].Shifts[d])) for i,d in zip(imgindex, distindex) ]
+        if marks and self.MarkList:
+            centers = np.concatenate( ( centers, [m.waferXY for m in self.MarkList] ) ).astype(float)
+            halfsizes = np.concatenate( ( halfsizes, [np.asarray(m.Image.sizeXY, dtype=float)/2.0 for m in self.MarkList] ) )
+            shots += [ (m, None, None) for m in self.MarkList ]
+        #end if(marks)
+        lo, hi = centers - halfsizes, centers + halfsizes
+        return GridIndex( lo[:,0], lo[:,1], hi[:,0], hi[:,1] ), shots
+    #end get_ShotIndex()
+    
+    
+    def get_ShotOverlaps(self, touching=False, marks=True):
+        '''
+        Find all pairs of shots on this Layer that overlap each other, such as Images distributed to neighboring Cells with large shifts.  Uses the spatial index from `get_ShotIndex()`, so scales as O(n log n) in the number of shots.
+        
+        Parameters
+        ----------
+        touching : { True | False }, optional
+            If True, shots that only share an edge also count as overlapping. Defaults to False.
+        
+        marks : { True | False }, optional
+            Include the Marks exposed on this Layer. Defaults to True.
+        
+        Returns
+        -------
+        List of ( shotA, shotB ) pairs, each shot described as in `get_ShotIndex()`.
+        '''
+        index, shots = self.get_ShotIndex(marks=marks)
+        pairs = index.overlapping_pairs(touching=touching)
+        if DEBUG(): print( "Layer `%s`: %i overlapping shots, out of %i." % (self.get_LayerID(), len(pairs), len(shots)) )
+        return [ (shots[i], shots[j]) for i,j in pairs ]
+    #end get_ShotOverlaps()
+
+
+
+    def optimize_Route(self, method="2opt", metric="euclidean", apply=False):
+        '''
+        Plan the order of this Layer's shots (Image distributions) for a short stage travel, and report the travel before & after.  See `routelib.plan_route()`.
+        The tool exposes all distributions of one Image together, with the Images in the order of `_get_ExposureSequence()`, so a route is planned within each Image, in the direction that starts closest to the last shot of the previous Image.  The reported travel is for the whole Layer in this order, as exported with `apply=True`.
+        
+        Parameters
+        ----------
+        method : { "2opt" | "nearest" | "serpentine" }, optional
+            Route heuristic.  Defaults to "2opt", a nearest-neighbor route improved by 2-opt moves.
+        
+        metric : { "euclidean" | "chebyshev" }, optional
+            Distance measure for the stage travel.  "chebyshev" uses the larger of the X & Y moves, as for a stage moving both axes at once.  Defaults to "euclidean".
+        
+        apply : { True | False }, optional
+            If True, re-order each Image's distributions to follow the route, so that the IMAGE_DISTRIBUTION sections are exported in route order.  Defaults to False.
+            The distributions belong to the Image, not the Layer, so an Image also exposed on other Layers is re-ordered on those Layers too (with a warning): their shots are the same, but their route is the one planned here.  Use `Job.copy()` first to keep the other Layers' order.
+        
+        Returns
+        -------
+        shots : list of tuples
+            (Image, [col,row], [shiftX,shiftY]) for each shot, in route order.
+        travel : float
+            Stage travel along the route, in mm.
+        travel_before : float
+            Stage travel in the current order, in mm.
+        '''
+        from .geomlib import get_ShotRects
+        from .routelib import plan_route, route_length, _distance
+        centers, halfsizes, images, imgindex, distindex = get_ShotRects( self.parent, layers=self )
+        # current order - Images in exposure sequence, then distribution order:
+        seq = { id(I):k for k,I in enumerate( self._get_ExposureSequence() ) }
+        seqpos = np.array( [ seq.get(id(I), len(seq)) for I in images ], dtype=int )
+        current = np.lexsort( ( distindex, seqpos[imgindex] ) ) if len(imgindex) else np.zeros(0, dtype=int)
+        
+        order = []
+        for i in np.argsort( seqpos, kind='stable' ):
+            k = current[ imgindex[current] == i ]     # this Image's shots, in distribution order
+            if len(k) == 0: continue
+            route = k[ plan_route( centers[k], method=method, metric=metric ) ]
+            if order and len(route) > 1:
+                ends = _distance( centers[ order[-1] ], centers[ [route[0], route[-1]] ], metric )
+                if ends[1] < ends[0]:
+                    route = route[::-1]     # start from the end nearer the previous Image
+            #end if(order)
+            order.extend( route )
+        #end for(images)
+        order = np.array( order, dtype=int )
+        travel, travel_before = route_length(centers, order, metric), route_length(centers, current, metric)
+        if DEBUG(): print( "Layer `%s`: %s route of %i shots, %0.1f mm (was %0.1f mm)." % (self.get_LayerID(), method, len(order), travel, travel_before) )
+        
+        shots = [ ( images[imgindex[n]], list(images[imgindex[n]].Cells[distindex[n]]), list(images[imgindex[n]].Shifts[distindex[n]]) ) for n in order ]
+        
+        if apply:
+            others = sorted( set( L.get_LayerID() for I in images for L in I.Layers if L is not self ) )
+            if WARN() and others: print( "optimize_Route(): Layer `%s` shares Images with Layer(s) %s, whose distributions are re-ordered too." % ( self.get_LayerID(), ", ".join(others) ) )
+            for i,I in enumerate(images):
+                neworder = distindex[ order[ imgindex[order] == i ] ]
+                I.Cells = [ I.Cells[n] for n in neworder ]
+                I.Shifts = [ I.Shifts[n] for n in neworder ]
+            #end for(images)
+        #end if(apply)
+        
+        return shots, travel, travel_before
+    #end optimize_Route()
+
+
+    ##############################################
+    #       Tool Time
+    ##############################################
+    
+    def _get_ExposureSequence(self, shots_only=True):
+        '''Return the Images of this Layer in the order they are exposed on each wafer: the order set with `set_ExposureOrder()`, or else distributed Images in the order of the Job's ImageList (the order of the IMAGE_DISTRIBUTION sections), then the Images of the exposed Marks.  If `shots_only` is True (default), Images without any shots on this Layer are left out.'''
+        markimages = [ m.Image for m in self.MarkList ]
+        order = self.get_ExposureOrder()
+        if order is None:
+            jobpos = { id(I):n for n,I in enumerate(self.parent.ImageList) }
+            order = sorted( [ I for I in self.ImageList if not any( I is J for J in markimages ) ], key=lambda I: jobpos.get(id(I), len(jobpos)) )
+            for I in self.ImageList:
+                if not any( I is J for J in order ): order.append( I )
+        #end if(order)
+        if shots_only:
+            order = [ I for I in order if I.Cells or any( I is J for J in markimages ) ]
+        return order
+    #end _get_ExposureSequence()
+    
+    
+    def estimate_Time(self, timing=None):
+        '''
+        Estimate the tool time to expose this Layer on one wafer, from the machine-timing profile (see `Job.get_TimingProfile()`).
+        Shots are the distributions of the exposed Images plus the exposed Marks, in the order of `_get_ExposureSequence()`.  All shots of one Image are exposed together; changing Image costs a blade move, and changing to an Image on another ReticleID costs a reticle exchange.  Reticle exchanges are counted for a wafer in the middle of a lot, so returning to the first reticle at the start of the next wafer counts as an exchange.
+        
+        Parameters
+        ----------
+        timing : dictionary, optional
+            Override entries of the timing profile, eg. `{"StageSpeed":250.0}`.
+        
+        Returns
+        -------
+        Dictionary with the counts:
+            "shots" : number of shots
+            "steps" : number of stage steps between shots
+            "travel" : stage travel between shots, in mm
+            "images" : number of Images exposed
+            "reticles" : number of distinct ReticleIDs
+            "image_changes", "reticle_changes" : number of Image (blade) and reticle changes per wafer
+            "marks" : number of global-alignment marks measured
+        and the times in seconds:
+            "dose_time", "stage_time", "image_time", "reticle_time", "align_time", "wafer_time"
+        where "wafer_time" is the sum of the others.
+        '''
+        from .geomlib import get_ShotRects
+        from .routelib import route_length
+        T = self.parent.get_TimingProfile(timing)
+        
+        images = self._get_ExposureSequence()
+        energy = { id(I):E for I,E in zip(self.ImageList, self.Exposures["Energy"]) }
+        E = np.array( [ energy.get(id(I), 0.0) for I in images ], dtype=float )
+        
+        centers, halfsizes, imgs, imgindex, distindex = get_ShotRects( self.parent, layers=self )
+        seq = { id(I):k for k,I in enumerate(images) }
+        seqpos = np.array( [ seq.get(id(I), 0) for I in imgs ], dtype=int )     # Images without distributions have no shots
+        shotimg = seqpos[imgindex] if len(imgindex) else np.zeros(0, dtype=int)
+        order = np.lexsort( (distindex, shotimg) )
+        centers, shotimg = centers[order], shotimg[order]
+        if self.MarkList:
+            centers = np.concatenate( ( centers, [m.waferXY for m in self.MarkList] ) ).astype(float)
+            shotimg = np.concatenate( ( shotimg, [ seq[id(m.Image)] for m in self.MarkList ] ) ).astype(int)
+        #end if(MarkList)
+        
+        nshots = len(shotimg)
+        travel = route_length( centers, metric="chebyshev" )   # both stage axes move at once
+        reticles = np.array( [ I.get_ReticleID() for I in images ] )
+        nret = len( np.unique(reticles) )
+        image_changes = max( len(images) - 1, 0 )
+        reticle_changes = int( np.count_nonzero( reticles[1:] != reticles[:-1] ) ) if nret > 1 else 0
+        if nret > 1 and reticles[0] != reticles[-1]: reticle_changes += 1    # back to the first reticle for the next wafer
+        nmarks = len(self.GlobalStrategy.MarkList) if self.GlobalStrategy else 0
+        
+        t = {}
+        t["shots"], t["steps"], t["travel"] = nshots, max(nshots - 1, 0), travel
+        t["images"], t["reticles"] = len(images), nret
+        t["image_changes"], t["reticle_changes"], t["marks"] = image_changes, reticle_changes, nmarks
+        t["dose_time"] = float( np.sum( E[shotimg] ) / T["Intensity"] + nshots * T["ShotOverhead"] )     # mJ/cm^2 / mW/cm^2 = s
+        t["stage_time"] = t["steps"] * T["StepSettle"] + travel / T["StageSpeed"]
+        t["image_time"] = image_changes * T["ImageChange"]
+        t["reticle_time"] = reticle_changes * T["ReticleChange"]
+        t["align_time"] = nmarks * T["AlignMark"] + ( T["PreAlign"] if self.PreAlignMarksList else 0.0 )
+        t["wafer_time"] = t["dose_time"] + t["stage_time"] + t["image_time"] + t["reticle_time"] + t["align_time"]
+        if DEBUG(): print( "Layer `%s`: estimated %0.1f s per wafer, %i shots." % (self.get_LayerID(), t["wafer_time"], nshots) )
+        return t
+    #end estimate_Time()
+
+
+    def set_ExposureOrder(self, images):
+        '''
+        Set the order in which the Images of this Layer are exposed on each wafer, written to IMAGE_EXPOSURE_ORDER in the RETICLE_DATA sections.  Images of this Layer not in `images` are exposed after these, in their current order.  See `optimize_ExposureOrder()` to choose an order that minimizes reticle exchanges.
+        
+        Parameters
+        ----------
+        images : list of Image objects
+            Images exposed on this Layer, in the order to expose them.
+        '''
+        images = list(images)
+        for I in images:
+            if not any( I is J for J in self.ImageList ):
+                raise ValueError( "Image `%s` is not exposed on Layer `%s`." % ( I.get_ID(), self.get_ID() ) )
+        #end for(images)
+        self.ExposureOrder = images
+    #end set_ExposureOrder()
+    
+    def unset_ExposureOrder(self):
+        '''Let the machine choose the exposure order of the Images (IMAGE_EXPOSURE_ORDER 0, the default).'''
+        self.ExposureOrder = None
+    #end unset_ExposureOrder()
+    
+    def get_ExposureOrder(self):
+        '''Return list of all Images exposed on this Layer, in the order set with `set_ExposureOrder()`, or None if no order was set.'''
+        if self.ExposureOrder is None: return None
+        order = [ I for I in self.ExposureOrder if any( I is J for J in self.ImageList ) ]
+        return order + [ I for I in self.ImageList if not any( I is J for J in order ) ]
+    #end get_ExposureOrder()
+    
+    def get_ImageExposureOrder(self, Image):
+        '''Return the IMAGE_EXPOSURE_ORDER value for `Image` on this Layer: its 1-based position in `get_ExposureOrder()`, or `Defaults.ReticleData_IMAGE_EXPOSURE_ORDER` (0, machine default) if no order was set.'''
+        order = self.get_ExposureOrder()
+        if order is None: return self.parent.defaults.ReticleData_IMAGE_EXPOSURE_ORDER
+        return 1 + next( n for n,I in enumerate(order) if I is Image )
+    #end get_ImageExposureOrder()
+    
+    
+    def optimize_ExposureOrder(self, apply=True):
+        '''
+        Order the Images of this Layer to minimize reticle exchanges and reticle-blade moves: all Images on one ReticleID are exposed together, so each reticle is loaded once per wafer, and within a reticle the Images are visited row by row across the reticle (by Image shift), alternating direction.
+        Reticles are kept in their order of first use on this Layer.  Use `estimate_Time()` to compare the tool time before & after.
+        
+        Parameters
+        ----------
+        apply : { True | False }, optional
+            If True (default), set the order with `set_ExposureOrder()`, so it is written to the exported job.
+        
+        Returns
+        -------
+        List of the Image objects in exposure order.
+        '''
+        from .routelib import serpentine_route
+        images = self._get_ExposureSequence( shots_only=False )
+        reticles = []
+        for I in images:
+            if I.get_ReticleID() not in reticles: reticles.append( I.get_ReticleID() )
+        #end for(images)
+        
+        order = []
+        for R in reticles:
+            group = [ I for I in images if I.get_ReticleID() == R ]
+            XY = np.array( [ I.shiftXY for I in group ], dtype=float )
+            order += [ group[n] for n in serpentine_route( XY ) ]
+        #end for(reticles)
+        
+        if DEBUG(): print( "Layer `%s`: exposure order %s" % ( self.get_LayerID(), [I.get_ID() for I in order] ) )
+        if apply: self.set_ExposureOrder( order )
+        return order
+    #end optimize_ExposureOrder()
+
+
     ##############################################
     #       Alignment etc.
     ##############################################
@@ -385,14 +775,7 @@ class Layer(object):
             ## Only add the Image once:
             if DEBUG(): print("Layer.expose_marks(): not IsIn = ", not np.isin( m.Image, self.ImageList )  )
             if not np.isin( m.Image, self.ImageList ):
-                self.ImageList.append( m.Image )
-                self.EnergyList.append( Energy )
-                self.FocusList.append( Focus )
-                self.FocusTiltList.append( FocusTilt )
-                self.NAList.append( NA )
-                self.Sig_oList.append( Sig_o )
-                self.Sig_iList.append( Sig_i )
-                self.IlluminationModeList.append( IlluminationMode )
+                self._add_Exposures( [m.Image], Energy, Focus, FocusTilt, NA, Sig_o, Sig_i, IlluminationMode )
             #end if(Mark.Image not in ImageList)
             
             self.MarkList.append(m)
@@ -405,7 +788,7 @@ class Layer(object):
         Enable Optical Prealignment on this Layer.
         Pass a list/iterable containing the two Mark objects corresponding to the alignment marks to be used for Optical Prealignment.
         
-        Note that the chosen marks must lie in the limited region reachable by the optical prealignment camera system, and must be on opposide sides of the wafer.
+        Note that the chosen marks must lie in the limited region reachable by the optical prealignment camera system, and must be on opposide sides of the wafer.  Set `check_position=True` to verify this, see `Alignment.check_PreAlignLocation()`: all four corners of each mark's Image (`Mark.Image.sizeXY`, eg. the wider SPM-X mark) must lie in the allowed region.  Use `Alignment.get_PreAlignmentMap()` and `Alignment.get_PreAlignmentPairs()` to find allowed positions.
         """
         from .Mark import Mark as _Mark     # Mark class
         
@@ -428,39 +811,18 @@ class Layer(object):
         if check_position:
             # Ensure that marks are in allowed pre-alignment region
             # (See image in Issue 43)
+            Al = self.parent.Alignment
             errtemplate = "\npre-alignment position {} ({:.6f},{:.6f}) not allowed"
-            markallowed = [1, 1]
             errstr = ""
-            r_min = Defaults.AlignmentMark_PreAlignLocation_MinRadius # mm
-            r_max = Defaults.WFR_DIAMETER/2 - self.get_RoundEdgeClearance()
-            # y_min = # TODO also forbid prealignment using flat clearance?
-            # (see get_flat_edge_clearance_y in Cell.get_ValidCells)
             for ii, mark in enumerate([mark1, mark2]):
-                x0, y0 = mark.waferXY
-                d = 1.640/4 / 2 # half of the mark side-length
-                for dx, dy in [(-d, -d), (d, -d), (-d, d), (d, d)] :
-                    x1, y1 = x0+dx, y0+dy
-
-                    theta = np.rad2deg(atan2(y1, x1))
-                    if 20 <= theta <= 70: markallowed[ii] = 0; break
-                    if 110 <= theta <= 160: markallowed[ii] = 0; break
-                    if -70 <= theta <= -20: markallowed[ii] = 0; break
-                    if -160 <= theta <= -110: markallowed[ii] = 0; break
-
-                    r2 = x1*x1 + y1*y1
-                    if r2 <= r_min*r_min: markallowed[ii] = 0; break
-                    if r2 >= r_max*r_max: markallowed[ii] = 0; break
-                    # TODO handle notch/wafer flat
-                if not markallowed[ii]: errstr += errtemplate.format(ii+1, x0, y0)
+                if not Al.check_PreAlignLocation( mark.waferXY, markXY=mark.Image.sizeXY )[0]:
+                    errstr += errtemplate.format(ii+1, mark.waferXY[0], mark.waferXY[1])
             if errstr != "": raise ValueError(errstr)
 
             # Ensure that the marks on "opposite sides of the wafer"
-            theta1 = np.rad2deg(atan2(mark1.waferXY[1], mark1.waferXY[0]))
-            theta2 = np.rad2deg(atan2(mark2.waferXY[1], mark2.waferXY[0]))
-            dtheta1 = abs(theta2 - theta1)
-            dtheta2 = 360.0 - dtheta1
-            dtheta = min([dtheta1, dtheta2])
-            if dtheta <= 140.0 :
+            if not Al.get_PreAlignmentPairs( marks=[mark1, mark2] ):
+                theta1 = np.rad2deg(atan2(mark1.waferXY[1], mark1.waferXY[0]))
+                theta2 = np.rad2deg(atan2(mark2.waferXY[1], mark2.waferXY[0]))
                 errstr = "Expected marks on opposite sides of the wafer: "
                 errstr += "mark angles are {:.1f} and {:.1f} degrees".format(
                     theta1, theta2)
@@ -36,6 +36,8 @@ class Mark(object):
         
     """
     
+    __slots__ = ( "parent", "MarkID", "MarkType", "Image", "waferXY", "isBackup" )
+    
     def __init__(self, MarkID, MarkType="PM", waferXY=None, parent=None):
         '''Define an alignment mark, either by cell_index/cell_shift OR wafer-coord (not both).
         Only waferXY (on-wafer coordinates) are implemented.
@@ -55,9 +57,6 @@ class Mark(object):
             The Alignment object this Mark belongs to.
         
         '''
-        from . import Images    # Image library from ./Images/
-        self.Images = Images    
-            
         self.parent = parent    # parent Alignment object
         self.set_MarkID(MarkID)
         self.set_marktype(MarkType)     # also sets self.Image
@@ -116,6 +115,7 @@ class Mark(object):
         Mark.Image : Image object
             The Image corresponding to this Mark type, allowing for exposure of the Mark.  The Images are pre-defined in the ASML_JobCreator/Images/ folder.
         '''        
+        from . import Images    # Image library from ./Images/
         s = str(MarkType_str).strip().lower()
         
         # argument synonym options:
@@ -125,13 +125,13 @@ class Mark(object):
         
         if np.any(  np.isin( PM_Strings , s )  ):
             out= 'pm'
-            self.Image = self.Images.PM
+            self.Image = Images.PM
         elif np.any(  np.isin( SPM_X_Strings , s )  ):
             out= 'spm_x'
-            self.Image = self.Images.SPM_X
+            self.Image = Images.SPM_X
         elif np.any(  np.isin( SPM_Y_Strings , s )  ):
             out= 'spm_y'
-            self.Image = self.Images.SPM_Y
+            self.Image = Images.SPM_Y
         else:
             errstr = "Passed argument option `%s` is not in the list of valid options, which are:\n\t" + \
                 str(PM_Strings) + "\n\t" + \
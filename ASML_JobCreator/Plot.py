@@ -65,32 +65,10 @@ class Plot(object):
         fig, ax = plt.subplots(nrows=1, ncols=1) if figax is None else figax
         LegendEntries = []
 
-        ## Plot the wafer outline:
-        # Arc angles:
-        F = self.parent.defaults.WFR_FLAT_LENGTH    # wafer flat length, mm
-        D = self.parent.defaults.WFR_DIAMETER   # wafer diameter, mm
-        if Defaults.WFR_NOTCH.upper() == "N":
-            A = np.rad2deg(  np.arcsin( (F/2) / (D/2) )  )  # arc angle corresponding to 1/2 of wafer flat
-        else:
-            A = 2
-            
-        if showwafer:
-            # matplotlib.patches.Arc(xy, width, height, angle=0.0, theta1=0.0, theta2=360.0) :
-            wf = mplp.Arc( (0,0) , D, D, angle=-90, theta1=A, theta2=-A , color=Defaults.Plotting_WaferEdgeColor, hatch=Defaults.Plotting_BGHatch, label="Wafer")
-            ax.add_patch( wf )
-
-        ## Plot the edge clearance
-        # Arc angles:
-        Fc = F - self.parent.Cell.get_FlatEdgeClearance()
-        Dc = D - 2*self.parent.Cell.get_RoundEdgeClearance()
-        if Defaults.WFR_NOTCH.upper() == "N":
-            Ac = np.rad2deg(  np.arcsin( (Fc/2) / (Dc/2) )  ) # arc angle corresponding to 1/2 of wafer flat
-        else:
-            Ac = 2
-        
+        ## Plot the wafer outline & edge clearance:
+        D = self.parent.get_WaferDiameter()   # wafer diameter, mm
         if showwafer:
-            clearance = mplp.Arc( (0,0) , Dc, Dc, angle=-90, theta1=Ac, theta2=(-Ac) , color=Defaults.Plotting_WaferColor, hatch=Defaults.Plotting_BGHatch, label="Edge Clearance")
-            ax.add_patch( clearance )
+            wf, clearance = self._plot_waferoutline(ax)
         
         
         ## Plot the Cell grid:
@@ -160,13 +138,13 @@ class Plot(object):
         #end for(ytick)
         
         if showwafer:
-            ax.grid(True, which='minor', color=Defaults.Plotting_GridColor, linestyle=Defaults.Plotting_GridStyle)
+            ax.grid(True, which='minor', color=self.parent.defaults.Plotting_GridColor, linestyle=self.parent.defaults.Plotting_GridStyle)
             ax.grid(False, which='major')
         #end if(showwafer)
         
                 
         # Plot the distributed images:
-        cmap = plt.get_cmap(Defaults.Plotting_ImageColorMap)    # cycling colors
+        cmap = plt.get_cmap(self.parent.defaults.Plotting_ImageColorMap)    # cycling colors
         for i, Img in enumerate(self.parent.ImageList):
             Iwidth = Img.sizeXY[0]
             Iheight = Img.sizeXY[1]
@@ -187,7 +165,7 @@ class Plot(object):
                     if DEBUG(): print("X,Y=", X,Y)
                     #DELETE? Icen = np.array(  [ () , () ]  )
                     # matplotlib.patches.Rectangle( (x,y), width, height):
-                    R = mplp.Rectangle( (X,Y),  Iwidth, Iheight, color=cmap(i%len(cmap.colors)), label=Img.ImageID, alpha=Defaults.Plotting_Alpha, linewidth=Defaults.Plotting_LineWidth )
+                    R = mplp.Rectangle( (X,Y),  Iwidth, Iheight, color=cmap(i%len(cmap.colors)), label=Img.ImageID, alpha=self.parent.defaults.Plotting_Alpha, linewidth=self.parent.defaults.Plotting_LineWidth )
                     ax.add_patch(   R   )
                     if ii==0: LegendEntries.append( R ) # add once only
                 #end for(ImgDistr)
@@ -197,7 +175,7 @@ class Plot(object):
         
                 # Plot alignment marks
         if self.parent.Alignment:
-            cmap = plt.get_cmap(Defaults.Plotting_MarkColorMap)    # cycling colors
+            cmap = plt.get_cmap(self.parent.defaults.Plotting_MarkColorMap)    # cycling colors
             c=-1 # colormap index
             AlImgs = []
             for i, Mrk in enumerate(self.parent.Alignment.MarkList):
@@ -214,11 +192,11 @@ class Plot(object):
                 #end if(Mark added to legend)
                 
                 R = mplp.Rectangle( (X,Y),  Iwidth, Iheight, 
-                facecolor=Defaults.Plotting_MarkFace, 
+                facecolor=self.parent.defaults.Plotting_MarkFace, 
                 edgecolor=cmap(c),
                 label=Mrk.Image.ImageID, 
-                alpha=Defaults.Plotting_MarkAlpha, 
-                linewidth=Defaults.Plotting_MarkLineWidth )
+                alpha=self.parent.defaults.Plotting_MarkAlpha, 
+                linewidth=self.parent.defaults.Plotting_MarkLineWidth )
                 ax.add_patch(   R   )
                 
                 if len(Imgi)==0:
@@ -280,7 +258,7 @@ class Plot(object):
         #if not DEBUG(): raise NotImplementedError("This function is incomplete!")
         
         if scale:
-            Mag = Defaults.ProcessData_LENS_REDUCTION
+            Mag = self.parent.defaults.ProcessData_LENS_REDUCTION
         else:
             Mag = 1.0
         
@@ -290,7 +268,7 @@ class Plot(object):
         if saveretfigs:
             import os
         
-        Rets = self._get_ReticlesPerImage()
+        Rets = self.parent.get_Reticles()   # {ReticleID : [Images]}
         figs, axs = [],[]        
 
         # set_DEBUG()
@@ -302,43 +280,43 @@ class Plot(object):
             
             if showlens:
                 ## Plot the Lens outline:
-                Lens = mplp.Circle( (0,0), Defaults.LENS_DIAMETER/2.0 * Mag, label="Lens Diameter", 
-                facecolor=Defaults.Plotting_LensColor, 
-                linewidth=Defaults.Plotting_ReticleBGOutlineWidth,
-                edgecolor=Defaults.Plotting_ReticleBGOutlineColor, 
-                linestyle=Defaults.Plotting_ReticleBGOutlineStyle,
-                alpha = Defaults.Plotting_ReticleLensAlpha  )
+                Lens = mplp.Circle( (0,0), self.parent.defaults.LENS_DIAMETER/2.0 * Mag, label="Lens Diameter", 
+                facecolor=self.parent.defaults.Plotting_LensColor, 
+                linewidth=self.parent.defaults.Plotting_ReticleBGOutlineWidth,
+                edgecolor=self.parent.defaults.Plotting_ReticleBGOutlineColor, 
+                linestyle=self.parent.defaults.Plotting_ReticleBGOutlineStyle,
+                alpha = self.parent.defaults.Plotting_ReticleLensAlpha  )
                 ax.add_patch(   Lens   )
             #end if(showlens)
         
             if showwindow:
                 ## Plot the Reticle Table outline:
-                RT = mplp.Rectangle( (-Defaults.RETICLE_TABLE_WINDOW[0]/2.0 * Mag, -Defaults.RETICLE_TABLE_WINDOW[1]/2.0 * Mag), Defaults.RETICLE_TABLE_WINDOW[0] * Mag, Defaults.RETICLE_TABLE_WINDOW[1] * Mag,
+                RT = mplp.Rectangle( (-self.parent.defaults.RETICLE_TABLE_WINDOW[0]/2.0 * Mag, -self.parent.defaults.RETICLE_TABLE_WINDOW[1]/2.0 * Mag), self.parent.defaults.RETICLE_TABLE_WINDOW[0] * Mag, self.parent.defaults.RETICLE_TABLE_WINDOW[1] * Mag,
                 label="Reticle Table Window", 
-                facecolor=Defaults.Plotting_ReticleTableColor, 
-                linewidth=Defaults.Plotting_ReticleBGOutlineWidth,
-                edgecolor=Defaults.Plotting_ReticleBGOutlineColor, 
-                linestyle=Defaults.Plotting_ReticleBGOutlineStyle,
-                alpha = Defaults.Plotting_ReticleTableAlpha )
+                facecolor=self.parent.defaults.Plotting_ReticleTableColor, 
+                linewidth=self.parent.defaults.Plotting_ReticleBGOutlineWidth,
+                edgecolor=self.parent.defaults.Plotting_ReticleBGOutlineColor, 
+                linestyle=self.parent.defaults.Plotting_ReticleBGOutlineStyle,
+                alpha = self.parent.defaults.Plotting_ReticleTableAlpha )
                 ax.add_patch(   RT   )
             #end if(showwindow)
         
             ax.set_xlabel("%ix Scale, mm" % (Mag), fontsize=PlotLabelFontSize)
             ax.set_ylabel("mm", fontsize=PlotLabelFontSize)
             ax.set_title("ReticleID: " + RetStr)
-            ax.grid(True, which='major', color=Defaults.Plotting_GridColor, linestyle=Defaults.Plotting_GridStyle)
+            ax.grid(True, which='major', color=self.parent.defaults.Plotting_GridColor, linestyle=self.parent.defaults.Plotting_GridStyle)
         
             
             # Plot the defined images:
-            cmap = plt.get_cmap(Defaults.Plotting_ImageColorMap)    # cycling colors
+            cmap = plt.get_cmap(self.parent.defaults.Plotting_ImageColorMap)    # cycling colors
             for i, Img in enumerate(Imgs):
-                #if DEBUG(): print("_get_ReticlesPerImage(): Imgs:\n", Imgs, "\nImg #%i\n"%i, Img)
+                #if DEBUG(): print("plot_reticles(): Imgs:\n", Imgs, "\nImg #%i\n"%i, Img)
                 Iwidth = Img.sizeXY[0] * Mag
                 Iheight = Img.sizeXY[1] * Mag
                 X = Img.shiftXY[0] * Mag - Iwidth/2
                 Y = Img.shiftXY[1] * Mag - Iheight/2
                 
-                R = mplp.Rectangle( (X,Y),  Iwidth, Iheight, color=cmap(i%len(cmap.colors)), label=Img.ImageID, alpha=Defaults.Plotting_Alpha, linewidth=Defaults.Plotting_LineWidth )
+                R = mplp.Rectangle( (X,Y),  Iwidth, Iheight, color=cmap(i%len(cmap.colors)), label=Img.ImageID, alpha=self.parent.defaults.Plotting_Alpha, linewidth=self.parent.defaults.Plotting_LineWidth )
                 ax.add_patch(   R   )
                 LegendEntries.append( R ) # add once only
             #end for(Imagelist)
@@ -368,35 +346,210 @@ class Plot(object):
 
     plot_reticle = plot_reticles    # alias for convenience
     
+    def _plot_waferoutline(self, ax):
+        """Add the wafer outline and edge clearance outline to axis `ax`, as Matplotlib Arc patches.  
+        
+        Returns
+        -------
+        wf, clearance : Matplotlib Arc patches for the Wafer outline & Edge Clearance outline, for use in legends.
+        """
+        import matplotlib.patches as mplp   # for plotting shapes
+        
+        ## Plot the wafer outline:
+        # Arc angles:
+        Wafer = self.parent.get_WaferProfile()
+        D = Wafer.Diameter   # wafer diameter, mm
+        A = Wafer.get_ArcAngle()  # arc angle corresponding to 1/2 of wafer flat/notch
+        
+        # matplotlib.patches.Arc(xy, width, height, angle=0.0, theta1=0.0, theta2=360.0) :
+        wf = mplp.Arc( (0,0) , D, D, angle=-90, theta1=A, theta2=-A , color=self.parent.defaults.Plotting_WaferEdgeColor, hatch=self.parent.defaults.Plotting_BGHatch, label="Wafer")
+        ax.add_patch( wf )
+        
+        ## Plot the edge clearance
+        # Arc angles:
+        Dc = D - 2*self.parent.Cell.get_RoundEdgeClearance()
+        Ac = Wafer.get_ArcAngle( self.parent.Cell.get_RoundEdgeClearance(), self.parent.Cell.get_FlatEdgeClearance() )
+        
+        clearance = mplp.Arc( (0,0) , Dc, Dc, angle=-90, theta1=Ac, theta2=(-Ac) , color=self.parent.defaults.Plotting_WaferColor, hatch=self.parent.defaults.Plotting_BGHatch, label="Edge Clearance")
+        ax.add_patch( clearance )
+        return wf, clearance
+    #end _plot_waferoutline()
+    
     
     
-    def _get_ReticlesPerImage(self):
-        '''Analyze ReticleID's in each Image, and figure out how many reticles and which images are on it.
+    def plot_prealignment(self, figax=None, resolution=0.5, showwafer=True):
+        """
+        Plot the wafer regions allowed for Optical Prealignment marks, as calculated by `Alignment.get_PreAlignmentMap()`.  
+        Pass the `figax` returned by `plot_wafer()` to draw this as an overlay on the wafer layout, eg:
+        >>> MyJob.Plot.plot_prealignment( figax=MyJob.Plot.plot_wafer() )
+        
+        Parameters
+        ----------
+        figax : figure and axis tuple, optional
+            If not None, plot into the given figure and axis.  Otherwise creates a new figure and axis.
+        
+        resolution : float, optional
+            Grid spacing in mm. Defaults to 0.5mm.
+        
+        showwafer : True | False, optional
+            Show the wafer outline + edge clearance, only if a new figure is created. Defaults to True.
         
         Returns
         -------
-        Reticles : list of strings
-            Unique ReticleID's in this job
-        Images : list of lists
-            Each list corresponds to the Reticle ID.
-        
-        Examples
-        --------
-        >>> One = Image(ImageID="One", ReticleID="Ret1", ....)
-        >>> Two = Image(ImageID="Two", ReticleID="Ret1", ....)
-        >>> Three = Image(ImageID="Three", ReticleID="RetTwo", ....)
-        >>> Reticles = _get_ReticlesPerImage( [One, Two, Three] )
-        returns:
-        : Reticles = {"Ret1" : [One,Two] , "RetTwo": [Three]}
-        '''
-        Rets = {}
-        for I in self.parent.ImageList:
-            Rstr = I.get_ReticleID()
-            if Rstr in Rets: Rets[Rstr].append(I)
-            else: Rets[Rstr] = [I]
-        #end for(ImageList)
-        if DEBUG(): print("_get_ReticlesPerImage(): Rets = \n", Rets)
-        return Rets
-    #end _get_ReticlesPerImage()
+        fig, ax : Matplotlib Figure and Axis objects containing the plot.
+        """
+        import matplotlib.pyplot as plt
+        from matplotlib.colors import ListedColormap
+        
+        X, Y, allowed = self.parent.Alignment.get_PreAlignmentMap(resolution=resolution)
+        if figax is None:
+            fig, ax = plt.subplots(nrows=1, ncols=1)
+            if showwafer:
+                wf, clearance = self._plot_waferoutline(ax)
+            ax.set_xlabel("Wafer X, mm", fontsize=PlotLabelFontSize)
+            ax.set_ylabel("Wafer Y, mm", fontsize=PlotLabelFontSize)
+        else:
+            fig, ax = figax
+        #end if(figax)
+        
+        extent = [ X[0] - resolution/2.0, X[-1] + resolution/2.0, Y[0] - resolution/2.0, Y[-1] + resolution/2.0 ]
+        cmap = ListedColormap( ["none", self.parent.defaults.Plotting_PreAlignColor] )
+        ax.imshow( allowed, origin='lower', extent=extent, cmap=cmap, vmin=0, vmax=1, alpha=self.parent.defaults.Plotting_PreAlignAlpha, interpolation='nearest', zorder=0 )
+        ax.axis('scaled')  # proportional axes
+        
+        fig.show()
+        return fig, ax
+    #end plot_prealignment()
+    
+    
+    def get_ExposureMap(self, layer=None):
+        """
+        Return per-Cell exposure statistics, summed over all Layers (or only the specified Layers), as 2-D arrays indexed by [Col,Row].
+        Every Layer's ImageList & exposure energies and each Image's distribution are collected into flat arrays and binned into the Cell grid in a single pass.  Alignment Marks (which are placed by wafer-coordinate rather than by Cell) are not included.
+        
+        Parameters
+        ----------
+        layer : valid LayerID string or list of LayerID strings, optional
+            If not None, only include the specified Layers. Defaults to None.
+        
+        Returns
+        -------
+        cols, rows : 1-D integer arrays
+            Cell Column & Row index corresponding to each axis of the following arrays.
+        shots : 2-D integer array, shape (len(cols), len(rows))
+            Number of exposures landing in each Cell.
+        dose : 2-D float array, shape (len(cols), len(rows))
+            Total exposure energy (mJ/cm^2) in each Cell, summed over all shots.
+        reticles : 2-D integer array, shape (len(cols), len(rows))
+            Number of distinct ReticleID's exposed in each Cell.
+        """
+        if type(layer) is str: layer = [layer]
+        Job = self.parent
+        RetIndex = { R:i for i,R in enumerate( Job.get_ReticleIDs() ) }
+        
+        # Collect all shots into flat arrays:
+        cells, energy, reticle = [], [], []
+        for L in Job.LayerList:
+            if (layer is not None) and (L.LayerID not in layer): continue
+            for Img, E in zip(L.ImageList, L.Exposures["Energy"]):
+                if not Img.Cells: continue
+                n = len(Img.Cells)
+                cells.append(  np.asarray(Img.Cells, dtype=int).reshape(n,2)  )
+                energy.append(  np.full(n, E, dtype=float)  )
+                reticle.append(  np.full(n, RetIndex.get(Img.get_ReticleID(), 0), dtype=int)  )
+            #end for(ImageList)
+        #end for(LayerList)
         
+        # Cell grid covering the wafer and all distributed Cells:
+        CellSize = np.asarray( Job.Cell.get_CellSize(), dtype=float )
+        Nmax = np.ceil( Job.get_WaferDiameter()/2 / CellSize ).astype(int) + 1
+        if cells:
+            cells = np.concatenate(cells)
+            energy = np.concatenate(energy)
+            reticle = np.concatenate(reticle)
+            lo = np.minimum( -Nmax, cells.min(axis=0) )
+            hi = np.maximum( Nmax, cells.max(axis=0) )
+        else:
+            cells = np.zeros( (0,2), dtype=int )
+            energy = np.zeros(0)
+            reticle = np.zeros(0, dtype=int)
+            lo, hi = -Nmax, Nmax
+        #end if(cells)
+        cols = np.arange( lo[0], hi[0]+1 )
+        rows = np.arange( lo[1], hi[1]+1 )
+        nc, nr = len(cols), len(rows)
+        
+        # Bin the shots into the grid:
+        idx = (cells[:,0] - lo[0]) * nr + (cells[:,1] - lo[1])
+        shots = np.bincount( idx, minlength=nc*nr ).reshape(nc,nr)
+        dose = np.bincount( idx, weights=energy, minlength=nc*nr ).reshape(nc,nr)
+        nret = max( len(RetIndex), 1 )
+        uniq = np.unique( idx * nret + reticle )    # unique (Cell, Reticle) pairs
+        reticles = np.bincount( uniq // nret, minlength=nc*nr ).reshape(nc,nr)
+        
+        if DEBUG(): print("get_ExposureMap(): %i shots in %i Cells" % ( len(idx), np.count_nonzero(shots) ) )
+        return cols, rows, shots, dose, reticles
+    #end get_ExposureMap()
+    
+    
+    def plot_exposuremap(self, quantity="dose", layer=None, figax=None, showwafer=True):
+        """
+        Plot a per-Cell heatmap of the exposures across Layers, for spotting over/under-exposed regions of the wafer.  See `get_ExposureMap()` for how the values are calculated.
+        
+        Parameters
+        ----------
+        quantity : {"dose" | "shots" | "reticles"}, optional
+            Which value to plot per Cell: total summed exposure energy ("dose", the default), number of exposures ("shots"), or number of distinct reticles ("reticles").
+        
+        layer : valid LayerID string or list of LayerID strings, optional
+            If not None, only include the specified Layers. Default to None.
+        
+        figax : figure and axis tuple, optional
+            If not None, plot into the given figure and axis.  Otherwise creates a new figure and axis.
+        
+        showwafer : True | False, optional
+            Show the wafer outline + edge clearance. Defaults to True.
+        
+        Returns
+        -------
+        fig, ax : Matplotlib Figure and Axis objects containing the heatmap.
+        """
+        import matplotlib.pyplot as plt
+        
+        cols, rows, shots, dose, reticles = self.get_ExposureMap(layer=layer)
+        q = str(quantity).strip().lower()
+        if q == "dose":
+            Z, label = dose, "Total Dose, mJ/cm^2"
+        elif q == "shots":
+            Z, label = shots, "Number of Shots"
+        elif q == "reticles":
+            Z, label = reticles, "Number of Reticles"
+        else:
+            errstr = "Passed argument option `%s` is not in the list of valid options, which are:\n\t" % (quantity) + str(["dose", "shots", "reticles"])
+            raise ValueError(errstr)
+        #end if(quantity)
+        
+        fig, ax = plt.subplots(nrows=1, ncols=1) if figax is None else figax
+        
+        # Cell edges in wafer coordinates:
+        CellSize = self.parent.Cell.get_CellSize()
+        MatrixShift = self.parent.Cell.get_MatrixShift()
+        Xedges = np.append(cols - 0.5, cols[-1] + 0.5) * CellSize[0] + MatrixShift[0]
+        Yedges = np.append(rows - 0.5, rows[-1] + 0.5) * CellSize[1] + MatrixShift[1]
+        
+        Z = np.ma.masked_where( shots.T == 0, Z.T )    # pcolormesh is indexed [Y,X]
+        mesh = ax.pcolormesh( Xedges, Yedges, Z, cmap=self.parent.defaults.Plotting_ExposureColorMap, alpha=self.parent.defaults.Plotting_Alpha )
+        fig.colorbar( mesh, ax=ax, label=label )
+        
+        if showwafer:
+            wf, clearance = self._plot_waferoutline(ax)
+        ax.set_xlabel("Wafer X, mm", fontsize=PlotLabelFontSize)
+        ax.set_ylabel("Wafer Y, mm", fontsize=PlotLabelFontSize)
+        ax.axis('scaled')  # proportional axes
+        
+        fig.show()
+        return fig, ax
+    #end plot_exposuremap()
+    
+    
 #end class(Plot)
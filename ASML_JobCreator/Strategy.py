@@ -41,6 +41,8 @@ class Strategy(object):
             The parent Alignment object containing this Strategy.
     """
     
+    __slots__ = ( "parent", "StrategyID", "MarkList", "MarkPrefList", "required_marks" )
+    
     def __init__(self, StrategyID, marks=None, parent=None):
         '''
         Parameters
@@ -59,6 +61,7 @@ class Strategy(object):
         
         self.MarkList = []
         self.MarkPrefList = []
+        self.required_marks = None  # all Marks, see `get_required_marks()`
         if marks:
             for m in marks:
                 self.add_mark( m )
@@ -115,10 +118,7 @@ class Strategy(object):
     
     def get_ID(self):
         '''Return Strategy ID as string.'''
-        try:
-            return self.StrategyID
-        except AttributeError:
-            raise AttributeError("Strategy ID has not been set yet.  Use `Strategy.set_ID()`.")
+        return self.StrategyID
     #end
     
     
@@ -188,11 +188,9 @@ class Strategy(object):
     
     def get_required_marks(self):
         '''Return the number of required marks to pass during Mark measurement.'''
-        try:
-            return self.required_marks
-        except AttributeError:
+        if self.required_marks is None:
             self.required_marks = len(self.MarkList)
-            return self.required_marks
+        return self.required_marks
     #end get_required_marks()
 
     
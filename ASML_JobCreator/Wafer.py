@@ -0,0 +1,227 @@
+"""
+This file is part of the ASML_JobCreator package for Python 3.x.
+
+Wafer.py
+    Class 'WaferProfile', describing the wafer geometry (diameter, flat or notch), and the library of standard profiles `WaferProfiles`.
+
+- - - - - - - - - - - - - - -
+
+ASML_JobCreator contributors; 2026
+
+"""
+
+####################################################
+# Module setup etc.
+
+from .__globals import *    # global variables/methods to the module.
+
+
+####################################################
+
+
+class WaferProfile(object):
+    """
+    Wafer geometry: diameter, and a flat or notch at the bottom (-Y) of the wafer.
+    
+    WaferProfile( Name, Diameter, Notch="N", FlatLength=None, NotchAngle=2.0 )
+    
+    The flat or notch is modeled as a chord across the bottom of the wafer.  For a flat, the chord is the flat itself, `FlatLength` long.  A notch is approximated by a short chord spanning +/-`NotchAngle` degrees around -Y.
+    Valid-Cell tables calculated with `get_ValidCellTable()` are cached in memory, and optionally on disk, see `Defaults.WaferProfile_CacheDir`.
+    
+    Parameters
+    ----------
+    Name : string
+        Name of this profile, eg. "150mm".
+    Diameter : float
+        Wafer diameter in mm, as written to WFR_DIAMETER.
+    Notch : { "N" | "Y" }, optional
+        "N" for a flatted wafer, "Y" for a notched wafer, as written to WFR_NOTCH.  Defaults to "N".
+    FlatLength : float
+        Length of the wafer flat in mm.  Required if `Notch` is "N".
+    NotchAngle : float, optional
+        Half-angle in degrees of the region excluded by the notch.  Defaults to 2.0.
+    
+    Examples
+    --------
+    >>> MyJob.set_WaferProfile( "150mm" )
+    >>> MyJob.set_WaferProfile( asml.WaferProfile("125mm", 125.0, Notch="N", FlatLength=42.5) )
+    """
+    
+    def __init__(self, Name, Diameter, Notch="N", FlatLength=None, NotchAngle=2.0):
+        '''WaferProfile constructor. See `help(WaferProfile)` for parameters.'''
+        self.Name = str(Name)
+        self.Diameter = float(Diameter)
+        self.Notch = str(Notch).upper()
+        if self.Notch not in ("N", "Y"):
+            raise ValueError( 'WaferProfile `%s`: Expected `Notch` to be "N" (flat) or "Y" (notch), instead got: %s' % (self.Name, Notch) )
+        if self.Notch == "N" and FlatLength is None:
+            raise ValueError( "WaferProfile `%s`: `FlatLength` is required for a flatted wafer." % self.Name )
+        self.FlatLength = None if FlatLength is None else float(FlatLength)
+        self.NotchAngle = float(NotchAngle)
+        
+        self._tables = {}       # valid-Cell tables, keyed by Cell structure
+    #end __init__
+    
+    
+    def __str__(self, tab=0):
+        '''Return string to `print` this object. Indent the text with the `tab` argument, which will indent by the specified number of spaces (defaults to 0).'''
+        if self.Notch == "N":
+            s = " "*tab + "WaferProfile `%s`: %0.1f mm diameter, %0.1f mm flat.\n" % (self.Name, self.Diameter, self.FlatLength)
+        else:
+            s = " "*tab + "WaferProfile `%s`: %0.1f mm diameter, notch (+/-%0.1f deg.).\n" % (self.Name, self.Diameter, self.NotchAngle)
+        return s
+    #end __str__
+    
+    
+    def _key(self):
+        '''Tuple identifying the geometry of this profile, for caching.'''
+        return ( self.Diameter, self.Notch, self.FlatLength, self.NotchAngle )
+    #end _key()
+    
+    
+    def get_ArcAngle(self, RoundEdgeClearance=0.0, FlatEdgeClearance=0.0):
+        '''Return the half-angle in degrees, measured from -Y, of the wafer edge removed by the flat or notch - inside the given edge clearances.'''
+        if self.Notch == "N":
+            Fc = self.FlatLength - FlatEdgeClearance
+            Dc = self.Diameter - 2*RoundEdgeClearance
+            return np.rad2deg(  np.arcsin( (Fc/2) / (Dc/2) )  ) # arc angle corresponding to 1/2 of wafer flat
+        else:
+            return self.NotchAngle
+    #end get_ArcAngle()
+    
+    
+    def get_FlatY(self, RoundEdgeClearance=0.0, FlatEdgeClearance=0.0):
+        '''Return the Y-coordinate of the flat (or notch) chord inside the given edge clearances, in mm - any point below this is off the wafer.'''
+        Dc = self.Diameter - 2*RoundEdgeClearance
+        Ac = self.get_ArcAngle(RoundEdgeClearance, FlatEdgeClearance)
+        return -1 * np.cos( np.deg2rad(Ac) ) * (Dc/2)
+    #end get_FlatY()
+    
+    
+    def contains(self, X, Y, RoundEdgeClearance=0.0, FlatEdgeClearance=0.0):
+        '''Return bool array, True for each point (X,Y) (in mm) that is on the wafer, inside the given edge clearances.  Vectorized over arrays of points.'''
+        X, Y = np.asarray(X, dtype=float), np.asarray(Y, dtype=float)
+        R = self.Diameter/2 - RoundEdgeClearance
+        return ( np.hypot(X, Y) <= R ) & ( Y >= self.get_FlatY(RoundEdgeClearance, FlatEdgeClearance) )
+    #end contains()
+    
+    
+    def get_ValidCellTable(self, CellSize, MatrixShift, RoundEdgeClearance, FlatEdgeClearance, ExposeEdgeDie=False, defaults=None):
+        '''
+        Return the on-wafer Cells for a Cell structure on this wafer, as calculated by `geomlib.valid_cell_map()` - the same Cells as `Cell.get_ValidCells()`.
+        Tables are cached in memory, so each Cell structure is only calculated once, and on disk if `WaferProfile_CacheDir` is set in `defaults` (the Job's Defaults object, or the current Defaults if None).
+        
+        Returns
+        -------
+        cols, rows : int arrays
+            Cell column & row indices.
+        valid : bool array, shape (len(cols), len(rows))
+            True for each valid Cell.  Shared with the cache, so should not be modified.
+        '''
+        key = self._key() + tuple( float(v) for v in CellSize ) + tuple( float(v) for v in MatrixShift ) + ( float(RoundEdgeClearance), float(FlatEdgeClearance), bool(ExposeEdgeDie) )
+        if key in self._tables:
+            return self._tables[key]
+        
+        path = _cache_path( "validcells", key, defaults=defaults )
+        table = _cache_load( path, ("cols", "rows", "valid") )
+        if table is None:
+            from .geomlib import valid_cell_map
+            table = valid_cell_map( CellSize, MatrixShift, self.Diameter, RoundEdgeClearance, self.get_FlatY(RoundEdgeClearance, FlatEdgeClearance), ExposeEdgeDie )
+            _cache_save( path, cols=table[0], rows=table[1], valid=table[2] )
+        #end if(table)
+        for a in table: a.setflags(write=False)
+        self._tables[key] = table
+        return table
+    #end get_ValidCellTable()
+
+#end class(WaferProfile)
+
+
+
+
+_CodeVersion = None
+
+def _code_version():
+    '''Return a string identifying the code that produces cached results: the package version, and a hash of the source of the modules that calculate valid-Cell tables (`geomlib`, `Wafer`) and parse machine profiles (`profilelib`, `Defaults`).  Any change to these gives new cache keys, so results of older code are never loaded.'''
+    global _CodeVersion
+    if _CodeVersion is None:
+        import os, hashlib
+        from .__version import version
+        h = hashlib.sha1( version.encode() )
+        for name in ("geomlib.py", "Wafer.py", "profilelib.py", "Defaults.py"):
+            try:
+                with open( os.path.join(os.path.dirname(__file__), name), 'rb' ) as f:
+                    h.update( f.read() )
+            except OSError:
+                pass    # no source, eg. only compiled files: rely on the package version
+        #end for(modules)
+        _CodeVersion = h.hexdigest()
+    return _CodeVersion
+#end _code_version()
+
+
+def _cache_path(kind, key, ext="npz", defaults=None):
+    '''Return the disk-cache file path for a table of type `kind` identified by the tuple `key`, or None if the disk cache is disabled (the default, see `Defaults.WaferProfile_CacheDir`).  The directory is taken from `defaults` - a Job's Defaults object - or the current Defaults if None.  Also used for machine profiles, see `profilelib`.'''
+    import os, hashlib, tempfile
+    d = ( get_Defaults() if defaults is None else defaults ).WaferProfile_CacheDir
+    if d == "": return None
+    if d is None: d = os.path.join( tempfile.gettempdir(), "ASML_JobCreator_cache" )
+    h = hashlib.sha1( repr( ( _code_version(), ) + tuple(key) ).encode() ).hexdigest()[:20]
+    return os.path.join( d, "%s_%s.%s" % (kind, h, ext) )
+#end _cache_path()
+
+
+def _cache_load(path, names):
+    '''Return tuple of the arrays `names` from the disk-cache file at `path`, or None if unavailable.'''
+    if path is None: return None
+    try:
+        with np.load(path) as f:
+            out = tuple( f[n] for n in names )
+        if DEBUG(): print( "Loaded cached table from", path )
+        return out
+    except (OSError, KeyError, ValueError):
+        return None
+#end _cache_load()
+
+
+def _cache_save(path, **arrays):
+    '''Save `arrays` to the disk-cache file at `path`.  Failure to write the cache is not an error.'''
+    import os
+    if path is None: return
+    try:
+        os.makedirs( os.path.dirname(path), exist_ok=True )
+        tmp = path + ".%i.tmp" % os.getpid()
+        with open(tmp, 'wb') as f:
+            np.savez( f, **arrays )
+        os.replace( tmp, path )     # atomic, in case of simultaneous processes
+    except OSError as e:
+        if WARN(): print( "WaferProfile: could not write cache file '%s': %s" % (path, e) )
+#end _cache_save()
+
+
+
+
+## Standard wafer profiles (SEMI flat lengths):
+WaferProfiles = {
+    "100mm" : WaferProfile( "100mm", 100.0, Notch="N", FlatLength=32.5 ),
+    "150mm" : WaferProfile( "150mm", 150.0, Notch="N", FlatLength=57.5 ),
+    "200mm" : WaferProfile( "200mm", 200.0, Notch="Y" ),
+    "300mm" : WaferProfile( "300mm", 300.0, Notch="Y" ),
+}
+
+
+_DefaultsProfiles = {}
+
+def get_DefaultsProfile(defaults=None):
+    '''Return the WaferProfile described by `Defaults.WFR_DIAMETER`, `WFR_NOTCH` & `WFR_FLAT_LENGTH` - the profile used by Jobs that have not set one.  Pass a Job's `defaults` to use those instead of the current Defaults.'''
+    D = get_Defaults() if defaults is None else defaults
+    key = ( D.WFR_DIAMETER, D.WFR_NOTCH, D.WFR_FLAT_LENGTH )
+    if key not in _DefaultsProfiles:
+        _DefaultsProfiles[key] = WaferProfile( "Defaults", D.WFR_DIAMETER, Notch=D.WFR_NOTCH, FlatLength=D.WFR_FLAT_LENGTH )
+    return _DefaultsProfiles[key]
+#end get_DefaultsProfile()
+
+
+
+################################################
+################################################
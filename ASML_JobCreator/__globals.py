@@ -13,8 +13,9 @@ Demis D. John, 2018
 ####################################################
 # Module setup etc.
 
-from .Defaults import Defaults              # Class Default
-Defaults = Defaults()  # `Default` object
+from .Defaults import Defaults as _DefaultsClass   # Class Default
+from contextvars import ContextVar      # settings local to each thread/task
+from contextlib import contextmanager
 
 # - - - - - - - - - - - - - - - - - - - - - - - - - 
 
@@ -44,49 +45,112 @@ WaferPlotBox = [0.8, 1, 0.8, 1] # PosX, PosY, Width, Height
 #---------------------------------------#
 
 
-global _DEBUG
-_DEBUG = False   # set to true for verbose outputs onto Python console - applies to all submodules/files
+## DEBUG, WARN & Defaults are context variables: each thread (or asyncio task) can change them without affecting the others, see `local_settings()`.
+##   New threads start with these values:
+_DEBUG = ContextVar( "ASML_JobCreator_DEBUG", default=False )   # set to true for verbose outputs onto Python console - applies to all submodules/files
 # can be changed at run-time via `set/unset_DEBUG()`
 
-global _WARN
-_WARN = True      # globally set warning mode
+_WARN = ContextVar( "ASML_JobCreator_WARN", default=True )      # warning mode
 # can be changed at run-time via `set/unset_WARN()`
 
+_Defaults = ContextVar( "ASML_JobCreator_Defaults", default=None )    # `Default` object - None until first used in a context, then a new copy of the built-in Defaults, see `get_Defaults()`
+
 
 #  These will override the value set above in `_DEBUG`
 def set_DEBUG():
-    '''Enable verbose output for debugging.'''
-    global _DEBUG
-    _DEBUG = True
+    '''Enable verbose output for debugging, in the current thread/context.'''
+    _DEBUG.set( True )
 
 def unset_DEBUG():
-    '''Disable verbose debugging output.'''
-    global _DEBUG
-    _DEBUG = False
+    '''Disable verbose debugging output, in the current thread/context.'''
+    _DEBUG.set( False )
 
 def DEBUG():
     '''Returns whether DEBUG is true or false.  
     Use to print debug-level messages, like so:
     >>> if DEBUG(): print('This function works')
     '''
-    return _DEBUG
+    return _DEBUG.get()
 
 
 def set_WARN():
-    '''Enable verbose output for debugging.'''
-    global _WARN
-    _WARN = True
+    '''Enable warning messages, in the current thread/context.'''
+    _WARN.set( True )
 
 def unset_WARN():
-    '''Disable verbose debugging output.'''
-    global _WARN
-    _WARN = False
+    '''Disable warning messages, in the current thread/context.'''
+    _WARN.set( False )
 
 def WARN():
     '''Returns whether WARN is true or false.
     Use to print warn-level messages, like so:
     >>> if WARN(): print('This function works')'''
-    return _WARN
+    return _WARN.get()
+
+
+def get_Defaults(obj=None):
+    '''Return the Defaults object in use: the `defaults` of the Job that `obj` belongs to (following the `parent` of Images, Layers etc.), or if `obj` is None or not part of a Job, the Defaults of the current thread/context.'''
+    while obj is not None:
+        if getattr(obj, "defaults", None) is not None: return obj.defaults
+        obj = getattr(obj, "parent", None)
+    D = _Defaults.get()
+    if D is None:
+        D = _DefaultsClass()    # each thread/context starts with its own built-in Defaults
+        _Defaults.set( D )
+    return D
+
+
+@contextmanager
+def local_settings(debug=None, warn=None, defaults=None):
+    '''
+    Use other DEBUG/WARN settings and/or Defaults object inside a `with` block, in the current thread/context only.  The previous settings are restored at the end of the block.  Jobs created in the block take a copy of `defaults`, and setting `Defaults.<attribute>` in the block does not change `defaults` itself.
+    
+    Parameters
+    ----------
+    debug, warn : { True | False | None }, optional
+        DEBUG & WARN settings for the block, or None to keep the current ones.
+    defaults : Defaults object, optional
+        Defaults to use in the block, or None to keep the current one.
+    
+    Examples
+    --------
+    Build Jobs for several machines in a thread pool:
+    >>> def build(D):
+    >>>     with asml.local_settings(warn=False, defaults=D):
+    >>>         MyJob = asml.Job()
+    >>>         ...
+    >>> with ThreadPoolExecutor() as pool:
+    >>>     jobs = list( pool.map(build, [D1, D2, D3]) )
+    '''
+    tokens = []
+    if debug is not None: tokens.append( ( _DEBUG, _DEBUG.set( bool(debug) ) ) )
+    if warn is not None: tokens.append( ( _WARN, _WARN.set( bool(warn) ) ) )
+    if defaults is not None: tokens.append( ( _Defaults, _Defaults.set( defaults ) ) )
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens): var.reset( token )
+#end local_settings()
+
+
+class _ContextDefaults(object):
+    '''The Defaults object of the current thread/context, see `get_Defaults()`.  Getting an attribute, eg. `Defaults.WFR_DIAMETER`, reads that object.  Setting one replaces it, in the current context only, by a copy with the new value, so an object shared with other contexts (eg. asyncio tasks started from this one, or passed to `local_settings()`) is never changed.  Jobs use their own copy, `Job.defaults`.'''
+    def __getattr__(self, name):
+        return getattr( get_Defaults(), name )
+    
+    def __setattr__(self, name, value):
+        D = get_Defaults().copy()
+        setattr( D, name, value )
+        _Defaults.set( D )
+    
+    def __dir__(self):
+        return dir( get_Defaults() )
+    
+    def __str__(self):
+        return str( get_Defaults() )
+#end class(_ContextDefaults)
+
+Defaults = _ContextDefaults()
 
 #---------------------------------------#
 
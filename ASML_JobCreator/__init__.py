@@ -47,6 +47,9 @@ print( "\nASML_JobCreator   (v."  +  __version__  +  "   "  +  __versiondate__ +
 
 from .__globals import * # global variables/methods to the module.
 from .Job import Job      # objects for the ASML Job
+from .CellMask import CellMask  # Cell selections for distributing Images
+from .Wafer import WaferProfile, WaferProfiles  # wafer geometry profiles
+from .profilelib import load_MachineProfile, get_MachineProfiles    # machine profiles over the Defaults
 from . import Images        # Predefined Image Library
 
 ####################################################
@@ -0,0 +1,84 @@
+"""
+This file is part of the ASML_JobCreator package for Python 3.x.
+
+copylib.py
+    Copy-on-write support for the `copy()` methods: large lists & arrays (Image distributions, Layer exposure tables) are shared between an object and its copies, and only copied when one side changes them.  The objects holding them are still copied, so copying a Job takes time in proportion to its number of Images, Layers, Marks & Strategies.
+
+- - - - - - - - - - - - - - -
+
+ASML_JobCreator contributors; 2026
+
+"""
+
+####################################################
+# Module setup etc.
+
+from .__globals import *    # global variables/methods to the module.
+from copy import deepcopy
+
+####################################################
+
+
+
+def _attributes(obj):
+    '''Return list of (name, value) for the attributes set on `obj`, from it's `__dict__` and/or `__slots__`.'''
+    out = list( getattr(obj, "__dict__", {}).items() )
+    for cls in type(obj).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name != "__dict__" and hasattr(obj, name): out.append( ( name, getattr(obj, name) ) )
+    #end for(classes)
+    return out
+#end _attributes()
+
+
+
+def shared_deepcopy(obj, memo, shared=(), skip=()):
+    '''
+    Deep-copy `obj` for `copy.deepcopy()`, except that the attributes named in `shared` are shared with the copy instead of copied, and those in `skip` are not set on the copy.  Use in a class's `__deepcopy__()` method.
+    Shared attributes are recorded in `_Shared` on both objects, so that `unshare()` copies them before either object changes them.
+
+    Parameters
+    ----------
+    obj : object to copy
+    memo : dictionary
+        The `memo` argument of `__deepcopy__()`, so that references to other objects in the copied graph are kept consistent.
+    shared, skip : iterables of attribute names
+
+    Returns
+    -------
+    The new object.
+    '''
+    cls = type(obj)
+    new = cls.__new__(cls)
+    memo[ id(obj) ] = new
+    names = set()
+    for name, value in _attributes(obj):
+        if name == "_Shared" or name in skip: continue
+        if name in shared:
+            setattr( new, name, value )
+            names.add( name )
+        else:
+            setattr( new, name, deepcopy(value, memo) )
+    #end for(attributes)
+    obj._Shared = set( getattr(obj, "_Shared", None) or () ) | names
+    new._Shared = set( names )
+    return new
+#end shared_deepcopy()
+
+
+
+def unshare(obj, *names):
+    '''Give `obj` it's own copy of each list/array attribute in `names` that it still shares with a copy (see `shared_deepcopy()`).  Call before changing them in place.'''
+    shared = getattr(obj, "_Shared", None)
+    if not shared: return
+    for name in names:
+        if name in shared:
+            setattr( obj, name, getattr(obj, name).copy() )
+            shared.discard( name )
+    #end for(names)
+#end unshare()
+
+
+
+################################################
+################################################
@@ -0,0 +1,304 @@
+"""
+This file is part of the ASML_JobCreator package for Python 3.x.
+
+genlib.py
+    Generators that build whole exposure layouts in bulk, such as Focus-Exposure Matrices and radial dose/focus maps, from a template Image.
+
+- - - - - - - - - - - - - - -
+
+ASML_JobCreator contributors; 2026
+
+"""
+
+####################################################
+# Module setup etc.
+
+from .__globals import *    # global variables/methods to the module.
+
+####################################################
+
+
+
+def _clone_Images(Template, IDs, JobObj):
+    '''Return list of new Images with the ImageIDs `IDs`, each with the reticle, size & shift of Image `Template`, added to Job `JobObj` in one call.'''
+    from .Image import Image
+    images = [ Image( ImageID=ID, ReticleID=Template.get_ReticleID(), sizeXY=Template.sizeXY, shiftXY=Template.shiftXY ) for ID in IDs ]
+    JobObj.add_Images( *images )
+    return images
+#end _clone_Images()
+
+
+
+def _grid_IDs(Template, ni, nj, tags=("E", "F")):
+    '''Return the (ni, nj) array of ImageIDs for the clones of `Template`: the Template's ImageID (shortened to fit in 15 characters), then eg. "_E03F12".'''
+    w = ( len(str(max(ni-1, 0))), len(str(max(nj-1, 0))) )
+    suffix = "_%s%%0%ii%s%%0%ii" % ( tags[0], w[0], tags[1], w[1] )
+    base = Template.get_ImageID()[ : 15 - len(suffix % (0,0)) ]
+    return np.array( [ [ base + suffix % (i,j) for j in range(nj) ] for i in range(ni) ], dtype=object )
+#end _grid_IDs()
+
+
+
+def generate_FEM(JobObj, Template, Energies, Focuses, Lyr=None, mask=None, repeat=1, **exposure):
+    '''
+    Generate a Focus-Exposure Matrix: one clone of the `Template` Image per (Energy, Focus) combination, each distributed to its own Cell(s) and exposed on one Layer with that Energy & Focus.  See `Job.generate_FEM()` for the parameters.
+
+    Returns
+    -------
+    images : object array of Image objects, shape (len(Energies), len(Focuses))
+    Lyr : Layer object
+    '''
+    Energies = np.atleast_1d( np.asarray(Energies, dtype=float) )
+    Focuses = np.atleast_1d( np.asarray(Focuses, dtype=float) )
+    nE, nF = len(Energies), len(Focuses)
+    n, repeat = nE * nF, int(repeat)
+    if n == 0 or repeat < 1:
+        raise ValueError( "generate_FEM(): Need at least one Energy & Focus value and `repeat` >= 1, instead got %i Energies, %i Focuses, repeat=%i." % (nE, nF, repeat) )
+    if repeat > JobObj.defaults.ImageDistribution_MaxDistPerImage:
+        raise ValueError( "generate_FEM(): `repeat`=%i exceeds the software limit of %i distributions per Image." % (repeat, JobObj.defaults.ImageDistribution_MaxDistPerImage) )
+
+    ## Cells, row by row from the bottom, left to right.  Focus changes along a row, Energy from row to row:
+    if mask is None:
+        cols = np.arange(nF) - (nF-1)//2
+        rows = np.arange(nE*repeat) - (nE*repeat-1)//2
+        CR = np.column_stack( ( np.tile(cols, len(rows)), np.repeat(rows, nF) ) )
+        vcols, vrows, valid = JobObj.Cell.get_ValidCellMap()
+        N = ( int(vcols[-1]), int(vrows[-1]) )
+        inside = ( np.abs(CR[:,0]) <= N[0] ) & ( np.abs(CR[:,1]) <= N[1] )
+        if not np.all(inside) or not np.all( valid[ CR[:,0] + N[0], CR[:,1] + N[1] ] ):
+            raise ValueError( "generate_FEM(): The %i x %i block of Cells centered on the wafer does not fit on the wafer; pass a `mask` of Cells to use instead." % (nF, nE*repeat) )
+    else:
+        CR = np.asarray( mask.get_Cells(), dtype=int ).reshape(-1,2)
+        CR = CR[ np.lexsort( (CR[:,0], CR[:,1]) ) ]
+        if len(CR) < n * repeat:
+            raise ValueError( "generate_FEM(): %i Cells are needed for %i x %i (Energy x Focus) x %i repeats, but `mask` only has %i Cells." % (n*repeat, nE, nF, repeat, len(CR)) )
+        CR = CR[ : n*repeat ]
+    #end if(mask)
+    combo = np.arange( n*repeat ) % n    # combination index for each Cell, = iE*nF + iF
+
+    images = _clone_Images( Template, _grid_IDs(Template, nE, nF).ravel(), JobObj )
+    order = np.argsort( combo, kind='stable' )
+    for k, I in enumerate(images):
+        I._distribute_many( CR[ order[ k*repeat : (k+1)*repeat ] ] )
+    #end for(images)
+
+    if Lyr is None: Lyr = JobObj.Layer( LayerID="FEM" )
+    Lyr.expose_Images( images, Energy=np.repeat(Energies, nF), Focus=np.tile(Focuses, nE), **exposure )
+    if DEBUG(): print( "generate_FEM(): %i x %i Images on %i Cells, Layer `%s`." % (nE, nF, len(CR), Lyr.get_LayerID()) )
+    return np.array( images, dtype=object ).reshape(nE, nF), Lyr
+#end generate_FEM()
+
+
+
+def generate_RadialCompensation(JobObj, Template, Radii, Energies, Focuses=0.0, bands=10, Lyr=None, mask=None, shiftXY=[0,0], **exposure):
+    '''
+    Generate a shot map with Energy & Focus varying with radius: the Cells are binned into radius bands, and each band gets its own clone of the `Template` Image, exposed with the Energy & Focus interpolated from the radial profile.  See `Job.generate_RadialCompensation()` for the parameters.
+
+    Returns
+    -------
+    images : list of Image objects, one per non-empty band (or more, if a band has more Cells than one Image can be distributed to)
+    radii : float array, the band-center radius used for each Image
+    Lyr : Layer object
+    '''
+    Radii = np.atleast_1d( np.asarray(Radii, dtype=float) )
+    Energies = np.broadcast_to( np.asarray(Energies, dtype=float), Radii.shape )
+    Focuses = np.broadcast_to( np.asarray(Focuses, dtype=float), Radii.shape )
+    if np.any( np.diff(Radii) <= 0 ):
+        raise ValueError( "generate_RadialCompensation(): `Radii` must be increasing, instead got: %s" % Radii )
+
+    ## Cells & shot radii:
+    if mask is None:
+        cols, rows, valid = JobObj.Cell.get_ValidCellMap()
+        i, j = np.nonzero(valid)
+        CR = np.column_stack( ( cols[i], rows[j] ) )
+    else:
+        CR = np.asarray( mask.get_Cells(), dtype=int ).reshape(-1,2)
+    #end if(mask)
+    XY = np.asarray( JobObj.Cell.get_MatrixShift(), dtype=float ) + CR * np.asarray( JobObj.Cell.get_CellSize(), dtype=float ) + np.asarray( shiftXY, dtype=float )
+    R = np.hypot( XY[:,0], XY[:,1] )
+
+    ## Bin into bands:
+    if np.isscalar(bands):
+        edges = np.linspace( 0.0, R.max() * (1 + 1e-9) if len(R) else 1.0, int(bands) + 1 )
+    else:
+        edges = np.asarray( bands, dtype=float )
+    band = np.digitize( R, edges ) - 1
+    inside = ( band >= 0 ) & ( band < len(edges) - 1 )
+    if WARN() and not np.all(inside): print( "generate_RadialCompensation(): %i Cells outside of the band edges are not exposed." % np.count_nonzero(~inside) )
+    order = np.argsort( band[inside], kind='stable' )
+    CR, band = CR[inside][order], band[inside][order]
+    bandnums, starts = np.unique( band, return_index=True )
+    ends = np.append( starts[1:], len(band) )
+
+    ## split bands that exceed the distributions per Image:
+    maxdist = JobObj.defaults.ImageDistribution_MaxDistPerImage
+    chunks = [ ( b, k, min(k + maxdist, e), (k - s) // maxdist ) for b, s, e in zip(bandnums, starts, ends) for k in range(s, e, maxdist) ]
+    w = len( str( len(edges) - 2 ) )
+    IDs = []
+    for b, k, e, part in chunks:
+        suffix = "_R%0*i" % (w, b) + ( "-%i" % part if part else "" )
+        IDs.append( Template.get_ImageID()[ : 15 - len(suffix) ] + suffix )
+    #end for(chunks)
+
+    images = _clone_Images( Template, IDs, JobObj )
+    for I, (b, k, e, part) in zip(images, chunks):
+        I._distribute_many( CR[k:e], shiftXY )
+    #end for(images)
+
+    radii = 0.5 * ( edges[:-1] + edges[1:] )[ [ c[0] for c in chunks ] ]
+    if Lyr is None: Lyr = JobObj.Layer( LayerID="RADIAL" )
+    Lyr.expose_Images( images, Energy=np.interp(radii, Radii, Energies), Focus=np.interp(radii, Radii, Focuses), **exposure )
+    if DEBUG(): print( "generate_RadialCompensation(): %i Cells in %i bands, %i Images, Layer `%s`." % (len(CR), len(bandnums), len(images), Lyr.get_LayerID()) )
+    return images, radii, Lyr
+#end generate_RadialCompensation()
+
+
+
+## Parameters that can be swept, see `Job.export_Sweep()`:  name : (object, attributes to save & restore)
+_SweepParams = {
+    "comment"     : ( lambda J, ID: J, ("comment_line1", "comment_line2", "comment_line3") ),
+    "MatrixShift" : ( lambda J, ID: J.Cell, ("MatrixShift",) ),
+    "LayerShift"  : ( lambda J, ID: _sweep_Layer(J, ID), ("LayerShift",) ),
+    "Energy"      : ( lambda J, ID: _sweep_Layer(J, ID), ("_Exposures",) ),
+    "Focus"       : ( lambda J, ID: _sweep_Layer(J, ID), ("_Exposures",) ),
+}
+_MISSING = object()     # attribute was not set before the sweep
+
+
+
+def _sweep_Layer(JobObj, LayerID):
+    '''Return the Layer of `JobObj` with LayerID `LayerID`, for sweep parameters such as "Energy:LYR1".  IDs are compared ignoring case & surrounding spaces, as `set_LayerID()` keeps them as given.'''
+    ID = str(LayerID).strip().upper()
+    for L in JobObj.LayerList:
+        if str(L.get_LayerID()).strip().upper() == ID: return L
+    raise ValueError( "Sweep parameter: No Layer with LayerID `%s`, LayerIDs are: %s" % ( LayerID, [L.get_LayerID() for L in JobObj.LayerList] ) )
+#end _sweep_Layer()
+
+
+
+def _sweep_apply(JobObj, values):
+    '''Set the sweep parameters `values` ({name : value}) on `JobObj`, which is changed in place - `export_Sweep()` passes it a copy of the base Job.  Only the swept attributes are replaced.  Returns the list of (object, attribute, old value) to pass to `_sweep_restore()`.'''
+    saved = []
+    try:
+        for key, v in values.items():
+            name, _, ID = key.partition(":")
+            if name not in _SweepParams:
+                raise ValueError( "Unrecognized sweep parameter `%s`, expected one of: %s (Layer parameters as eg. \"Energy:LYR1\")" % (key, list(_SweepParams.keys())) )
+            getobj, attrs = _SweepParams[name]
+            obj = getobj(JobObj, ID)
+            saved += [ ( obj, a, getattr(obj, a, _MISSING) ) for a in attrs ]
+            if name == "comment":
+                obj.set_comment( *( [v] if isinstance(v, str) else v ) )
+            elif name == "MatrixShift":
+                obj.set_MatrixShift( v )
+            elif name == "LayerShift":
+                obj.set_LayerShift( v )
+            else:
+                # one value for all Images of the Layer, or one per Image, in a new exposure table:
+                table = obj.Exposures.copy()
+                table[name] = np.broadcast_to( np.asarray(v, dtype=float), (len(obj.ImageList),) )
+                obj._Exposures = table
+        #end for(values)
+    except Exception:
+        _sweep_restore( saved )
+        raise
+    return saved
+#end _sweep_apply()
+
+
+def _sweep_restore(saved):
+    '''Undo `_sweep_apply()`.'''
+    for obj, a, old in reversed(saved):
+        if old is _MISSING:
+            if hasattr(obj, a): delattr(obj, a)
+        else:
+            setattr(obj, a, old)
+    #end for(saved)
+#end _sweep_restore()
+
+
+def _sweep_export(JobObj, values, filepath, overwrite):
+    '''Export one variant of `JobObj`, with the sweep parameters `values`, to `filepath`.'''
+    saved = _sweep_apply( JobObj, values )
+    try:
+        JobObj.export( filepath, overwrite=overwrite )
+    finally:
+        _sweep_restore( saved )
+#end _sweep_export()
+
+
+_SweepJob = None    # the base Job, in each worker process
+
+def _sweep_init(JobObj, debug, warn):
+    '''Worker-process initializer: keep the base Job, and use its Defaults & the DEBUG/WARN settings of the parent process.'''
+    global _SweepJob
+    from . import __globals as g
+    g._Defaults.set( JobObj.defaults )
+    g.set_DEBUG() if debug else g.unset_DEBUG()
+    g.set_WARN() if warn else g.unset_WARN()
+    _SweepJob = JobObj
+#end _sweep_init()
+
+
+def _sweep_worker(args):
+    '''Export one variant `args` = (values, filepath, overwrite) of the worker's base Job.  Module-level so that it can be sent to worker processes.'''
+    _sweep_export( _SweepJob, *args )
+    return args[1]
+#end _sweep_worker()
+
+
+
+def export_Sweep(JobObj, grid, directory=".", basename="Job", processes=None, overwrite=False):
+    '''
+    Export one job file per combination of the parameter values in `grid`, and a manifest.  See `Job.export_Sweep()` for the parameters.
+
+    Returns
+    -------
+    manifest : dictionary, as written to the manifest file.
+    '''
+    import os, json, itertools
+    keys = list( grid.keys() )
+    combos = list( itertools.product( *[ list(grid[k]) for k in keys ] ) )
+    w = len( str( max(len(combos) - 1, 0) ) )
+    variants = [ { "index": n, "file": "%s_%0*i.txt" % (basename, w, n), "values": dict( zip(keys, c) ) } for n, c in enumerate(combos) ]
+
+    # the sweep changes a copy, so the base Job is never modified (copying shares the distributions & exposure tables, see `Job.copy()`):
+    JobObj = JobObj.copy()
+
+    # check all parameters, and that no file would be overwritten, before exporting anything:
+    for v in variants:
+        _sweep_restore( _sweep_apply( JobObj, v["values"] ) )
+    path = os.path.join( directory, "%s_manifest.json" % basename )
+    tasks = [ ( v["values"], os.path.join(directory, v["file"]), overwrite ) for v in variants ]
+    if not overwrite:
+        existing = [ os.path.abspath(f) for f in [ t[1] for t in tasks ] + [path] if os.path.exists(f) ]
+        if existing:
+            raise IOError( "%i file(s) of the sweep already exist, eg. '%s', and argument `overwrite` is False." % ( len(existing), existing[0] ) )
+    #end if(overwrite)
+    os.makedirs( directory, exist_ok=True )
+
+    if processes is not None and processes > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        JobObj._organizeLayers()
+        with ProcessPoolExecutor( max_workers=processes, initializer=_sweep_init, initargs=(JobObj, DEBUG(), WARN()) ) as pool:
+            list( pool.map( _sweep_worker, tasks, chunksize=max(1, len(tasks)//(4*processes)) ) )
+    else:
+        for t in tasks: _sweep_export( JobObj, *t )
+    #end if(processes)
+
+    def tojson(x):
+        if isinstance(x, (np.ndarray, np.generic)): return x.tolist()
+        if isinstance(x, (list, tuple)): return [ tojson(y) for y in x ]
+        return x
+    #end tojson()
+    manifest = { "basename": basename, "parameters": keys, "variants": [ dict( v, values={ k:tojson(x) for k,x in v["values"].items() } ) for v in variants ] }
+    with open( path, 'w' ) as f:
+        json.dump( manifest, f, indent=1 )
+    if DEBUG(): print( "export_Sweep(): %i variants written to '%s'." % (len(variants), os.path.abspath(directory)) )
+    return manifest
+#end export_Sweep()
+
+
+
+################################################
+################################################
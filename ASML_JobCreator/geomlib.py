@@ -0,0 +1,467 @@
+"""
+This file is part of the ASML_JobCreator package for Python 3.x.
+
+geomlib.py
+    Vectorized geometry helpers shared by the layout, alignment and validation functions:
+    wafer-coordinates of distributed Images, a spatial index of rectangles, and the on-wafer Cell test.
+
+- - - - - - - - - - - - - - -
+
+ASML_JobCreator contributors; 2026
+
+"""
+
+####################################################
+# Module setup etc.
+
+from .__globals import *    # global variables/methods to the module.
+
+####################################################
+
+
+
+def _expand_ranges(starts, counts):
+    '''Return the concatenation of `arange(start, start+count)` for each start/count pair, and the index of the pair each value came from.  Vectorized replacement for a python loop over ranges.'''
+    counts = np.asarray(counts, dtype=int)
+    total = counts.sum()
+    owner = np.repeat( np.arange(len(counts)), counts )
+    if total == 0:
+        return np.zeros(0, dtype=int), owner
+    offsets = np.arange(total) - np.repeat( np.cumsum(counts) - counts, counts )
+    return np.repeat( np.asarray(starts, dtype=int), counts ) + offsets, owner
+#end _expand_ranges()
+
+
+
+def get_ShotRects(JobObj, layers=None, exposed=True):
+    '''
+    Return the wafer-coordinate footprint of every distributed Image, as flat arrays.  Each Image distribution is placed at the Cell center (from CellSize & MatrixShift) plus the Image-to-Cell Shift, with the Image size `sizeXY`.
+    
+    Parameters
+    ----------
+    JobObj : Job object
+        The Job containing the Images & Cell structure.
+    
+    layers : Layer object or list of Layer objects, optional
+        If given, only Images exposed on these Layers are returned.  Defaults to None, all Images.
+    
+    exposed : { True | False }, optional
+        If True (default), only return Images that are exposed on at least one Layer.
+    
+    Returns
+    -------
+    centers : float array, shape (N,2)
+        Wafer [X,Y] coordinates of each shot center.
+    halfsizes : float array, shape (N,2)
+        Half of the Image size [X,Y] for each shot.
+    images : list of Image objects
+        The Images that were included.
+    imgindex : int array, shape (N,)
+        Index into `images` for each shot.
+    distindex : int array, shape (N,)
+        Index into the Image's distribution list (`Image.get_distribution()`) for each shot.
+    '''
+    if layers is not None:
+        if not np.iterable(layers): layers = [layers]
+        images = []
+        for L in layers:
+            for I in L.ImageList:
+                if not any( I is J for J in images ): images.append(I)
+    else:
+        images = [ I for I in JobObj.ImageList if (I.Layers or not exposed) ]
+    #end if(layers)
+    
+    CellSize = np.asarray( JobObj.Cell.get_CellSize(), dtype=float )
+    MatrixShift = np.asarray( JobObj.Cell.get_MatrixShift(), dtype=float )
+    
+    centers, halfsizes, imgindex, distindex = [], [], [], []
+    for i,I in enumerate(images):
+        n = len(I.Cells)
+        if n == 0: continue
+        cells = np.asarray( I.Cells, dtype=float ).reshape(n,2)
+        shifts = np.asarray( I.Shifts, dtype=float ).reshape(n,2)
+        centers.append( MatrixShift + cells * CellSize + shifts )
+        halfsizes.append( np.tile( np.asarray(I.sizeXY, dtype=float)/2.0, (n,1) ) )
+        imgindex.append( np.full(n, i, dtype=int) )
+        distindex.append( np.arange(n) )
+    #end for(images)
+    
+    if not centers:
+        return np.zeros((0,2)), np.zeros((0,2)), images, np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+    return np.concatenate(centers), np.concatenate(halfsizes), images, np.concatenate(imgindex), np.concatenate(distindex)
+#end get_ShotRects()
+
+
+
+
+def valid_cell_map(CellSize, MatrixShift, WaferDiameter, RoundEdgeClearance, FlatEdgeClearanceY, ExposeEdgeDie=False, N=None):
+    '''
+    Vectorized version of the on-wafer test in `Cell.get_ValidCells()`, for a whole grid of Cells - and optionally for many MatrixShifts at once.
+    Uses the same rules: without ExposeEdgeDie, all four Cell corners must lie within the clearance circle and above the flat clearance; with ExposeEdgeDie, any corner inside the circle and any corner above the flat is enough.  The worst/best corner is found separately in X and Y, since |x|^2 + |y|^2 is maximized/minimized by maximizing/minimizing each term.
+    
+    Parameters
+    ----------
+    CellSize : 2-valued iterable of floats
+        Cell size [X,Y] in mm.
+    
+    MatrixShift : 2-valued iterable of floats, or float array of shape (S,2)
+        Matrix Shift [X,Y] in mm.  Pass an (S,2) array to evaluate S shifts at once.
+    
+    WaferDiameter, RoundEdgeClearance : float
+        Wafer diameter and round-edge clearance, in mm.
+    
+    FlatEdgeClearanceY : float
+        Wafer Y-coordinate below which Cells are excluded, see `Cell.get_FlatEdgeClearanceY()`.
+    
+    ExposeEdgeDie : { True | False }, optional
+        Allow Cells partially on the wafer, as `Job.ExposeEdgeDie`.  Defaults to False.
+    
+    N : 2-valued iterable of ints, optional
+        Largest [col,row] index to test, in each direction.  Defaults to the same range as `get_ValidCells()`.
+    
+    Returns
+    -------
+    cols, rows : int arrays
+        Cell column & row indices tested, `-N..N`.
+    valid : bool array, shape (len(cols), len(rows)), or (S, len(cols), len(rows)) for multiple shifts
+        True for each valid Cell.
+    '''
+    cx, cy = float(CellSize[0]), float(CellSize[1])
+    shift = np.asarray(MatrixShift, dtype=float)
+    single = (shift.ndim == 1)
+    shift = shift.reshape(-1,2)
+    D = WaferDiameter - 2*RoundEdgeClearance
+    if N is None:
+        N = ( int(np.floor(D/cx)), int(np.floor(D/cy)) )
+    cols = np.arange( -N[0], N[0]+1 )
+    rows = np.arange( -N[1], N[1]+1 )
+    
+    # corner coordinates, shape (S, ncols/nrows), computed as in get_ValidCells():
+    x0 = ( -cx/2 + cols*cx )[None,:] + shift[:,0:1]
+    x1 = (  cx/2 + cols*cx )[None,:] + shift[:,0:1]
+    y0 = ( -cy/2 + rows*cy )[None,:] + shift[:,1:2]
+    y1 = (  cy/2 + rows*cy )[None,:] + shift[:,1:2]
+    
+    if not ExposeEdgeDie:
+        xx = np.maximum( x0*x0, x1*x1 )
+        yy = np.maximum( y0*y0, y1*y1 )
+        rowOK = np.minimum(y0, y1) >= FlatEdgeClearanceY
+        valid = np.sqrt( xx[:,:,None] + yy[:,None,:] ) <= D/2
+    else:
+        xx = np.minimum( x0*x0, x1*x1 )
+        yy = np.minimum( y0*y0, y1*y1 )
+        rowOK = np.maximum(y0, y1) >= FlatEdgeClearanceY
+        valid = np.sqrt( xx[:,:,None] + yy[:,None,:] ) <= D/2
+    #end if(ExposeEdgeDie)
+    valid &= rowOK[:,None,:]
+    
+    return cols, rows, (valid[0] if single else valid)
+#end valid_cell_map()
+
+
+
+def _count_valid_cells(args):
+    '''Return the number of valid Cells for each row of shifts in `args[1]`, see `valid_cell_map()`.  Module-level so that it can be sent to worker processes.'''
+    CellSize, shifts, WaferDiameter, RoundEdgeClearance, FlatEdgeClearanceY, ExposeEdgeDie, N = args
+    shifts = np.asarray(shifts, dtype=float).reshape(-1,2)
+    ncells = (2*N[0]+1) * (2*N[1]+1)
+    step = max( 1, int( 2e6 // ncells ) )    # limit memory used per batch
+    counts = np.zeros( len(shifts), dtype=int )
+    for s in range(0, len(shifts), step):
+        cols, rows, valid = valid_cell_map( CellSize, shifts[s:s+step], WaferDiameter, RoundEdgeClearance, FlatEdgeClearanceY, ExposeEdgeDie, N )
+        counts[s:s+step] = valid.sum(axis=(1,2))
+    return counts
+#end _count_valid_cells()
+
+
+
+
+def die_count_map(CellSize, NumberDiePerCell, MatrixShift, WaferDiameter, RoundEdgeClearance, FlatEdgeClearanceY, N=None):
+    '''
+    Count the Die of each Cell that lie entirely on the wafer: all four Die corners within the round-edge clearance and above the flat clearance.  Each Cell is divided into `NumberDiePerCell` equal Die.  Vectorized over every Die of every Cell.
+    
+    Parameters
+    ----------
+    CellSize : 2-valued iterable of floats
+        Cell size [X,Y] in mm.
+    
+    NumberDiePerCell : 2-valued iterable of ints
+        Number of Die per Cell, [Cols,Rows].
+    
+    MatrixShift : 2-valued iterable of floats
+        Matrix Shift [X,Y] in mm.
+    
+    WaferDiameter, RoundEdgeClearance, FlatEdgeClearanceY : float
+        As for `valid_cell_map()`.
+    
+    N : 2-valued iterable of ints, optional
+        Largest [col,row] Cell index to test, in each direction.  Defaults to the same range as `Cell.get_ValidCells()`.
+    
+    Returns
+    -------
+    cols, rows : int arrays
+        Cell column & row indices tested, `-N..N`.
+    counts : int array, shape (len(cols), len(rows))
+        Number of on-wafer Die in each Cell.
+    '''
+    cols, rows, dx0, dx1, dy0, dy1 = _die_edges( CellSize, NumberDiePerCell, MatrixShift, WaferDiameter - 2*RoundEdgeClearance, N )
+    ondie = _die_on_wafer( dx0, dx1, dy0, dy1, (WaferDiameter - 2*RoundEdgeClearance)/2, FlatEdgeClearanceY )
+    counts = ondie.reshape( len(cols), int(NumberDiePerCell[0]), len(rows), int(NumberDiePerCell[1]) ).sum( axis=(1,3) )
+    return cols, rows, counts
+#end die_count_map()
+
+
+
+def _die_edges(CellSize, NumberDiePerCell, MatrixShift, D, N=None):
+    '''Return Cell cols & rows `-N..N`, and the wafer-coordinates of the left/right (dx0,dx1) and bottom/top (dy0,dy1) edges of every column/row of Die, as 1-D arrays ordered by Cell then Die.  `D` is the wafer diameter inside the round-edge clearance.'''
+    cx, cy = float(CellSize[0]), float(CellSize[1])
+    nx, ny = int(NumberDiePerCell[0]), int(NumberDiePerCell[1])
+    if N is None:
+        N = ( int(np.floor(D/cx)), int(np.floor(D/cy)) )
+    cols = np.arange( -N[0], N[0]+1 )
+    rows = np.arange( -N[1], N[1]+1 )
+    dx0 = ( ( cols[:,None]*cx - cx/2 + np.arange(nx)[None,:] * cx/nx ) + MatrixShift[0] ).ravel()
+    dy0 = ( ( rows[:,None]*cy - cy/2 + np.arange(ny)[None,:] * cy/ny ) + MatrixShift[1] ).ravel()
+    return cols, rows, dx0, dx0 + cx/nx, dy0, dy0 + cy/ny
+#end _die_edges()
+
+
+def _die_on_wafer(dx0, dx1, dy0, dy1, R, FlatEdgeClearanceY):
+    '''Return bool array of shape (len(dx0), len(dy0)), True where the Die lies entirely within radius `R` and above `FlatEdgeClearanceY`.'''
+    xx = np.maximum( dx0*dx0, dx1*dx1 )
+    yy = np.maximum( dy0*dy0, dy1*dy1 )
+    return ( np.sqrt( xx[:,None] + yy[None,:] ) <= R ) & ( dy0 >= FlatEdgeClearanceY )[None,:]
+#end _die_on_wafer()
+
+
+def _disk_corner_area(X, Y, R):
+    '''Signed area of the rectangle between (0,0) and (X,Y) that lies within the circle of radius `R` centered at (0,0).  Adding/subtracting this at the four corners of a rectangle gives the exact rectangle-circle overlap area.'''
+    sgn = np.sign(X) * np.sign(Y)
+    X, Y = np.minimum( np.abs(X), R ), np.abs(Y)
+    # below `xs` the rectangle's top edge is inside the circle, above it the circle's edge is:
+    xs = np.minimum( np.sqrt( np.maximum( R*R - Y*Y, 0.0 ) ), X )
+    F = lambda x: 0.5 * ( x*np.sqrt( np.maximum(R*R - x*x, 0.0) ) + R*R*np.arcsin( x/R ) )
+    return sgn * ( Y*xs + F(X) - F(xs) )
+#end _disk_corner_area()
+
+
+
+def die_area_map(CellSize, NumberDiePerCell, MatrixShift, WaferDiameter, RoundEdgeClearance, FlatEdgeClearanceY, N=None):
+    '''
+    Return the fraction of each Die's area that lies on the wafer, inside the round-edge clearance and above the flat clearance.  The overlap of each Die with the circle is calculated exactly (no sampling), vectorized over every Die of every Cell.  Die entirely on the wafer, by the same corner test as `die_count_map()`, have a fraction of exactly 1.
+    
+    Parameters
+    ----------
+    Same as `die_count_map()`.
+    
+    Returns
+    -------
+    cols, rows : int arrays
+        Cell column & row indices tested, `-N..N`.
+    fraction : float array, shape (len(cols), NumberDiePerCell[0], len(rows), NumberDiePerCell[1])
+        On-wafer area fraction of each Die, `fraction[i,a,j,b]` being Die [a,b] of Cell [cols[i], rows[j]].
+    '''
+    R = (WaferDiameter - 2*RoundEdgeClearance)/2
+    cols, rows, dx0, dx1, dy0, dy1 = _die_edges( CellSize, NumberDiePerCell, MatrixShift, 2*R, N )
+    nx, ny = int(NumberDiePerCell[0]), int(NumberDiePerCell[1])
+    
+    # clip the Die to the flat, then overlap with the circle:
+    cy0 = np.clip( np.maximum(dy0, FlatEdgeClearanceY), -R, R )
+    cy1 = np.clip( np.maximum(dy1, FlatEdgeClearanceY), -R, R )
+    x0, x1 = dx0[:,None], dx1[:,None]
+    area = _disk_corner_area(x1, cy1, R) - _disk_corner_area(x0, cy1, R) \
+         - _disk_corner_area(x1, cy0, R) + _disk_corner_area(x0, cy0, R)
+    fraction = np.clip( area / ( (dx1 - dx0)[:,None] * (dy1 - dy0)[None,:] ), 0.0, 1.0 )
+    full = _die_on_wafer(dx0, dx1, dy0, dy1, R, FlatEdgeClearanceY)
+    fraction[full] = 1.0
+    fraction[~full] = np.minimum( fraction[~full], np.nextafter(1.0, 0.0) )
+    
+    return cols, rows, fraction.reshape( len(cols), nx, len(rows), ny )
+#end die_area_map()
+
+
+
+# Results of `_plan_layout()`, keyed by all the geometry parameters:
+_LayoutCache = {}
+
+def _plan_layout(args):
+    '''Return the number of exposed Cells and usable Die for one layout, `args` being the arguments of `die_count_map()` plus MinNumberDie.  Module-level so that it can be sent to worker processes.'''
+    MinNumberDie = args[-1]
+    cols, rows, counts = die_count_map( *args[:-1] )
+    exposed = counts >= max(MinNumberDie, 1)
+    return int( exposed.sum() ), int( counts[exposed].sum() )
+#end _plan_layout()
+
+
+
+
+def points_in_polygon(X, Y, verticesXY):
+    '''
+    Return bool array, True for each point (X,Y) inside the polygon with vertices `verticesXY` ([[X1,Y1], [X2,Y2], ...], closed automatically).  Uses the even-odd (ray-crossing) rule, vectorized over all points, with a loop over the polygon edges only.
+    
+    Parameters
+    ----------
+    X, Y : float arrays of the same shape
+        Coordinates of the points to test.
+    
+    verticesXY : iterable of 2-valued iterables
+        Polygon vertices, in order.
+    
+    Returns
+    -------
+    inside : bool array, same shape as X & Y
+    '''
+    X, Y = np.asarray(X, dtype=float), np.asarray(Y, dtype=float)
+    V = np.asarray(verticesXY, dtype=float).reshape(-1,2)
+    if len(V) < 3:
+        raise ValueError( "points_in_polygon(): Polygon needs at least 3 vertices, instead got %i." % len(V) )
+    inside = np.zeros( X.shape, dtype=bool )
+    for (x0, y0), (x1, y1) in zip( V, np.roll(V, -1, axis=0) ):
+        crosses = (y0 > Y) != (y1 > Y)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            xcross = x0 + (Y - y0) * (x1 - x0) / (y1 - y0)
+        inside ^= crosses & (X < xcross)
+    #end for(edges)
+    return inside
+#end points_in_polygon()
+
+
+
+
+class GridIndex(object):
+    '''
+    Spatial index of axis-aligned rectangles, using uniform grid buckets.
+    Each rectangle is registered in every bucket it touches; the (bucket, rectangle) pairs are stored sorted by bucket so that queries are a binary search, followed by an exact overlap test on the few candidates found.
+    
+    GridIndex( xmin, ymin, xmax, ymax, binsize=None )
+    
+    Parameters
+    ----------
+    xmin, ymin, xmax, ymax : 1-D array-like of floats
+        Bounds of each rectangle, in mm.
+    
+    binsize : float, optional
+        Bucket size in mm.  Defaults to the larger of the median rectangle width/height.
+    '''
+    
+    def __init__(self, xmin, ymin, xmax, ymax, binsize=None):
+        '''GridIndex constructor. See `help(GridIndex)` for parameters.'''
+        self.xmin = np.asarray(xmin, dtype=float).ravel()
+        self.ymin = np.asarray(ymin, dtype=float).ravel()
+        self.xmax = np.asarray(xmax, dtype=float).ravel()
+        self.ymax = np.asarray(ymax, dtype=float).ravel()
+        
+        if binsize is None:
+            if len(self.xmin):
+                binsize = max(  np.median(self.xmax - self.xmin), np.median(self.ymax - self.ymin)  )
+            if not binsize or binsize <= 0: binsize = 1.0
+        #end if(binsize)
+        self.binsize = float(binsize)
+        
+        ix0, iy0 = self._bin(self.xmin), self._bin(self.ymin)
+        ix1, iy1 = self._bin(self.xmax), self._bin(self.ymax)
+        keys, owner = self._keys(ix0, iy0, ix1, iy1)
+        order = np.argsort(keys, kind='stable')
+        self._keys_sorted = keys[order]
+        self._items = owner[order]
+    #end __init__
+    
+    
+    def __len__(self):
+        '''Return the number of rectangles in the index.'''
+        return len(self.xmin)
+    #end __len__
+    
+    
+    def _bin(self, v):
+        '''Return bucket index for coordinate(s) `v`.'''
+        return np.floor( np.asarray(v, dtype=float) / self.binsize ).astype(np.int64)
+    #end _bin()
+    
+    
+    @staticmethod
+    def _key(ix, iy):
+        '''Combine bucket X/Y indices into a single sortable integer key.'''
+        return (ix + 2**30) * 2**31 + (iy + 2**30)
+    #end _key()
+    
+    
+    def _keys(self, ix0, iy0, ix1, iy1):
+        '''Return keys of every bucket touched by each box, and the index of the box for each key.'''
+        nx = ix1 - ix0 + 1
+        ny = iy1 - iy0 + 1
+        cells, owner = _expand_ranges( np.zeros(len(nx), dtype=int), nx*ny )
+        ix = ix0[owner] + cells // ny[owner]
+        iy = iy0[owner] + cells % ny[owner]
+        return self._key(ix, iy), owner
+    #end _keys()
+    
+    
+    def query(self, xmin, ymin, xmax, ymax, touching=False):
+        '''
+        Find the rectangles overlapping each query box.  All boxes are queried at once.
+        
+        Parameters
+        ----------
+        xmin, ymin, xmax, ymax : float or 1-D array-like of floats
+            Bounds of the query box(es), in mm.
+        
+        touching : { True | False }, optional
+            If True, rectangles that only share an edge with the box count as overlapping. Defaults to False.
+        
+        Returns
+        -------
+        box, rect : int arrays
+            Pairs of (query box index, rectangle index) for every overlap found, without duplicates.
+        '''
+        qx0 = np.atleast_1d( np.asarray(xmin, dtype=float) ).ravel()
+        qy0 = np.atleast_1d( np.asarray(ymin, dtype=float) ).ravel()
+        qx1 = np.atleast_1d( np.asarray(xmax, dtype=float) ).ravel()
+        qy1 = np.atleast_1d( np.asarray(ymax, dtype=float) ).ravel()
+        if len(self) == 0 or len(qx0) == 0:
+            return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+        
+        keys, qowner = self._keys( self._bin(qx0), self._bin(qy0), self._bin(qx1), self._bin(qy1) )
+        lo = np.searchsorted( self._keys_sorted, keys, side='left' )
+        hi = np.searchsorted( self._keys_sorted, keys, side='right' )
+        pos, k = _expand_ranges( lo, hi - lo )
+        box, rect = qowner[k], self._items[pos]
+        
+        # exact overlap test on the candidates:
+        if touching:
+            hit = (self.xmin[rect] <= qx1[box]) & (self.xmax[rect] >= qx0[box]) & \
+                  (self.ymin[rect] <= qy1[box]) & (self.ymax[rect] >= qy0[box])
+        else:
+            hit = (self.xmin[rect] < qx1[box]) & (self.xmax[rect] > qx0[box]) & \
+                  (self.ymin[rect] < qy1[box]) & (self.ymax[rect] > qy0[box])
+        box, rect = box[hit], rect[hit]
+        
+        # remove duplicates, from rectangles found in several buckets:
+        if len(box):
+            pair = np.unique( box.astype(np.int64) * len(self) + rect )
+            box, rect = pair // len(self), pair % len(self)
+        return box, rect
+    #end query()
+    
+    
+    def any_overlap(self, xmin, ymin, xmax, ymax, touching=False):
+        '''Return boolean array, True for each query box that overlaps any rectangle in the index.  See `query()` for parameters.'''
+        n = np.atleast_1d( np.asarray(xmin) ).size
+        box, rect = self.query(xmin, ymin, xmax, ymax, touching=touching)
+        return np.bincount( box, minlength=n ).astype(bool)
+    #end any_overlap()
+    
+    
+    def overlapping_pairs(self, touching=False):
+        '''Return int array of shape (M,2) listing every pair of rectangles [i,j] (with i<j) in the index that overlap each other.'''
+        i, j = self.query( self.xmin, self.ymin, self.xmax, self.ymax, touching=touching )
+        keep = i < j
+        return np.column_stack( (i[keep], j[keep]) )
+    #end overlapping_pairs()
+
+#end class(GridIndex)
+
+
+
+################################################
+################################################
@@ -0,0 +1,192 @@
+"""
+This file is part of the ASML_JobCreator package for Python 3.x.
+
+profilelib.py
+    Machine profiles: TOML or JSON files of settings for one tool, laid over the built-in Defaults, so that Jobs for several machines can be built without editing `Defaults.py`.
+    Parsed profiles are cached by the hash of the file contents, in memory and optionally on disk.
+
+- - - - - - - - - - - - - - -
+
+ASML_JobCreator contributors; 2026
+
+"""
+
+####################################################
+# Module setup etc.
+
+from .__globals import *    # global variables/methods to the module.
+from .Defaults import Defaults as _DefaultsClass    # built-in Defaults
+import os
+
+####################################################
+
+
+ProfileDir = os.path.join( os.path.dirname(__file__), "Profiles" )    # profiles that can be loaded by name
+
+_Profiles = {}      # parsed profiles in memory, {(file type, file hash) : {Defaults attribute : value}}
+
+
+
+def get_MachineProfiles():
+    '''Return list of the names of the machine profiles in the `Profiles/` folder, which can be passed to `load_MachineProfile()` or `Job(profile=...)`.'''
+    if not os.path.isdir(ProfileDir): return []
+    return sorted( os.path.splitext(f)[0] for f in os.listdir(ProfileDir) if os.path.splitext(f)[1].lower() in (".toml", ".json") )
+#end get_MachineProfiles()
+
+
+
+def _find_Profile(profile):
+    '''Return the file path for `profile`: the path of a .toml/.json file, or the name of a profile in the `Profiles/` folder.'''
+    profile = str(profile)
+    if os.path.isfile(profile): return profile
+    for ext in (".toml", ".json"):
+        path = os.path.join( ProfileDir, profile + ext )
+        if os.path.isfile(path): return path
+    #end for(ext)
+    raise ValueError( "Machine profile `%s` not found: expected a .toml or .json file, or one of the profiles %s" % ( profile, get_MachineProfiles() ) )
+#end _find_Profile()
+
+
+
+def _parse_Profile(path, text):
+    '''
+    Return the settings {Defaults attribute : value} in the profile `text`, read from the file `path`.
+    Tables (TOML) or objects (JSON) are joined to the attribute names with "_", so `[Timing] StageSpeed = 250` sets `Defaults.Timing_StageSpeed`.  The top-level key `name` sets `Defaults.Profile_Name`.
+    '''
+    if path.lower().endswith(".json"):
+        import json
+        data = json.loads( text )
+    else:
+        try:
+            import tomllib      # Python 3.11+
+        except ImportError:
+            try:
+                import tomli as tomllib     # same module, for older Pythons
+            except ImportError:
+                raise ImportError( "Machine profile '%s': reading TOML files needs Python 3.11+, or the `tomli` package for older versions.  JSON profiles can be used without it." % path )
+        data = tomllib.loads( text )
+    #end if(json/toml)
+    
+    settings = {}
+    def flatten(d, prefix=""):
+        for k, v in d.items():
+            if isinstance(v, dict):
+                flatten( v, prefix + k + "_" )
+            else:
+                settings[ "Profile_Name" if prefix+k == "name" else prefix+k ] = v
+        #end for(items)
+    #end flatten()
+    flatten( data )
+    return settings
+#end _parse_Profile()
+
+
+
+def _check_Profile(path, settings):
+    '''Raise ValueError if any of the `settings` of the profile at `path` is not an attribute of the Defaults, or has a different type than the built-in value: a number, string, or list of the same length.  A built-in value of None accepts anything.'''
+    known = vars( _DefaultsClass() )
+    unknown = [ k for k in settings if k not in known ]
+    if unknown:
+        raise ValueError( "Machine profile '%s': unrecognized settings %s - names must match attributes of the Defaults, see `help(asml.Defaults)`." % ( path, unknown ) )
+    
+    def isnumber(v, integer=False):
+        return isinstance(v, int if integer else (int, float)) and not isinstance(v, bool)
+    for name, value in settings.items():
+        default = known[name]
+        if default is None: continue
+        if isinstance(default, str):
+            ok, expected = isinstance(value, str), "a string"
+        elif isnumber(default):
+            ok, expected = isnumber( value, integer=isinstance(default, int) ), "an integer" if isinstance(default, int) else "a number"
+        elif isinstance(default, (list, tuple)):
+            ok = isinstance(value, (list, tuple)) and len(value) == len(default) and all( isnumber(v) for v in value )
+            expected = "a list of %i numbers" % len(default)
+        else:
+            ok, expected = isinstance(value, type(default)), type(default).__name__
+        #end if(type)
+        if not ok:
+            raise ValueError( "Machine profile '%s': setting `%s` must be %s, like the built-in value %r, instead got: %r" % ( path, name, expected, default, value ) )
+    #end for(settings)
+#end _check_Profile()
+
+
+
+def _load_Profile(profile, defaults=None):
+    '''Return the settings {Defaults attribute : value} of `profile`, from the caches if this file's contents were parsed before.  The disk-cache directory is the `WaferProfile_CacheDir` of `defaults`, or of the current Defaults if None.  Settings from the disk cache are checked again with `_check_Profile()`, in case the file was changed.'''
+    import hashlib, json
+    from .Wafer import _cache_path
+    path = _find_Profile(profile)
+    with open(path, 'rb') as f:
+        data = f.read()
+    key = ( os.path.splitext(path)[1].lower(), hashlib.sha1(data).hexdigest() )     # the disk-cache file name also hashes the package version & the source of `Defaults.py` (the schema), see `Wafer._code_version()`
+    if key in _Profiles: return _Profiles[key]
+    
+    cache = _cache_path( "profile", key, ext="json", defaults=defaults )
+    settings = None
+    if cache is not None and os.path.isfile(cache):
+        try:
+            with open(cache, 'r') as f:
+                settings = json.load(f)
+            if DEBUG(): print( "Loaded cached machine profile from", cache )
+        except (OSError, ValueError):
+            settings = None
+    #end if(cache)
+    
+    if settings is None:
+        settings = _parse_Profile( path, data.decode("utf-8") )
+        _check_Profile( path, settings )
+        if cache is not None:
+            try:
+                os.makedirs( os.path.dirname(cache), exist_ok=True )
+                tmp = cache + ".%i.tmp" % os.getpid()
+                with open(tmp, 'w') as f:
+                    json.dump( settings, f )
+                os.replace( tmp, cache )     # atomic, in case of simultaneous processes
+            except (OSError, TypeError) as e:
+                if WARN(): print( "Machine profile: could not write cache file '%s': %s" % (cache, e) )
+        #end if(cache)
+    else:
+        _check_Profile( path, settings )
+    #end if(settings)
+    _Profiles[key] = settings
+    return settings
+#end _load_Profile()
+
+
+
+def load_MachineProfile(profile, defaults=None):
+    '''
+    Return a new Defaults object with the settings of a machine profile laid over the built-in Defaults.
+    
+    Parameters
+    ----------
+    profile : string
+        Path of a TOML (.toml) or JSON (.json) profile file, or the name of a profile in the `ASML_JobCreator/Profiles/` folder, see `get_MachineProfiles()`.  The file sets any of the attributes of the Defaults, eg.:
+            name = "Stepper 3"
+            WFR_DIAMETER = 150.0
+            [ProcessData]
+            LENS_REDUCTION = 5.0
+            [Timing]
+            StageSpeed = 250.0
+        where tables set the attributes with that prefix, eg. `ProcessData_LENS_REDUCTION`.
+    defaults : Defaults object, optional
+        Settings to lay the profile over, instead of the built-in Defaults.  Not changed.  Its `WaferProfile_CacheDir` (or else the current one) sets the disk cache for parsed profiles.
+    
+    Returns
+    -------
+    Defaults object.  Pass it to `Job(defaults=...)` or `local_settings(defaults=...)`, or use `Job(profile=...)`.
+    '''
+    settings = _load_Profile( profile, defaults )
+    from copy import deepcopy
+    D = _DefaultsClass() if defaults is None else defaults.copy()
+    for name, value in settings.items():
+        setattr( D, name, deepcopy(value) )    # the cached settings are shared
+    #end for(settings)
+    if DEBUG(): print( "Loaded machine profile `%s` (%i settings)." % ( profile, len(settings) ) )
+    return D
+#end load_MachineProfile()
+
+
+
+################################################
+################################################
@@ -0,0 +1,158 @@
+"""
+This file is part of the ASML_JobCreator package for Python 3.x.
+
+routelib.py
+    Stage-route heuristics for ordering the shots of a Layer: serpentine, nearest-neighbor and 2-opt, vectorized with NumPy.
+
+- - - - - - - - - - - - - - -
+
+ASML_JobCreator contributors; 2026
+
+"""
+
+####################################################
+# Module setup etc.
+
+from .__globals import *    # global variables/methods to the module.
+
+####################################################
+
+
+
+def _distance(A, B, metric="euclidean"):
+    '''Distance between points A & B (arrays with last dimension 2, broadcast together).  "chebyshev" is the larger of the X & Y moves, as for a stage moving both axes at once.'''
+    d = np.abs( np.asarray(A, dtype=float) - np.asarray(B, dtype=float) )
+    if metric == "euclidean":
+        return np.hypot( d[...,0], d[...,1] )
+    elif metric == "chebyshev":
+        return np.max( d, axis=-1 )
+    else:
+        raise ValueError( 'Unrecognized `metric` "%s", expected "euclidean" or "chebyshev".' % metric )
+#end _distance()
+
+
+
+def route_length(XY, order=None, metric="euclidean"):
+    '''Return the total stage travel in mm visiting the points `XY` (shape (N,2)) in the given `order` (defaults to the order of `XY`), as an open path.'''
+    XY = np.asarray(XY, dtype=float).reshape(-1,2)
+    if order is not None: XY = XY[ np.asarray(order, dtype=int) ]
+    if len(XY) < 2: return 0.0
+    return float( _distance( XY[1:], XY[:-1], metric ).sum() )
+#end route_length()
+
+
+
+def serpentine_route(XY, rowtol=1e-3):
+    '''
+    Return the order visiting the points `XY` row by row from the bottom up, alternating left-to-right and right-to-left.  Points whose Y-coordinates are within `rowtol` mm are in the same row.
+    '''
+    XY = np.asarray(XY, dtype=float).reshape(-1,2)
+    if len(XY) == 0: return np.zeros(0, dtype=int)
+    # group into rows:
+    ys = np.sort( XY[:,1] )
+    starts = np.concatenate( ( [True], np.diff(ys) > rowtol ) )
+    rowY = ys[starts]
+    row = np.searchsorted( rowY, XY[:,1] + rowtol, side='right' ) - 1
+    # X ascending in even rows, descending in odd rows:
+    x = np.where( row % 2 == 0, XY[:,0], -XY[:,0] )
+    return np.lexsort( (x, row) )
+#end serpentine_route()
+
+
+
+def nearest_neighbor_route(XY, start=0, metric="euclidean"):
+    '''Return the order visiting the points `XY`, starting from point index `start`, always moving to the nearest unvisited point.  Distances to all remaining points are calculated at once for each step.'''
+    XY = np.asarray(XY, dtype=float).reshape(-1,2)
+    N = len(XY)
+    if N == 0: return np.zeros(0, dtype=int)
+    order = np.empty( N, dtype=int )
+    visited = np.zeros( N, dtype=bool )
+    cur = int(start)
+    for k in range(N):
+        order[k] = cur
+        visited[cur] = True
+        if k == N-1: break
+        d = _distance( XY, XY[cur], metric )
+        d[visited] = np.inf
+        cur = int( np.argmin(d) )
+    #end for(points)
+    return order
+#end nearest_neighbor_route()
+
+
+
+def two_opt(XY, order, metric="euclidean", max_passes=50):
+    '''
+    Improve an open route with 2-opt moves: reversing a section of the route whenever that shortens it, until no reversal helps (or `max_passes` passes over the route).
+    For each start of a reversed section, the gains for all possible ends are calculated at once, and the best one is applied.
+    
+    Returns
+    -------
+    order : int array
+        Improved order of the points.
+    '''
+    XY = np.asarray(XY, dtype=float).reshape(-1,2)
+    order = np.array( order, dtype=int )
+    N = len(order)
+    if N < 3: return order
+    for p in range(max_passes):
+        improved = False
+        for i in range(N-2):
+            P = XY[order]
+            a, b = P[i], P[i+1]
+            c = P[i+2:]                 # candidate section ends, j = i+2 ... N-1
+            d = P[i+3:]                 # points after each end (none for the last point)
+            gain = _distance(a, b, metric) - _distance(a, c, metric)
+            gain[:-1] += _distance(c[:-1], d, metric) - _distance(b, d, metric)
+            j = int( np.argmax(gain) )
+            if gain[j] > 1e-9:
+                j += i+2
+                order[i+1:j+1] = order[i+1:j+1][::-1]
+                improved = True
+        #end for(i)
+        if DEBUG(): print( "two_opt(): pass %i, route length %0.3f mm" % ( p, route_length(XY, order, metric) ) )
+        if not improved: break
+    #end for(passes)
+    return order
+#end two_opt()
+
+
+
+def plan_route(XY, method="2opt", metric="euclidean"):
+    '''
+    Return an order for visiting the points `XY` with a short stage travel.
+    
+    Parameters
+    ----------
+    XY : float array, shape (N,2)
+        Points to visit, eg. shot centers in wafer coordinates.
+    
+    method : { "2opt" | "nearest" | "serpentine" }, optional
+        "serpentine" : row by row, alternating direction.
+        "nearest" : nearest-neighbor, starting from the start of the serpentine route.
+        "2opt" : nearest-neighbor route, improved with 2-opt moves.  Default.
+    
+    metric : { "euclidean" | "chebyshev" }, optional
+        Distance measure.  Defaults to "euclidean".
+    
+    Returns
+    -------
+    order : int array of shape (N,)
+    '''
+    XY = np.asarray(XY, dtype=float).reshape(-1,2)
+    serp = serpentine_route(XY)
+    if method == "serpentine":
+        return serp
+    elif method in ("nearest", "2opt"):
+        order = nearest_neighbor_route( XY, start=(serp[0] if len(serp) else 0), metric=metric )
+        if method == "2opt":
+            order = two_opt( XY, order, metric=metric )
+        return order
+    else:
+        raise ValueError( 'Unrecognized route `method` "%s", expected "2opt", "nearest" or "serpentine".' % method )
+#end plan_route()
+
+
+
+################################################
+################################################
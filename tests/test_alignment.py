@@ -0,0 +1,223 @@
+"""
+Tests of the Alignment helpers: choosing Strategy Marks, placing Marks & the pre-alignment checks.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_alignment.py
+"""
+import os, sys, itertools, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+def spread_score(XY, radius):
+    """Score of one set of mark positions, as documented in `optimize_Strategy()`."""
+    t = np.sort( np.arctan2( XY[:,1], XY[:,0] ) )
+    gaps = np.diff( np.append( t, t[0] + 2*np.pi ) )
+    return ( 1.0 - gaps.max()/(2*np.pi) ) + np.mean( np.hypot( XY[:,0], XY[:,1] ) ) / radius
+
+
+def exhaustive(XY, num, radius, coarse, span):
+    """Best score over every subset of `num` marks that meets the distance rules, or None."""
+    best = None
+    for s in itertools.combinations( range(len(XY)), num ):
+        d = [ np.hypot( *(XY[a] - XY[b]) ) for a,b in itertools.combinations(s, 2) ]
+        if num > 1 and ( min(d) < coarse or max(d) < span ): continue
+        score = spread_score( XY[list(s)], radius )
+        if best is None or score > best: best = score
+    return best
+
+
+class StrategyTests(unittest.TestCase):
+
+    def job(self, XY):
+        MyJob = asml.Job()
+        MyJob.set_WaferProfile( "100mm" )
+        for n, xy in enumerate(XY):
+            MyJob.Alignment.Mark( "M%i" % n, waferXY=list(xy) )
+        return MyJob
+
+    def test_matches_exhaustive(self):
+        rng = np.random.default_rng(0)
+        found = 0
+        for trial in range(40):
+            M = int( rng.integers(5, 11) )
+            r, t = rng.uniform( 5, 45, M ), rng.uniform( 0, 2*np.pi, M )
+            if trial % 2: t = t/4       # marks bunched in one quadrant, so the largest radii are a poor set
+            XY = np.round( np.column_stack( (r*np.cos(t), r*np.sin(t)) ), 3 )
+            for num in (1, 2, 3, 4):
+                if num > M: continue
+                MyJob = self.job(XY)
+                D = MyJob.defaults
+                best = exhaustive( XY, num, 50.0, D.AlignmentStrategy_MIN_MARK_DISTANCE_COARSE, D.AlignmentStrategy_MIN_MARK_DISTANCE )
+                if best is None:
+                    with self.assertRaises(ValueError):
+                        MyJob.Alignment.optimize_Strategy( "S", num=num )
+                    continue
+                found += 1
+                S = MyJob.Alignment.optimize_Strategy( "S", num=num )
+                chosen = np.array( [ m.waferXY for m in S.MarkList ], dtype=float )
+                self.assertEqual( len(chosen), num )
+                self.assertAlmostEqual( spread_score(chosen, 50.0), best, places=9, msg=(trial, num) )
+                if num > 1:
+                    d = [ np.hypot( *(a - b) ) for a,b in itertools.combinations(chosen, 2) ]
+                    self.assertGreaterEqual( min(d), D.AlignmentStrategy_MIN_MARK_DISTANCE_COARSE )
+                    self.assertGreaterEqual( max(d), D.AlignmentStrategy_MIN_MARK_DISTANCE )
+        #end for(trial)
+        self.assertGreater( found, 40 )
+
+    def test_backups(self):
+        XY = [ [40,0], [0,40], [-40,0], [0,-40], [30,30], [-30,-30], [5,5] ]
+        MyJob = self.job(XY)
+        S = MyJob.Alignment.optimize_Strategy( "S", num=4, backups=2, required_marks=3 )
+        self.assertEqual( S.MarkPrefList, ["P"]*4 + ["B"]*2 )
+        self.assertEqual( sorted( m.MarkID for m in S.MarkList[:4] ), ["M0", "M1", "M2", "M3"] )
+        # farthest from the Marks already chosen: the center Mark, then one of the two diagonal Marks
+        self.assertEqual( [ m.MarkID for m in S.MarkList[4:] ], ["M6", "M4"] )
+        self.assertEqual( S.get_required_marks(), 3 )
+        self.assertIn( S, MyJob.Alignment.StrategyList )
+
+    def test_not_enough_marks(self):
+        MyJob = self.job( [ [40,0], [-40,0] ] )
+        with self.assertRaises(ValueError):
+            MyJob.Alignment.optimize_Strategy( "S", num=2, backups=1 )
+        with self.assertRaises(ValueError):     # too close together
+            self.job( [ [1,0], [-1,0] ] ).Alignment.optimize_Strategy( "S", num=2 )
+
+#end class(StrategyTests)
+
+
+
+class PreAlignTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.set_WaferProfile( "100mm" )
+        self.Job.Cell.set_RoundEdgeClearance( 3.0 )
+        self.Job.Cell.set_FlatEdgeClearance( 2.0 )
+        self.Al = self.Job.Alignment
+        self.d = asml.Images.PM.sizeXY[0]/2         # half of the Primary Mark size
+
+    def allowed(self, XY, markXY=None):
+        return self.Al.check_PreAlignLocation( XY, markXY=markXY ).tolist()
+
+    def mirrored(self, X, Y):
+        return [ [X,Y], [-X,Y], [-X,-Y], [X,-Y] ]
+
+    def test_sector_boundaries(self):
+        A1, A2 = self.Job.defaults.AlignmentMark_PreAlignLocation_ExcludedAngles
+        d, r, eps = self.d, 40.0, 0.01
+        for angle, corner in ( (A1, [-d, d]), (A2, [d, -d]) ):
+            # place the mark's corner nearest the sector just outside & just inside of it:
+            for da, ok in ( (-eps, A1 == angle), (eps, A2 == angle) ):
+                P = r * np.array( [ np.cos(np.deg2rad(angle + da)), np.sin(np.deg2rad(angle + da)) ] )
+                X, Y = P - corner
+                self.assertEqual( self.allowed( self.mirrored(X, Y) ), [ok]*4, (angle, da) )
+        # the mark center outside of the sector is not enough:
+        P = r * np.array( [ np.cos(np.deg2rad(A1 - eps)), np.sin(np.deg2rad(A1 - eps)) ] )
+        self.assertEqual( self.allowed( [P] ), [False] )
+        self.assertEqual( self.allowed( [P], markXY=[0,0] ), [True] )
+
+    def test_flat_and_edge_clearance(self):
+        d, eps = self.d, 0.01
+        flatY = self.Job.Cell.get_FlatEdgeClearanceY()
+        self.assertGreater( flatY, -50.0 + 2.0 )
+        self.assertEqual( self.allowed( [ [0, flatY + d + eps], [0, flatY + d - eps] ] ), [True, False] )
+        rmax = 50.0 - 3.0
+        self.assertEqual( self.allowed( [ [0, rmax - d - eps], [0, rmax - d + eps] ] ), [True, False] )
+        rmin = self.Job.defaults.AlignmentMark_PreAlignLocation_MinRadius
+        self.assertEqual( self.allowed( [ [0, rmin + d + eps], [0, rmin + d - eps] ] ), [True, False] )
+        # the limit follows the flat clearance of the Cell structure:
+        self.Job.Cell.set_FlatEdgeClearance( 10.0 )
+        flatY = self.Job.Cell.get_FlatEdgeClearanceY()
+        self.assertEqual( self.allowed( [ [0, flatY + d + eps], [0, flatY + d - eps] ] ), [True, False] )
+
+    def test_set_prealignment_uses_mark_size(self):
+        # a location where the Primary Mark fits, but the wider SPM-X mark reaches into the excluded sector:
+        A2 = self.Job.defaults.AlignmentMark_PreAlignLocation_ExcludedAngles[1]
+        d = self.d
+        X, Y = 40.0 * np.array( [ np.cos(np.deg2rad(A2 + 0.05)), np.sin(np.deg2rad(A2 + 0.05)) ] ) + [-d, d]
+        sx, sy = asml.Images.SPM_X.sizeXY
+        self.assertLess( np.rad2deg( np.arctan2( Y - sy/2, X + sx/2 ) ), A2 )
+        PM1, PM2 = self.Al.Mark( "PM1", "PM", waferXY=[X, Y] ), self.Al.Mark( "PM2", "PM", waferXY=[-X, -Y] )
+        SX1, SX2 = self.Al.Mark( "SX1", "SPM_X", waferXY=[X, Y] ), self.Al.Mark( "SX2", "SPM_X", waferXY=[-X, -Y] )
+        L = self.Job.Layer( "L1" )
+        L.set_PreAlignment( [PM1, PM2], check_position=True )
+        self.assertEqual( L.PreAlignMarksList, [PM1, PM2] )
+        with self.assertRaises(ValueError):
+            L.set_PreAlignment( [SX1, SX2], check_position=True )
+        with self.assertRaises(ValueError):     # not on opposite sides
+            L.set_PreAlignment( [PM1, self.Al.Mark( "PM3", "PM", waferXY=[-X, Y] )], check_position=True )
+        self.assertEqual( [ (a.MarkID, b.MarkID) for a,b in self.Al.get_PreAlignmentPairs( [PM1, PM2, SX1] ) ], [ ("PM1", "PM2") ] )
+
+#end class(PreAlignTests)
+
+
+
+class MarkLocationTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.set_WaferProfile( "100mm" )
+        self.Job.Cell.set_CellSize( [10, 10] )
+        self.Job.Cell.set_MatrixShift( [5, 5] )
+        self.A = self.Job.Image( "A", "R1", sizeXY=[9,9] )      # 1 mm lanes between the shots
+        self.A.distribute( self.Job.Cell.get_ValidCells() )
+        self.L1 = self.Job.Layer( "L1" )
+        self.L1.expose_Image( self.A )
+
+    def collides(self, XY, markXY, clearance):
+        """Whether a mark at `XY`, grown by `clearance`, overlaps any exposed Image or existing Mark - testing each one."""
+        hx, hy = markXY[0]/2 + clearance, markXY[1]/2 + clearance
+        shots = [ ( I.sizeXY, [ 5 + 10*c + s[0], 5 + 10*r + s[1] ] ) for I in self.Job.ImageList if I.Layers for (c,r), s in zip(I.Cells, I.Shifts) ]
+        shots += [ ( m.Image.sizeXY, m.waferXY ) for m in self.Job.Alignment.MarkList ]
+        return any( abs(XY[0] - x) < hx + sx/2 and abs(XY[1] - y) < hy + sy/2 for (sx, sy), (x, y) in shots )
+
+    def check(self, found, markXY, clearance, min_distance=20.0):
+        for XY in found:
+            self.assertFalse( self.collides( XY, markXY, clearance ), XY )
+            self.assertLess( np.hypot( abs(XY[0]) + markXY[0]/2 + clearance, abs(XY[1]) + markXY[1]/2 + clearance ), 50.0 )
+        for a, b in itertools.combinations( found, 2 ):
+            self.assertGreaterEqual( np.hypot( *(a - b) ), min_distance )
+
+    def test_avoids_shots(self):
+        found = self.Job.Alignment.find_MarkLocations( num=4, clearance=0.2 )
+        self.assertEqual( found.shape, (4, 2) )
+        self.check( found, asml.Images.PM.sizeXY, 0.2 )
+        # in the lanes, or off the shots near the edge:
+        self.assertTrue( any( min( abs( (XY - 5) % 10 - 5 ) ) < 0.5 for XY in found ) )
+        # the wider SPM-X mark, and existing Marks:
+        for n, XY in enumerate(found): self.Job.Alignment.Mark( "M%i" % n, waferXY=XY )
+        found = self.Job.Alignment.find_MarkLocations( num=2, MarkType="SPM_X", clearance=0.1, min_distance=5.0 )
+        self.assertEqual( len(found), 2 )
+        self.check( found, asml.Images.SPM_X.sizeXY, 0.1, 5.0 )
+        self.assertTrue( all( np.hypot( *(XY - m.waferXY) ) >= 5.0 for XY in found for m in self.Job.Alignment.MarkList ) )
+
+    def test_not_enough_room(self):
+        # the lanes are too narrow for this clearance, and the shots cover the wafer up to the edge:
+        self.Job.set_ExposeEdgeDie()
+        self.A.distribute( [ CR for CR in self.Job.Cell.get_ValidCells() if list(CR) not in [ list(c) for c in self.A.Cells ] ] )
+        self.Job.Cell.set_RoundEdgeClearance( 0.0 )
+        found = self.Job.Alignment.find_MarkLocations( num=4, clearance=1.0 )
+        self.check( found, asml.Images.PM.sizeXY, 1.0 )
+        self.assertLess( len(found), 4 )
+
+    def test_layers(self):
+        B = self.Job.Image( "B", "R1", sizeXY=[40,40] )
+        B.distribute( [0,0] )
+        self.Job.Layer( "L2" ).expose_Image( B )
+        everything = self.Job.Alignment.find_MarkLocations( num=8, clearance=0.2, min_distance=5.0 )
+        only_L1 = self.Job.Alignment.find_MarkLocations( num=8, clearance=0.2, min_distance=5.0, layers=self.L1 )
+        self.check( everything, asml.Images.PM.sizeXY, 0.2, 5.0 )
+        inB = lambda XY: abs(XY[0] - 5) < 20.5 and abs(XY[1] - 5) < 20.5
+        self.assertFalse( any( inB(XY) for XY in everything ) )
+        self.assertTrue( any( inB(XY) for XY in only_L1 ) )
+
+#end class(MarkLocationTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Tests of the Cell index behind `Job.get_CellExposures()`, `get_RegionExposures()` & `get_WaferExposures()`: after every kind of change, it must match a full scan of the Images' distributions.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_cellindex.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator.Image import Image
+
+asml.unset_WARN()
+
+
+def scan(MyJob):
+    """Every exposure, from all Images' distributions: {(col,row) : {LayerID : sorted [(ImageID, shift)]}}."""
+    out = {}
+    for I in MyJob.ImageList:
+        for CR, s in zip( I.Cells, I.Shifts ):
+            for L in I.Layers:
+                out.setdefault( tuple(map(int, CR)), {} ).setdefault( L.get_LayerID(), [] ).append( (I.ImageID, tuple(s)) )
+    return { CR: { L: sorted(e) for L,e in Layers.items() } for CR, Layers in out.items() }
+
+
+def indexed(MyJob):
+    """The same, from `get_CellExposures()` on each Cell of the index."""
+    out = {}
+    for CR in list( MyJob._get_CellDict() ):
+        for I, L, s in MyJob.get_CellExposures( CR ):
+            out.setdefault( CR, {} ).setdefault( L.get_LayerID(), [] ).append( (I.ImageID, tuple(s)) )
+    return { CR: { L: sorted(e) for L,e in Layers.items() } for CR, Layers in out.items() }
+
+
+def build():
+    MyJob = asml.Job()
+    MyJob.Cell.set_CellSize( [10, 10] )
+    A = MyJob.Image( "A", "R1", sizeXY=[3,3] )
+    B = MyJob.Image( "B", "R1", sizeXY=[2,2] )
+    A.distribute( [[0,0], [1,0], [0,1]] )
+    L1 = MyJob.Layer( "L1" )
+    L1.expose_Image( A )
+    B.distribute( [-1,-1], shiftXY=[3,3] )     # distributed after A is exposed, before B is
+    L1.expose_Image( B )
+    B.distribute( [2,2], shiftXY=[-3,0] )      # distributed after it is exposed
+    L2 = MyJob.Layer( "L2" )
+    L2.expose_Image( B )
+    return MyJob
+
+
+class CellIndexTests(unittest.TestCase):
+
+    def check(self, MyJob):
+        self.assertEqual( indexed(MyJob), scan(MyJob) )
+
+    def test_distribute_and_expose(self):
+        MyJob = build()
+        self.check( MyJob )
+        self.assertEqual( sorted( (I.ImageID, L.get_LayerID(), s) for I,L,s in MyJob.get_CellExposures([-1,-1]) ), [ ("B", "L1", [3,3]), ("B", "L2", [3,3]) ] )
+        self.assertEqual( [ (I.ImageID, s) for I,L,s in MyJob.get_CellExposures([-1,-1], layer="L2") ], [ ("B", [3,3]) ] )
+        self.assertEqual( MyJob.get_CellExposures([5,5]), [] )
+
+    def test_add_images(self):
+        MyJob = build()
+        C = Image( "C", "R2", sizeXY=[2,2] )      # not part of a Job yet
+        C.distribute( [[0,0], [3,3]] )
+        MyJob.add_Images( C )
+        MyJob.LayerList[1].expose_Image( C )
+        self.check( MyJob )
+        self.assertIn( ("C", [0,0]), [ (I.ImageID, s) for I,L,s in MyJob.get_CellExposures([3,3], layer="L2") ] )
+        # a library Image copied into the Job:
+        D = MyJob.Image( asml.Images.PM )
+        D.distribute( [4,4] )
+        MyJob.LayerList[0].expose_Image( D )
+        self.check( MyJob )
+
+    def test_copy_rebuilds(self):
+        MyJob = build()
+        J2 = MyJob.copy()
+        self.assertIsNone( J2.CellDict )
+        # changed before the index is built:
+        J2.ImageList[0].distribute( [-2,0] )
+        J2.LayerList[1].expose_Image( J2.ImageList[0] )
+        self.check( J2 )
+        # and after:
+        J2.ImageList[1].distribute( [0,-2] )
+        self.check( J2 )
+        self.check( MyJob )
+        self.assertNotEqual( scan(J2), scan(MyJob) )
+        # the copy's index refers to the copy's objects:
+        self.assertTrue( all( I.parent is J2 and L.parent is J2 for CR in J2.CellDict for I,L,s in J2.get_CellExposures(CR) ) )
+
+    def test_cellmask(self):
+        MyJob = build()
+        M = asml.CellMask.Annulus( MyJob.Cell, 30.0 ) & asml.CellMask.Valid( MyJob.Cell )
+        E = MyJob.Image( "E", "R2", sizeXY=[1,1] )
+        MyJob.LayerList[0].expose_Image( E )
+        E.distribute( M, shiftXY=[2,2] )
+        self.assertEqual( len(E.Cells), len(M) )
+        self.check( MyJob )
+        MyJob.LayerList[1].expose_Image( E )
+        self.check( MyJob )
+
+    def test_region_and_wafer(self):
+        MyJob = build()
+        E = MyJob.Image( "E", "R2", sizeXY=[1,1] )
+        E.distribute( asml.CellMask.Valid( MyJob.Cell ), shiftXY=[2,2] )
+        MyJob.LayerList[0].expose_Image( E )
+        full = scan( MyJob )
+        for c1, c2 in ( ([-1,-1], [1,1]), ([2,2], [-3,0]), ([-20,-20], [20,20]), ([0,0], [0,0]) ):
+            (c0, c1_), (r0, r1) = sorted([c1[0], c2[0]]), sorted([c1[1], c2[1]])
+            expected = sorted( (CR, L, e) for CR, Layers in full.items() if c0 <= CR[0] <= c1_ and r0 <= CR[1] <= r1 for L,es in Layers.items() for e in es )
+            found = sorted( ( tuple(CR), L.get_LayerID(), (I.ImageID, tuple(s)) ) for CR,I,L,s in MyJob.get_RegionExposures(c1, c2) )
+            self.assertEqual( found, expected, (c1, c2) )
+        # points on the wafer, against the Image footprints:
+        rng = np.random.default_rng(0)
+        for XY in rng.uniform( -40, 40, (200,2) ):
+            expected = sorted( ( I.ImageID, L.get_LayerID(), tuple(CR) ) for I in MyJob.ImageList for CR,s in zip(I.Cells, I.Shifts) for L in I.Layers
+                               if abs( XY[0] - (CR[0]*10 + s[0]) ) <= I.sizeXY[0]/2 and abs( XY[1] - (CR[1]*10 + s[1]) ) <= I.sizeXY[1]/2 )
+            found = sorted( ( I.ImageID, L.get_LayerID(), tuple(CR) ) for CR,I,L,s in MyJob.get_WaferExposures(XY) )
+            self.assertEqual( found, expected, XY )
+
+#end class(CellIndexTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
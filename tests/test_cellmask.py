@@ -0,0 +1,85 @@
+"""
+Tests of CellMask selections and distributing Images to many Cells.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_cellmask.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+def cellset(mask):
+    return set( tuple(c) for c in mask.get_Cells() )
+
+
+class CellMaskTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.Cell.set_CellSize( [10, 10] )
+        self.Job.Cell.set_MatrixShift( [0, 0] )
+        self.A = asml.CellMask.Rectangle( self.Job.Cell, [-2,-2], [1,1] )
+        self.B = asml.CellMask.Rectangle( self.Job.Cell, [0,0], [3,3] )
+
+    def test_rectangle(self):
+        self.assertEqual( cellset(self.A), set( (c,r) for c in range(-2,2) for r in range(-2,2) ) )
+        self.assertEqual( len(self.A), 16 )
+        self.assertIn( [1,1], self.A )
+        self.assertNotIn( [2,1], self.A )
+
+    def test_operators(self):
+        a, b = cellset(self.A), cellset(self.B)
+        self.assertEqual( cellset(self.A | self.B), a | b )
+        self.assertEqual( cellset(self.A & self.B), a & b )
+        self.assertEqual( cellset(self.A - self.B), a - b )
+        self.assertEqual( cellset(self.A ^ self.B), a ^ b )
+        full = cellset( asml.CellMask(self.Job.Cell, fill=True) )
+        self.assertEqual( cellset(~self.A), full - a )
+        # operands are not changed:
+        self.assertEqual( cellset(self.A), a )
+
+    def test_valid(self):
+        valid = asml.CellMask.Valid( self.Job.Cell )
+        self.assertEqual( cellset(valid), set( tuple(c) for c in self.Job.Cell.get_ValidCells() ) )
+
+    def test_cells_and_modulo(self):
+        cells = asml.CellMask.Cells( self.Job.Cell, [[0,0], [2,-1]] )
+        self.assertEqual( cellset(cells), {(0,0), (2,-1)} )
+        even = asml.CellMask.Modulo( self.Job.Cell, colmod=2, colrem=0 ) & self.A
+        self.assertEqual( cellset(even), set( c for c in cellset(self.A) if c[0] % 2 == 0 ) )
+
+    def test_distribute_mask(self):
+        I = self.Job.Image( "A", "R1", sizeXY=[3,3] )
+        I.distribute( self.A - self.B, shiftXY=[1,0] )
+        self.assertEqual( set(I.Cells), cellset(self.A - self.B) )
+        self.assertTrue( all( s == (1,0) for s in I.Shifts ) )
+        L = self.Job.Layer( "L1" )
+        L.expose_Image( I )
+        self.assertEqual( [ (E[0], E[2]) for E in self.Job.get_CellExposures([-2,-2]) ], [ (I, [1,0]) ] )
+        self.assertEqual( self.Job.get_CellExposures([1,1]), [] )     # in both masks, so not distributed
+
+    def test_distribute_list(self):
+        I = self.Job.Image( "A", "R1", sizeXY=[3,3] )
+        I.distribute( [[0,0], [1,2], [-3,4]] )
+        self.assertEqual( I.Cells, [(0,0), (1,2), (-3,4)] )
+        I.distribute( [5,5] )
+        self.assertEqual( I.Cells[-1], (5,5) )
+
+    def test_distribute_checks_first(self):
+        I = self.Job.Image( "A", "R1", sizeXY=[3,3] )
+        with self.assertRaises(ValueError):
+            I.distribute( [[0,0], [1.5,2]] )
+        with self.assertRaises(ValueError):
+            I.distribute( [[0,0], [1,2]], shiftXY=[1,2,3] )
+        self.assertEqual( I.Cells, [] )
+
+#end class(CellMaskTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
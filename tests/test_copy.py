@@ -0,0 +1,105 @@
+"""
+Tests of `Job.copy()`: the distributions & exposure tables are shared copy-on-write, so changing a copy never changes the original.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_copy.py
+"""
+import os, sys, shutil, tempfile, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+def build():
+    """Job with three Images on two reticles, two of them exposed on one Layer."""
+    MyJob = asml.Job()
+    MyJob.Cell.set_CellSize( [10, 10] )
+    A = MyJob.Image( "A", "R1", sizeXY=[3,3] )
+    B = MyJob.Image( "B", "R1", sizeXY=[2,2], shiftXY=[4,4] )
+    C = MyJob.Image( "C", "R2", sizeXY=[2,2], shiftXY=[-4,4] )
+    A.distribute( [[0,0], [1,0], [0,1]] )
+    B.distribute( [[-1,-1], [2,2]] )
+    C.distribute( [[-2,0]] )
+    L = MyJob.Layer( "L1" )
+    L.expose_Images( [A, B], Energy=[20, 21] )
+    return MyJob
+
+
+def change(MyJob):
+    """Change a Job through each of the copy-on-write paths."""
+    A, B, C = MyJob.ImageList
+    L = MyJob.LayerList[0]
+    A.distribute( [[-1,1], [1,1]] )
+    L.expose_Image( C, Energy=30 )
+    L.get_Exposures(writable=True)["Energy"] *= 2
+    B.set_ReticleID( "R3" )
+
+
+def cellindex(MyJob):
+    """The Cell index as plain values: {(col,row) : {LayerID : [(ImageID, shift)]}}."""
+    return { CR: { L.get_LayerID(): sorted( (I.ImageID, tuple(s)) for I,s in E ) for L,E in Layers.items() } for CR, Layers in MyJob._get_CellDict().items() if Layers }
+
+
+def state(MyJob):
+    return ( [ (I.ImageID, list(I.Cells), list(I.Shifts)) for I in MyJob.ImageList ],
+             [ dict( { f: L.Exposures[f].tolist() for f in L.Exposures.dtype.names }, Sig_i=L.Sig_iList ) for L in MyJob.LayerList ],     # Sig_i as None, since NaN != NaN
+             cellindex(MyJob),
+             { R: [I.ImageID for I in Imgs] for R, Imgs in MyJob.get_Reticles().items() } )
+
+
+class CopyTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree( self.dir )
+
+    def export(self, MyJob, name):
+        path = os.path.join( self.dir, name )
+        MyJob.export( path )
+        with open(path) as f:
+            return f.read()
+
+    def test_changing_copy_keeps_original(self):
+        J = build()
+        before, text = state(J), self.export(J, "before.txt")
+        J2 = J.copy()
+        change( J2 )
+        self.assertEqual( state(J), before )
+        self.assertEqual( self.export(J, "after.txt"), text )
+        # the copy is the same as a Job built with the same changes:
+        J3 = build()
+        change( J3 )
+        self.assertEqual( state(J2), state(J3) )
+        self.assertEqual( self.export(J2, "copy.txt"), self.export(J3, "built.txt") )
+
+    def test_changing_original_keeps_copy(self):
+        J = build()
+        J2 = J.copy()
+        before, text = state(J2), self.export(J2, "before.txt")
+        change( J )
+        self.assertEqual( state(J2), before )
+        self.assertEqual( self.export(J2, "after.txt"), text )
+
+    def test_lists_shared_until_changed(self):
+        J = build()
+        J2 = J.copy()
+        A, A2 = J.ImageList[0], J2.ImageList[0]
+        self.assertIs( A2.Cells, A.Cells )
+        self.assertIs( J2.LayerList[0]._Exposures, J.LayerList[0]._Exposures )
+        A2.distribute( [5,5] )
+        self.assertIsNot( A2.Cells, A.Cells )
+        self.assertIs( J2.ImageList[1].Cells, J.ImageList[1].Cells )
+        # the copy's objects refer to the copy:
+        self.assertIs( A2.parent, J2 )
+        self.assertIs( A2.Layers[0], J2.LayerList[0] )
+        self.assertIs( J2.LayerList[0].ImageList[0], A2 )
+
+#end class(CopyTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
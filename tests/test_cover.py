@@ -0,0 +1,80 @@
+"""
+Tests of the cover-mode prediction: `Cell.get_CoverMap()` and `Cell.predict_Shots()`.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_cover.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+def covered(MyJob, col, row):
+    """Whether Cell [col,row] is exposed in COVER_MODE "W", one Die at a time: at least MinNumberDie Die with all corners within the clearances."""
+    C = MyJob.Cell
+    (cx, cy), (nx, ny) = C.get_CellSize(), C.get_NumberDiePerCell()
+    mx, my = C.get_MatrixShift()
+    R = MyJob.get_WaferDiameter()/2 - C.get_RoundEdgeClearance()
+    flatY = C.get_FlatEdgeClearanceY()
+    n = 0
+    for a in range(nx):
+        for b in range(ny):
+            x0, y0 = mx + col*cx - cx/2 + a*cx/nx, my + row*cy - cy/2 + b*cy/ny
+            corners = [ (x, y) for x in (x0, x0 + cx/nx) for y in (y0, y0 + cy/ny) ]
+            if all( np.hypot(x, y) <= R for x,y in corners ) and y0 >= flatY: n += 1
+    return n >= max( C.get_MinNumberDie(), 1 )
+
+
+class CoverTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.set_WaferProfile( "100mm" )
+        self.Job.Cell.set_CellSize( [10, 10] )
+        self.Job.Cell.set_MatrixShift( [2, 3] )
+        self.Job.Cell.set_NumberDiePerCell( [2, 2] )
+        self.Job.Cell.set_MinNumberDie( 3 )
+        self.Job.Cell.set_RoundEdgeClearance( 1.0 )
+        self.Job.Cell.set_FlatEdgeClearance( 2.0 )
+
+    def test_cover_map(self):
+        cols, rows, exposed, dies = self.Job.Cell.get_CoverMap()
+        for i, c in enumerate(cols):
+            for j, r in enumerate(rows):
+                self.assertEqual( exposed[i,j], covered(self.Job, c, r), (c, r) )
+        self.assertTrue( np.array_equal( exposed, dies >= 3 ) )
+        # another MatrixShift, without changing the Cell:
+        cols, rows, exposed, dies = self.Job.Cell.get_CoverMap( MatrixShift=[0,0] )
+        self.assertEqual( list(self.Job.Cell.get_MatrixShift()), [2, 3] )
+        self.assertTrue( exposed[ list(cols).index(0), list(rows).index(0) ] )
+
+    def test_predict_shots(self):
+        A = self.Job.Image( "A", "R1", sizeXY=[4,4] )
+        B = self.Job.Image( "B", "R1", sizeXY=[4,4] )
+        cells = [ [c,r] for c in range(-6,7) for r in range(-6,7) ]
+        A.distribute( cells )
+        B.distribute( [[0,0], [4,4], [40,0]] )         # the last far off the wafer
+        L1, L2 = self.Job.Layer( "L1" ), self.Job.Layer( "L2" )
+        L1.expose_Images( [A, B] )
+        L2.expose_Image( B )
+        expected_A = [ c for c in cells if covered(self.Job, *c) ]
+        self.assertGreater( len(expected_A), 50 )
+        self.assertLess( len(expected_A), len(cells) )
+        shots, skipped = self.Job.Cell.predict_Shots()
+        self.assertEqual( shots, { "L1": len(expected_A) + 1, "L2": 1 } )      # Cell [4,4] is past the wafer edge
+        self.assertEqual( sorted( (L.get_LayerID(), I.ImageID, tuple(c)) for L,I,c in skipped ),
+                          sorted( [ ("L1", "A", tuple(c)) for c in cells if c not in expected_A ] + [ (L, "B", c) for L in ("L1", "L2") for c in ((4,4), (40,0)) ] ) )
+        self.assertEqual( self.Job.Cell.predict_Shots( layers=L2 )[0], { "L2": 1 } )
+        # exposing edge Die covers every Cell that is partly on the wafer:
+        self.Job.set_ExposeEdgeDie()
+        self.assertGreater( self.Job.Cell.predict_Shots()[0]["L1"], len(expected_A) + 1 )
+
+#end class(CoverTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
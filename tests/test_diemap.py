@@ -0,0 +1,85 @@
+"""
+Tests of the Die-level wafer maps: `geomlib.die_area_map()`, `die_count_map()` and `Cell.get_DieMap()`.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_diemap.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator.geomlib import die_area_map, die_count_map
+
+asml.unset_WARN()
+
+
+def sampled_fraction(x0, x1, y0, y1, R, flatY, n=400):
+    """On-wafer fraction of the Die [x0,x1] x [y0,y1], from an n x n grid of points at the centers of equal sub-squares."""
+    x = x0 + (np.arange(n) + 0.5) * (x1 - x0)/n
+    y = y0 + (np.arange(n) + 0.5) * (y1 - y0)/n
+    X, Y = np.meshgrid(x, y)
+    return np.mean( (X*X + Y*Y <= R*R) & (Y >= flatY) )
+
+
+class DieAreaTests(unittest.TestCase):
+
+    def test_closed_form(self):
+        # four 50 mm Die meeting at the center of a 100 mm wafer: each is a quarter circle
+        cols, rows, frac = die_area_map( [100,100], [2,2], [0,0], 100.0, 0.0, -1000.0, N=(0,0) )
+        self.assertEqual( frac.shape, (1, 2, 1, 2) )
+        self.assertTrue( np.allclose( frac, np.pi/4 ) )
+        # a Die well inside the wafer, cut in half by the flat:
+        cols, rows, frac = die_area_map( [10,10], [1,1], [0,-5], 100.0, 0.0, -5.0, N=(0,0) )
+        self.assertAlmostEqual( frac[0,0,0,0], 0.5 )
+        # ... and entirely inside:
+        cols, rows, frac = die_area_map( [10,10], [1,1], [0,0], 100.0, 0.0, -20.0, N=(0,0) )
+        self.assertEqual( frac[0,0,0,0], 1.0 )
+        # the round-edge clearance shrinks the circle: a 60 mm Die square on a wafer of radius 50 - 20
+        cols, rows, frac = die_area_map( [60,60], [1,1], [0,0], 100.0, 20.0, -1000.0, N=(0,0) )
+        self.assertAlmostEqual( frac[0,0,0,0], np.pi*30**2 / 60**2 )
+
+    def test_sampled(self):
+        rng = np.random.default_rng(0)
+        for trial in range(4):
+            cell = rng.uniform( 8, 25, 2 )
+            nd = rng.integers( 1, 4, 2 )
+            shift = rng.uniform( -5, 5, 2 )
+            R, flatY = 50.0 - 2.0, -42.0
+            cols, rows, frac = die_area_map( cell, nd, shift, 100.0, 2.0, flatY )
+            i, a, j, b = np.nonzero( (frac > 0) & (frac < 1) )
+            self.assertGreater( len(i), 0 )
+            for n in rng.choice( len(i), 15, replace=False ):
+                x0 = shift[0] + cols[i[n]]*cell[0] - cell[0]/2 + a[n]*cell[0]/nd[0]
+                y0 = shift[1] + rows[j[n]]*cell[1] - cell[1]/2 + b[n]*cell[1]/nd[1]
+                expected = sampled_fraction( x0, x0 + cell[0]/nd[0], y0, y0 + cell[1]/nd[1], R, flatY )
+                self.assertAlmostEqual( frac[i[n], a[n], j[n], b[n]], expected, delta=0.005 )
+
+    def test_matches_die_count(self):
+        for cell, nd, shift in ( ([10,10], [1,1], [0,0]), ([7,9], [3,2], [1.5,-2]), ([20,5], [4,1], [3,0.5]) ):
+            args = ( cell, nd, shift, 100.0, 1.5, -45.0 )
+            cols, rows, frac = die_area_map( *args )
+            cols2, rows2, counts = die_count_map( *args )
+            self.assertTrue( np.array_equal(cols, cols2) and np.array_equal(rows, rows2) )
+            self.assertTrue( np.array_equal( (frac == 1.0).sum(axis=(1,3)), counts ) )
+            self.assertTrue( np.all( (frac >= 0) & (frac <= 1) ) )
+
+    def test_cell_die_map(self):
+        MyJob = asml.Job()
+        MyJob.set_WaferProfile( "100mm" )
+        MyJob.Cell.set_CellSize( [10, 10] )
+        MyJob.Cell.set_NumberDiePerCell( [2, 2] )
+        XY, cellCR, dieCR, fraction, valid = MyJob.Cell.get_DieMap( min_fraction=0.5 )
+        self.assertTrue( np.all( fraction > 0 ) )
+        self.assertTrue( np.array_equal( valid, fraction >= 0.5 ) )
+        self.assertTrue( np.all( (dieCR >= 0) & (dieCR < 2) ) )
+        self.assertTrue( np.allclose( XY, cellCR*10 - 5 + (dieCR + 0.5)*5 ) )
+        # Die entirely on the wafer make up the Cells counted by the cover map:
+        cols, rows, exposed, dies = MyJob.Cell.get_CoverMap()
+        self.assertEqual( np.count_nonzero( fraction == 1.0 ), dies.sum() )
+
+#end class(DieAreaTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
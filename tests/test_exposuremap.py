@@ -0,0 +1,69 @@
+"""
+Tests of the per-Cell exposure statistics from `Plot.get_ExposureMap()`.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_exposuremap.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+class ExposureMapTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.Cell.set_CellSize( [10, 10] )
+        A = self.Job.Image( "A", "R1", sizeXY=[3,3] )
+        B = self.Job.Image( "B", "R1", sizeXY=[2,2], shiftXY=[4,4] )
+        C = self.Job.Image( "C", "R2", sizeXY=[2,2] )
+        A.distribute( [[0,0], [1,0], [0,1], [-2,3]] )
+        B.distribute( [[0,0], [1,0]] )
+        C.distribute( [[0,0], [7,0]] )          # off the wafer, outside of the default grid
+        L1, L2 = self.Job.Layer( "L1" ), self.Job.Layer( "L2" )
+        L1.expose_Images( [A, B], Energy=[20, 30] )
+        L2.expose_Images( [A, C], Energy=[5, 40] )
+        self.Job.Alignment.Mark( "M", waferXY=[0,0] )
+
+    def expected(self, layers):
+        """{ (col,row) : (shots, dose, set of ReticleIDs) } by looping over every distribution."""
+        out = {}
+        for L in self.Job.LayerList:
+            if L.get_LayerID() not in layers: continue
+            for I, E in zip( L.ImageList, L.EnergyList ):
+                for CR in I.Cells:
+                    n, d, R = out.get( tuple(CR), (0, 0.0, set()) )
+                    out[tuple(CR)] = ( n + 1, d + E, R | {I.get_ReticleID()} )
+        return out
+
+    def check(self, layer, layers):
+        cols, rows, shots, dose, reticles = self.Job.Plot.get_ExposureMap( layer=layer )
+        self.assertEqual( shots.shape, (len(cols), len(rows)) )
+        expected = self.expected( layers )
+        for i, c in enumerate(cols):
+            for j, r in enumerate(rows):
+                n, d, R = expected.get( (c, r), (0, 0.0, set()) )
+                self.assertEqual( (shots[i,j], reticles[i,j]), (n, len(R)), (c, r) )
+                self.assertAlmostEqual( dose[i,j], d )
+        self.assertEqual( shots.sum(), sum( n for n,d,R in expected.values() ) )
+        return cols, rows, shots
+
+    def test_all_layers(self):
+        cols, rows, shots = self.check( None, ["L1", "L2"] )
+        self.assertIn( 7, cols )                # grid grows to include all distributed Cells
+        self.assertEqual( shots[ list(cols).index(0), list(rows).index(0) ], 4 )
+
+    def test_layer_subsets(self):
+        self.check( "L1", ["L1"] )
+        self.check( ["L2"], ["L2"] )
+        self.check( ["L1", "L2"], ["L1", "L2"] )
+
+#end class(ExposureMapTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
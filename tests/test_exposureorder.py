@@ -0,0 +1,93 @@
+"""
+Tests of the Layer exposure order: `set_ExposureOrder()`, `optimize_ExposureOrder()` and the exported IMAGE_EXPOSURE_ORDER.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_exposureorder.py
+"""
+import os, sys, shutil, tempfile, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+def exported_order(path):
+    """{ (LayerID, ImageID) : IMAGE_EXPOSURE_ORDER } from the RETICLE_DATA sections of an exported job."""
+    out, section = {}, None
+    with open(path) as f:
+        for line in f:
+            words = line.split()
+            if not words: continue
+            if words[0] == "START_SECTION":
+                section, fields = words[1], {}
+            elif words[0] == "END_SECTION":
+                if section == "RETICLE_DATA":
+                    out[ ( fields["LAYER_ID"].strip('"'), fields["IMAGE_ID"].strip('"') ) ] = int( fields["IMAGE_EXPOSURE_ORDER"] )
+                section = None
+            elif section:
+                fields[words[0]] = words[1] if len(words) > 1 else ""
+    return out
+
+
+class ExposureOrderTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.Job = asml.Job()
+        self.Job.Cell.set_CellSize( [10, 10] )
+        # Images alternating between two reticles, at different reticle positions:
+        shifts = [ [5,5], [-5,5], [5,-5], [-5,-5], [0,0], [5,0] ]
+        self.Images = [ self.Job.Image( "I%i" % n, "R%i" % (n % 2), sizeXY=[2,2], shiftXY=s ) for n, s in enumerate(shifts) ]
+        for n, I in enumerate(self.Images): I.distribute( [[n,0], [n,1]] )
+        self.L = self.Job.Layer( "L1" )
+        self.L.expose_Images( self.Images )
+
+    def tearDown(self):
+        shutil.rmtree( self.dir )
+
+    def export(self):
+        path = os.path.join( self.dir, "job.txt" )
+        self.Job.export( path, overwrite=True )
+        return exported_order( path )
+
+    def test_default_order(self):
+        self.assertIsNone( self.L.get_ExposureOrder() )
+        self.assertEqual( set( self.export().values() ), {0} )     # machine default
+
+    def test_exported_order(self):
+        I = self.Images
+        self.L.set_ExposureOrder( [ I[3], I[0], I[5] ] )
+        order = self.L.get_ExposureOrder()
+        self.assertEqual( order, [ I[3], I[0], I[5], I[1], I[2], I[4] ] )     # the rest in their current order
+        self.assertEqual( self.export(), { ("L1", J.ImageID): n+1 for n, J in enumerate(order) } )     # 1-based
+        self.L.unset_ExposureOrder()
+        self.assertEqual( set( self.export().values() ), {0} )
+        with self.assertRaises(ValueError):
+            self.L.set_ExposureOrder( [ self.Job.Image( "X", "R0" ) ] )
+
+    def test_optimize_groups_reticles(self):
+        order = self.L.optimize_ExposureOrder()
+        self.assertEqual( order, self.L.get_ExposureOrder() )
+        self.assertEqual( sorted( I.ImageID for I in order ), sorted( I.ImageID for I in self.Images ) )
+        reticles = [ I.get_ReticleID() for I in order ]
+        self.assertEqual( reticles, ["R0"]*3 + ["R1"]*3 )      # each reticle once, in order of first use
+        # within a reticle, row by row across the reticle from the bottom, alternating direction:
+        self.assertEqual( [ I.ImageID for I in order ], ["I2", "I4", "I0", "I3", "I5", "I1"] )
+        self.assertEqual( self.export(), { ("L1", I.ImageID): n+1 for n, I in enumerate(order) } )
+
+    def test_optimize_reduces_time(self):
+        before = self.L.estimate_Time()
+        order = self.L.optimize_ExposureOrder( apply=False )
+        self.assertIsNone( self.L.get_ExposureOrder() )
+        self.L.set_ExposureOrder( order )
+        after = self.L.estimate_Time()
+        self.assertEqual( (before["reticle_changes"], after["reticle_changes"]), (6, 2) )
+        self.assertEqual( after["shots"], before["shots"] )
+        self.assertLess( after["wafer_time"], before["wafer_time"] )
+
+#end class(ExposureOrderTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
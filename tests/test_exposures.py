@@ -0,0 +1,90 @@
+"""
+Tests of the Layer exposure table: `expose_Images()`, `get_Exposures()` and the per-setting columns.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_exposures.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+class ExposureTableTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.Cell.set_CellSize( [10, 10] )
+        self.Images = [ self.Job.Image( "I%i" % n, "R1", sizeXY=[3,3] ) for n in range(4) ]
+        for n, I in enumerate(self.Images): I.distribute( [n, 0] )
+        self.L = self.Job.Layer( "L1" )
+
+    def test_scalar_settings(self):
+        self.L.expose_Images( self.Images, Energy=22, Focus=-0.1, FocusTilt=[1,2], NA=0.5, Sig_o=0.6, IlluminationMode="conv" )
+        X = self.L.Exposures
+        self.assertEqual( len(X), 4 )
+        self.assertTrue( np.all( X["Energy"] == 22 ) and np.all( X["Focus"] == -0.1 ) )
+        self.assertTrue( np.all( X["FocusTilt"] == [1,2] ) )
+        self.assertEqual( list(X["IlluminationMode"]), ["Conventional"]*4 )
+        self.assertEqual( self.L.ImageList, self.Images )
+        self.assertTrue( all( I.Layers == [self.L] for I in self.Images ) )
+
+    def test_per_image_settings(self):
+        self.L.expose_Images( self.Images, Energy=[20, 21, 22, 23], FocusTilt=[[0,0], [0,1], [1,0], [1,1]], IlluminationMode=["d", "a", "c", "d"] )
+        self.assertEqual( list(self.L.EnergyList), [20, 21, 22, 23] )
+        self.assertEqual( self.L.FocusTiltList.tolist(), [[0,0], [0,1], [1,0], [1,1]] )
+        self.assertEqual( list(self.L.IlluminationModeList), ["Default", "Annular", "Conventional", "Default"] )
+        # same as exposing one at a time:
+        L2 = self.Job.Layer( "L2" )
+        for I, E in zip( self.Images, [20, 21, 22, 23] ): L2.expose_Image( I, Energy=E )
+        self.assertEqual( list(L2.EnergyList), list(self.L.EnergyList) )
+
+    def test_length_mismatch(self):
+        self.L.expose_Image( self.Images[0], Energy=19 )
+        with self.assertRaises(ValueError):
+            self.L.expose_Images( self.Images[1:], Energy=[20, 21] )
+        with self.assertRaises(ValueError):
+            self.L.expose_Images( self.Images[1:], FocusTilt=[[0,0], [0,1]] )
+        with self.assertRaises(ValueError):     # already exposed
+            self.L.expose_Images( self.Images[:2] )
+        # nothing was added:
+        self.assertEqual( self.L.ImageList, self.Images[:1] )
+        self.assertEqual( list(self.L.EnergyList), [19] )
+        self.assertEqual( self.Images[1].Layers, [] )
+
+    def test_sig_i_none(self):
+        self.L.expose_Images( self.Images, Sig_i=[None, 0.3, None, 0.5] )
+        self.assertEqual( self.L.Sig_iList, [None, 0.3, None, 0.5] )
+        self.assertTrue( np.isnan( self.L.Exposures["Sig_i"][0] ) )
+        L2 = self.Job.Layer( "L2" )
+        L2.expose_Images( self.Images, Sig_i=None )
+        self.assertEqual( L2.Sig_iList, [None]*4 )
+
+    def test_read_only(self):
+        self.L.expose_Images( self.Images, Energy=20 )
+        with self.assertRaises(ValueError):
+            self.L.Exposures["Energy"][0] = 99
+        with self.assertRaises(ValueError):
+            self.L.EnergyList[0] = 99
+        self.L.get_Exposures(writable=True)["Energy"] *= 1.5
+        self.assertEqual( list(self.L.EnergyList), [30]*4 )
+
+    def test_reading_a_copy_does_not_copy_the_table(self):
+        self.L.expose_Images( self.Images, Energy=20 )
+        J2 = self.Job.copy()
+        L2 = J2.LayerList[0]
+        L2.Exposures, L2.EnergyList, L2.Sig_iList, str(L2)
+        self.assertIs( L2._Exposures, self.L._Exposures )
+        L2.get_Exposures(writable=True)["Energy"] = 25
+        self.assertIsNot( L2._Exposures, self.L._Exposures )
+        self.assertEqual( list(self.L.EnergyList), [20]*4 )
+        self.assertEqual( list(L2.EnergyList), [25]*4 )
+
+#end class(ExposureTableTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
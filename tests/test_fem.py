@@ -0,0 +1,70 @@
+"""
+Tests of `Job.generate_FEM()`: Focus-Exposure Matrices of cloned Images.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_fem.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator.genlib import _grid_IDs
+
+asml.unset_WARN()
+
+
+class FEMTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.Cell.set_CellSize( [5, 5] )
+        self.Template = self.Job.Image( "RESOLUTION_TEST", "R1", sizeXY=[4,4], shiftXY=[1,2] )
+
+    def test_grid_ids(self):
+        for ni, nj in ( (1,1), (3,5), (10,10), (12,101), (1000,3) ):
+            IDs = _grid_IDs( self.Template, ni, nj )
+            self.assertEqual( IDs.shape, (ni, nj) )
+            self.assertTrue( all( len(ID) <= 15 for ID in IDs.ravel() ), IDs.ravel()[-1] )
+            self.assertEqual( len( set(IDs.ravel()) ), ni*nj )
+        self.assertEqual( _grid_IDs( self.Template, 3, 12 )[2,11], "RESOLUTIO_E2F11" )
+        self.assertEqual( _grid_IDs( self.Job.Image( "A", "R1" ), 2, 2, tags=("X","Y") )[1,0], "A_X1Y0" )
+
+    def test_clones(self):
+        Energies, Focuses = [18, 20, 22], [-0.2, -0.1, 0.0, 0.1, 0.2]
+        images, L = self.Job.generate_FEM( self.Template, Energies, Focuses, repeat=2, NA=0.48 )
+        self.assertEqual( images.shape, (3, 5) )
+        self.assertEqual( len(self.Job.ImageList), 1 + 15 )
+        self.assertEqual( L.get_LayerID(), "FEM" )
+        self.assertEqual( L.ImageList, list(images.ravel()) )
+        for i, E in enumerate(Energies):
+            for j, F in enumerate(Focuses):
+                I = images[i,j]
+                n = L.ImageList.index(I)
+                self.assertEqual( (L.EnergyList[n], L.FocusList[n], L.NAList[n]), (E, F, 0.48) )
+                self.assertEqual( (I.get_ReticleID(), list(I.sizeXY), list(I.shiftXY)), ("R1", [4,4], [1,2]) )
+                self.assertEqual( len(I.Cells), 2 )
+                # Focus along a row, Energy from row to row, the repeats in a second block of rows:
+                self.assertEqual( [ c for c,r in I.Cells ], [ j-2, j-2 ] )
+                self.assertEqual( [ r for c,r in I.Cells ], [ i-2, i+1 ] )
+        # each Cell used once:
+        cells = [ tuple(c) for I in images.ravel() for c in I.Cells ]
+        self.assertEqual( len(set(cells)), 30 )
+        self.assertEqual( self.Template.Cells, [] )
+
+    def test_mask_and_layer(self):
+        L = self.Job.Layer( "MINE" )
+        M = asml.CellMask.Rectangle( self.Job.Cell, [-3,-3], [3,3] )
+        images, L2 = self.Job.generate_FEM( self.Template, [20, 21], [0.0, 0.1, 0.2], Layer=L, mask=M )
+        self.assertIs( L2, L )
+        self.assertEqual( [ list(I.Cells[0]) for I in images.ravel() ], [ [c,-3] for c in range(-3,3) ] )     # the mask's first row
+        with self.assertRaises(ValueError):     # not enough Cells
+            self.Job.generate_FEM( self.Template, np.arange(10), np.arange(10), mask=M )
+        with self.assertRaises(ValueError):     # does not fit on the wafer
+            self.Job.generate_FEM( self.Template, np.arange(40), [0] )
+
+#end class(FEMTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Tests of `Cell.iter_ValidCells()`: the same Cells as `get_ValidCells()`, in spiral, raster or serpentine order.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_itercells.py
+"""
+import os, sys, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+class IterCellsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.set_WaferProfile( "100mm" )
+        self.Job.Cell.set_CellSize( [10, 12] )
+        self.Job.Cell.set_MatrixShift( [2, -3] )
+        self.Job.Cell.set_FlatEdgeClearance( 2.0 )
+        self.valid = self.Job.Cell.get_ValidCells()
+
+    def rows(self, cells):
+        """Cells split into runs of the same row, in the order yielded."""
+        out = []
+        for c, r in cells:
+            if not out or out[-1][0] != r: out.append( (r, []) )
+            out[-1][1].append( c )
+        return out
+
+    def test_spiral(self):
+        self.assertEqual( list( self.Job.Cell.iter_ValidCells() ), self.valid )
+
+    def test_raster(self):
+        cells = list( self.Job.Cell.iter_ValidCells( order="raster" ) )
+        self.assertEqual( sorted(cells), sorted(self.valid) )
+        runs = self.rows( cells )
+        self.assertEqual( [r for r,cs in runs], sorted( set( r for c,r in self.valid ) ) )     # each row once, from the bottom up
+        self.assertTrue( all( cs == sorted(cs) for r,cs in runs ) )
+
+    def test_serpentine(self):
+        cells = list( self.Job.Cell.iter_ValidCells( order="serpentine" ) )
+        self.assertEqual( sorted(cells), sorted(self.valid) )
+        runs = self.rows( cells )
+        self.assertEqual( [r for r,cs in runs], sorted( set( r for c,r in self.valid ) ) )
+        # direction alternates with the row index, counted from the bottom of the grid:
+        bottom = self.Job.Cell.get_ValidCellMap()[1][0]
+        for r, cs in runs:
+            self.assertEqual( cs, sorted( cs, reverse=bool( (r - bottom) % 2 ) ), r )
+        self.assertTrue( any( cs[0] > cs[-1] for r,cs in runs ) )
+
+    def test_filters(self):
+        M = asml.CellMask.Rectangle( self.Job.Cell, [-2,-2], [2,2] )
+        where = lambda cr: cr[0] % 2 == 0
+        for order in ("spiral", "raster", "serpentine"):
+            cells = list( self.Job.Cell.iter_ValidCells( order=order, where=where, mask=M ) )
+            self.assertEqual( sorted(cells), sorted( cr for cr in self.valid if where(cr) and cr in M ), order )
+        it = self.Job.Cell.iter_ValidCells( order="raster" )
+        self.assertEqual( next(it), sorted( self.valid, key=lambda cr: (cr[1], cr[0]) )[0] )
+        with self.assertRaises(ValueError):
+            self.Job.Cell.iter_ValidCells( order="zigzag" )
+
+#end class(IterCellsTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
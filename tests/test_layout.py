@@ -0,0 +1,77 @@
+"""
+Tests of `Cell.plan_Layout()`: each layout's exposed Cells & usable Die must match `geomlib.die_count_map()` and the cover map.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_layout.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator.geomlib import die_count_map, _LayoutCache
+
+asml.unset_WARN()
+
+
+class LayoutTests(unittest.TestCase):
+
+    CellSizes = [ 10, [12, 8], 15 ]
+    NumberDiePerCell = [ [1,1], [2,2], [3,2] ]
+    MinNumberDie = [ 1, 3, 6 ]
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.set_WaferProfile( "100mm" )
+        self.Job.Cell.set_RoundEdgeClearance( 2.0 )
+        self.Job.Cell.set_FlatEdgeClearance( 3.0 )
+        self.Job.Cell.set_MatrixShift( [1, -2] )
+
+    def direct(self, cs, nd, mn):
+        C = self.Job.Cell
+        cols, rows, counts = die_count_map( cs, nd, C.get_MatrixShift(), self.Job.get_WaferDiameter(), C.get_RoundEdgeClearance(), C.get_FlatEdgeClearanceY() )
+        exposed = counts >= mn
+        return int( exposed.sum() ), int( counts[exposed].sum() )
+
+    def test_against_die_count_map(self):
+        table = self.Job.Cell.plan_Layout( self.CellSizes, self.NumberDiePerCell, self.MinNumberDie )
+        expected = {}
+        for cs in self.CellSizes:
+            cs = tuple( np.broadcast_to( np.asarray(cs, dtype=float), (2,) ) )
+            for nd in self.NumberDiePerCell:
+                for mn in self.MinNumberDie:
+                    if mn <= nd[0]*nd[1]: expected[ (cs, tuple(nd), mn) ] = self.direct( cs, nd, mn )
+        got = { ( tuple(t['CellSize']), tuple(t['NumberDiePerCell']), int(t['MinNumberDie']) ): (int(t['Cells']), int(t['Die'])) for t in table }
+        self.assertEqual( got, expected )
+        for t in table:
+            self.assertTrue( np.allclose( t['DieSize'], t['CellSize'] / t['NumberDiePerCell'] ) )
+        # sorted by most Die, then fewest Cells:
+        keys = [ (-int(t['Die']), int(t['Cells'])) for t in table ]
+        self.assertEqual( keys, sorted(keys) )
+
+    def test_matches_cover_map(self):
+        table = self.Job.Cell.plan_Layout( [[12, 8]], [[3,2]], [4] )
+        self.Job.Cell.set_CellSize( [12, 8] )
+        self.Job.Cell.set_NumberDiePerCell( [3, 2] )
+        self.Job.Cell.set_MinNumberDie( 4 )
+        cols, rows, exposed, dies = self.Job.Cell.get_CoverMap()
+        self.assertEqual( (table[0]['Cells'], table[0]['Die']), (exposed.sum(), dies[exposed].sum()) )
+
+    def test_defaults_cache_and_processes(self):
+        self.Job.Cell.set_NumberDiePerCell( [2, 2] )
+        self.Job.Cell.set_MinNumberDie( 3 )
+        table = self.Job.Cell.plan_Layout( [10, 10, 15] )      # duplicate size evaluated once
+        self.assertEqual( len(table), 2 )
+        self.assertTrue( all( tuple(t['NumberDiePerCell']) == (2,2) and t['MinNumberDie'] == 3 for t in table ) )
+        self.assertEqual( (table[ table['CellSize'][:,0] == 10 ]['Cells'][0], table[ table['CellSize'][:,0] == 10 ]['Die'][0]), self.direct( (10.,10.), (2,2), 3 ) )
+        _LayoutCache.clear()
+        table2 = self.Job.Cell.plan_Layout( [10, 15], processes=2 )
+        self.assertTrue( np.array_equal( table, table2 ) )
+        with self.assertRaises(ValueError):
+            self.Job.Cell.plan_Layout( [0.01] )
+
+#end class(LayoutTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
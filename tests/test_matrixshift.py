@@ -0,0 +1,64 @@
+"""
+Tests of `Cell.optimize_MatrixShift()`: the count for every candidate shift must match `get_ValidCells()` with that shift set.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_matrixshift.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+class MatrixShiftTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.set_WaferProfile( "100mm" )
+        self.Job.Cell.set_CellSize( [10, 12] )
+        self.Job.Cell.set_RoundEdgeClearance( 2.0 )
+        self.Job.Cell.set_FlatEdgeClearance( 1.0 )
+
+    def count(self, shift):
+        self.Job.Cell.set_MatrixShift( [float(shift[0]), float(shift[1])] )
+        return len( self.Job.Cell.get_ValidCells() )
+
+    def check(self, resolution):
+        best, shiftX, shiftY, counts = self.Job.Cell.optimize_MatrixShift( resolution=resolution )
+        self.assertEqual( counts.shape, (len(shiftY), len(shiftX)) )
+        self.assertTrue( np.all( (shiftX >= -5) & (shiftX < 5) ) and np.all( (shiftY >= -6) & (shiftY < 6) ) )
+        rng = np.random.default_rng(0)
+        for j, i in zip( rng.integers( 0, len(shiftY), 12 ), rng.integers( 0, len(shiftX), 12 ) ):
+            self.assertEqual( counts[j,i], self.count( [shiftX[i], shiftY[j]] ), (shiftX[i], shiftY[j]) )
+        # the best shift has the most Cells, and is the closest to zero of those:
+        self.assertEqual( self.count(best), counts.max() )
+        j, i = np.nonzero( counts == counts.max() )
+        self.assertAlmostEqual( np.hypot(*best), np.hypot( shiftX[i], shiftY[j] ).min() )
+        return best, counts
+
+    def test_counts(self):
+        best, counts = self.check( 1.0 )
+        self.assertGreater( counts.max(), counts.min() )
+        self.assertLessEqual( self.count([0,0]), counts.max() )
+
+    def test_expose_edge_die(self):
+        self.Job.set_ExposeEdgeDie()
+        self.check( [2.0, 1.5] )
+
+    def test_apply_and_processes(self):
+        best, shiftX, shiftY, counts = self.Job.Cell.optimize_MatrixShift( resolution=2.0 )
+        self.assertEqual( list(self.Job.Cell.get_MatrixShift()), [0, 0] )     # unchanged
+        best2, shiftX2, shiftY2, counts2 = self.Job.Cell.optimize_MatrixShift( resolution=2.0, processes=2, apply=True )
+        self.assertTrue( np.array_equal( counts, counts2 ) )
+        self.assertEqual( list(self.Job.Cell.get_MatrixShift()), best )
+        with self.assertRaises(ValueError):
+            self.Job.Cell.optimize_MatrixShift( resolution=0 )
+
+#end class(MatrixShiftTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""
+Memory of the Image, Layer, Mark & Strategy objects, which use __slots__, in a
+large generated job.  Each object is compared with an object of an unslotted
+class holding the same attributes in a __dict__, as these classes were before
+__slots__; both are measured with tracemalloc.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_memory.py
+or, to print the sizes for larger jobs:
+    python tests/test_memory.py
+"""
+import os, sys, copy, pickle, tracemalloc, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator.copylib import _attributes
+
+asml.unset_WARN()
+
+
+def build(n):
+    """Job with an n x n Focus-Exposure Matrix on one Layer, plus alignment marks."""
+    MyJob = asml.Job()
+    MyJob.Cell.set_CellSize( [1.1, 1.1] )
+    Res = MyJob.Image( "UCSB_Res", "UCSB-OPC1", sizeXY=[1.0, 1.0], shiftXY=[4, 5] )
+    Images, FEM = MyJob.generate_FEM( Res, np.linspace(15, 25, n), np.linspace(-0.4, 0.4, n) )
+    E = MyJob.Alignment.Mark( "E", "PM", waferXY=[42.5, 0.0] )
+    W = MyJob.Alignment.Mark( "W", "PM", waferXY=[-42.5, 0.0] )
+    ALL = MyJob.Alignment.Strategy( "ALL", marks=[E, W] )
+    FEM.set_GlobalAlignment( ALL )
+    FEM.expose_Marks( marks=[E, W], Energy=21, Focus=-0.10 )
+    return MyJob
+
+
+def objects(MyJob):
+    """The slotted objects of `MyJob`."""
+    objs = list( MyJob.ImageList ) + list( MyJob.LayerList ) + list( MyJob.Alignment.MarkList ) + list( MyJob.Alignment.StrategyList )
+    for L in MyJob.LayerList:
+        objs += [ M.Image for M in L.MarkList if M.Image is not None ]
+    return objs
+
+
+def measure(objs):
+    """Return the bytes allocated for (slotted, unslotted) objects with the same attributes as `objs`.  Only the objects (and their __dict__) are new - the attribute values are shared."""
+    unslotted = { cls: type(cls.__name__, (object,), {}) for cls in set( type(o) for o in objs ) }
+    def alloc(make):
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        new = [ make(o) for o in objs ]
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        return size
+    def slotted(o):
+        new = object.__new__( type(o) )
+        for name, value in _attributes(o): setattr(new, name, value)
+        return new
+    def withdict(o):
+        new = object.__new__( unslotted[type(o)] )
+        for name, value in _attributes(o): setattr(new, name, value)
+        return new
+    return alloc(slotted), alloc(withdict)
+
+
+class MemoryTests(unittest.TestCase):
+
+    def test_no_dict(self):
+        for o in objects( build(3) ):
+            self.assertFalse( hasattr(o, "__dict__"), type(o).__name__ )
+
+    def test_copy_and_pickle(self):
+        MyJob = build(3)
+        for J in ( MyJob.copy(), pickle.loads( pickle.dumps(MyJob) ) ):
+            self.assertEqual( [ I.ImageID for I in J.ImageList ], [ I.ImageID for I in MyJob.ImageList ] )
+            self.assertEqual( len(J.Alignment.MarkList), 2 )
+
+    def test_smaller(self):
+        slotted, withdict = measure( objects( build(10) ) )
+        self.assertLess( slotted, withdict )
+
+#end class(MemoryTests)
+
+
+if __name__ == "__main__":
+    for n in (10, 20, 40):
+        objs = objects( build(n) )
+        slotted, withdict = measure( objs )
+        print( "FEM %ix%i: %i objects    __slots__: %8.1f kB    __dict__: %8.1f kB    saving: %.0f%%" % (
+                n, n, len(objs), slotted/1e3, withdict/1e3, 100.0*(withdict-slotted)/withdict ) )
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Tests of the spatial index `geomlib.GridIndex` and the shot-overlap checks built on it.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_overlaps.py
+"""
+import os, sys, shutil, tempfile, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator.geomlib import GridIndex
+
+asml.unset_WARN()
+
+
+def brute_pairs(x0, y0, x1, y1, touching):
+    """Every overlapping pair [i,j], i<j, by testing all pairs."""
+    if touching:
+        hit = (x0[:,None] <= x1[None,:]) & (x1[:,None] >= x0[None,:]) & (y0[:,None] <= y1[None,:]) & (y1[:,None] >= y0[None,:])
+    else:
+        hit = (x0[:,None] < x1[None,:]) & (x1[:,None] > x0[None,:]) & (y0[:,None] < y1[None,:]) & (y1[:,None] > y0[None,:])
+    return sorted( (i,j) for i,j in zip( *np.nonzero(hit) ) if i < j )
+
+
+def random_rects(rng, N):
+    """Rectangles on a 0.5 mm grid, so that many share an edge or corner exactly."""
+    x0, y0 = rng.integers( -40, 40, N ) * 0.5, rng.integers( -40, 40, N ) * 0.5
+    return x0, y0, x0 + rng.integers( 1, 12, N ) * 0.5, y0 + rng.integers( 1, 12, N ) * 0.5
+
+
+class GridIndexTests(unittest.TestCase):
+
+    def test_pairs_match_brute_force(self):
+        rng = np.random.default_rng(0)
+        for trial in range(20):
+            rects = random_rects( rng, 80 )
+            for binsize in (None, 0.5, 2.5, 7.0, 100.0):
+                index = GridIndex( *rects, binsize=binsize )
+                for touching in (False, True):
+                    pairs = sorted( map( tuple, index.overlapping_pairs(touching=touching).tolist() ) )
+                    self.assertEqual( pairs, brute_pairs( *rects, touching=touching ), (trial, binsize, touching) )
+
+    def test_query_matches_brute_force(self):
+        rng = np.random.default_rng(1)
+        rects, boxes = random_rects( rng, 60 ), random_rects( rng, 25 )
+        index = GridIndex( *rects )
+        for touching in (False, True):
+            box, rect = index.query( *boxes, touching=touching )
+            found = sorted( zip( box.tolist(), rect.tolist() ) )
+            x0, y0, x1, y1 = rects
+            expected = []
+            for b, (bx0, by0, bx1, by1) in enumerate( zip(*boxes) ):
+                if touching: hit = (x0 <= bx1) & (x1 >= bx0) & (y0 <= by1) & (y1 >= by0)
+                else:        hit = (x0 < bx1) & (x1 > bx0) & (y0 < by1) & (y1 > by0)
+                expected += [ (b, r) for r in np.nonzero(hit)[0].tolist() ]
+            self.assertEqual( found, expected )
+            self.assertEqual( index.any_overlap( *boxes, touching=touching ).tolist(), [ any( b == n for b,r in expected ) for n in range(25) ] )
+
+    def test_touching_edges(self):
+        # a row of abutting rectangles, plus one touching the last at a corner only:
+        index = GridIndex( [0, 10, 20, 30], [0, 0, 0, 10], [10, 20, 30, 40], [10, 10, 10, 20], binsize=10 )
+        self.assertEqual( index.overlapping_pairs().tolist(), [] )
+        self.assertEqual( index.overlapping_pairs(touching=True).tolist(), [ [0,1], [1,2], [2,3] ] )
+
+    def test_empty(self):
+        index = GridIndex( [], [], [], [] )
+        self.assertEqual( len(index), 0 )
+        self.assertEqual( index.overlapping_pairs().shape, (0,2) )
+        self.assertEqual( index.any_overlap( [0], [0], [1], [1] ).tolist(), [False] )
+
+#end class(GridIndexTests)
+
+
+
+class ShotOverlapTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.Job = asml.Job()
+        self.Job.Cell.set_CellSize( [10, 10] )
+        A = self.Job.Image( "A", "R1", sizeXY=[10,10] )
+        A.distribute( [[0,0], [1,0]] )          # abutting, not overlapping
+        self.L = self.Job.Layer( "L1" )
+        self.L.expose_Image( A )
+
+    def tearDown(self):
+        shutil.rmtree( self.dir )
+
+    def test_abutting_shots(self):
+        self.assertEqual( self.L.get_ShotOverlaps(), [] )
+        self.assertEqual( len( self.L.get_ShotOverlaps(touching=True) ), 1 )
+        self.Job.export( os.path.join(self.dir, "ok.txt"), check_overlaps=True )
+
+    def test_export_raises_on_collision(self):
+        B = self.Job.Image( "B", "R1", sizeXY=[4,4] )
+        B.distribute( [0,0], shiftXY=[4,0] )    # reaches X = 6 mm, into Image A in Cell [1,0]
+        self.L.expose_Image( B )
+        overlaps = self.L.get_ShotOverlaps()
+        self.assertEqual( sorted( (a[0].ImageID, list(a[1]), b[0].ImageID, list(b[1])) for a,b in overlaps ),
+                          [ ("A", [0,0], "B", [0,0]), ("A", [1,0], "B", [0,0]) ] )
+        path = os.path.join( self.dir, "bad.txt" )
+        with self.assertRaises(ValueError) as e:
+            self.Job.export( path, check_overlaps=True )
+        self.assertIn( "Image `B` in Cell [0,0]", str(e.exception) )
+        self.assertFalse( os.path.exists(path) )
+        self.Job.export( path )                 # not checked by default
+
+#end class(ShotOverlapTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
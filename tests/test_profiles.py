@@ -0,0 +1,123 @@
+"""
+Tests of the machine profiles: TOML/JSON files of settings laid over the built-in Defaults.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_profiles.py
+"""
+import os, sys, json, shutil, tempfile, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator import profilelib
+
+asml.unset_WARN()
+
+
+TOML = '''
+name = "Test tool"
+WFR_DIAMETER = 150.0
+WFR_FLAT_LENGTH = 57.5
+CELL_SIZE = [5.0, 5.5]
+RETICLE_SIZE = 5
+[ProcessData]
+LENS_REDUCTION = 5.0
+[Timing]
+StageSpeed = 250.0
+'''
+
+
+class ProfileTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree( self.dir )
+
+    def write(self, name, text):
+        path = os.path.join( self.dir, name )
+        with open(path, 'w') as f:
+            f.write( text )
+        return path
+
+    def check(self, D):
+        self.assertEqual( D.Profile_Name, "Test tool" )
+        self.assertEqual( D.WFR_DIAMETER, 150.0 )
+        self.assertEqual( D.CELL_SIZE, [5.0, 5.5] )
+        self.assertEqual( D.RETICLE_SIZE, 5 )
+        # tables set the attributes with that prefix:
+        self.assertEqual( D.ProcessData_LENS_REDUCTION, 5.0 )
+        self.assertEqual( D.Timing_StageSpeed, 250.0 )
+        # everything else is the built-in value:
+        self.assertEqual( D.WFR_NOTCH, asml.get_Defaults().WFR_NOTCH )
+
+    def test_toml(self):
+        D = asml.load_MachineProfile( self.write("tool.toml", TOML) )
+        self.check( D )
+        MyJob = asml.Job( profile=os.path.join(self.dir, "tool.toml") )
+        self.check( MyJob.defaults )
+        self.assertEqual( MyJob.get_WaferDiameter(), 150.0 )
+
+    def test_json(self):
+        data = { "name": "Test tool", "WFR_DIAMETER": 150.0, "WFR_FLAT_LENGTH": 57.5, "CELL_SIZE": [5.0, 5.5], "RETICLE_SIZE": 5,
+                 "ProcessData": {"LENS_REDUCTION": 5.0}, "Timing": {"StageSpeed": 250.0} }
+        self.check( asml.load_MachineProfile( self.write("tool.json", json.dumps(data)) ) )
+
+    def test_builtin_profiles(self):
+        self.assertIn( "Example_150mm", asml.get_MachineProfiles() )
+        self.assertEqual( asml.Job( profile="Example_150mm" ).defaults.WFR_DIAMETER, 150.0 )
+        with self.assertRaises(ValueError):
+            asml.load_MachineProfile( "No_Such_Profile" )
+
+    def test_over_defaults(self):
+        base = asml.get_Defaults().copy()
+        base.WFR_NOTCH = "Y"
+        D = asml.load_MachineProfile( self.write("tool.toml", TOML), defaults=base )
+        self.assertEqual( D.WFR_NOTCH, "Y" )
+        self.assertEqual( D.WFR_DIAMETER, 150.0 )
+        self.assertNotEqual( base.WFR_DIAMETER, 150.0 )     # not changed
+
+    def test_unknown_key(self):
+        for text in ( "Bogus = 1", "[Timing]\nBogus = 1" ):
+            with self.assertRaises(ValueError):
+                asml.load_MachineProfile( self.write("bad.toml", text) )
+
+    def test_wrong_type(self):
+        for text in ( 'WFR_DIAMETER = "abc"', 'WFR_DIAMETER = true', 'RETICLE_SIZE = 6.5', 'WFR_NOTCH = 1',
+                      'CELL_SIZE = [1, 2, 3]', 'CELL_SIZE = 5', 'CELL_SIZE = ["a", "b"]' ):
+            with self.assertRaises(ValueError, msg=text):
+                asml.load_MachineProfile( self.write("bad.toml", text) )
+        # integers are numbers:
+        self.assertEqual( asml.load_MachineProfile( self.write("ok.toml", "WFR_DIAMETER = 100") ).WFR_DIAMETER, 100 )
+
+    def test_edited_file(self):
+        path = self.write( "tool.toml", "WFR_DIAMETER = 100.0" )
+        self.assertEqual( asml.load_MachineProfile(path).WFR_DIAMETER, 100.0 )
+        self.write( "tool.toml", "WFR_DIAMETER = 200.0" )
+        self.assertEqual( asml.load_MachineProfile(path).WFR_DIAMETER, 200.0 )
+
+    def test_disk_cache(self):
+        base = asml.get_Defaults().copy()
+        base.WaferProfile_CacheDir = os.path.join( self.dir, "cache" )
+        path = self.write( "tool.toml", "WFR_DIAMETER = 100.0" )
+        profilelib._Profiles.clear()
+        asml.load_MachineProfile( path, defaults=base )
+        files = os.listdir( base.WaferProfile_CacheDir )
+        self.assertEqual( len(files), 1 )
+        # an edited file gets a new cache entry:
+        self.write( "tool.toml", "WFR_DIAMETER = 200.0" )
+        self.assertEqual( asml.load_MachineProfile( path, defaults=base ).WFR_DIAMETER, 200.0 )
+        self.assertEqual( len( os.listdir(base.WaferProfile_CacheDir) ), 2 )
+        # settings read back from the disk cache are checked again:
+        profilelib._Profiles.clear()
+        with open( os.path.join(base.WaferProfile_CacheDir, files[0]), 'w' ) as f:
+            json.dump( {"Bogus": 1}, f )
+        self.write( "tool.toml", "WFR_DIAMETER = 100.0" )
+        with self.assertRaises(ValueError):
+            asml.load_MachineProfile( path, defaults=base )
+
+#end class(ProfileTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
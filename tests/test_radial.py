@@ -0,0 +1,81 @@
+"""
+Tests of `Job.generate_RadialCompensation()`: Energy & Focus varying with the radius on the wafer.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_radial.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+class RadialTests(unittest.TestCase):
+
+    def job(self, maxdist=None):
+        D = asml.get_Defaults().copy()
+        if maxdist: D.ImageDistribution_MaxDistPerImage = maxdist
+        MyJob = asml.Job( defaults=D )
+        MyJob.Cell.set_CellSize( [10, 10] )
+        Template = MyJob.Image( "RADIAL_TEMPLATE", "R1", sizeXY=[4,4] )
+        return MyJob, Template
+
+    def shot_radius(self, MyJob, I):
+        return [ np.hypot( c*10 + s[0], r*10 + s[1] ) for (c,r), s in zip(I.Cells, I.Shifts) ]
+
+    def test_bands(self):
+        MyJob, Template = self.job()
+        images, radii, L = MyJob.generate_RadialCompensation( Template, [0, 30, 45], [20, 20, 23], Focuses=[0, 0, -0.1], bands=5 )
+        # every valid Cell exposed once:
+        cells = [ tuple(c) for I in images for c in I.Cells ]
+        self.assertEqual( sorted(cells), sorted( map(tuple, MyJob.Cell.get_ValidCells()) ) )
+        # each Image's shots within its band, exposed with the profile at the band center:
+        edges = np.linspace( 0, max( r for I in images for r in self.shot_radius(MyJob, I) ), 6 )
+        for n, (I, rc) in enumerate( zip(images, radii) ):
+            b = int( I.ImageID.split("_R")[-1] )
+            self.assertAlmostEqual( rc, (edges[b] + edges[b+1]) / 2 )
+            self.assertTrue( all( edges[b] - 1e-6 <= r <= edges[b+1] + 1e-6 for r in self.shot_radius(MyJob, I) ) )
+            self.assertAlmostEqual( L.EnergyList[n], np.interp( rc, [0, 30, 45], [20, 20, 23] ) )
+            self.assertAlmostEqual( L.FocusList[n], np.interp( rc, [0, 30, 45], [0, 0, -0.1] ) )
+        self.assertEqual( L.get_LayerID(), "RADIAL" )
+        self.assertEqual( L.EnergyList[0], 20 )
+        self.assertGreater( L.EnergyList[-1], 20 )
+
+    def test_split_at_max_distributions(self):
+        maxdist = 7
+        MyJob, Template = self.job( maxdist )
+        images, radii, L = MyJob.generate_RadialCompensation( Template, [0, 50], [20, 25], bands=3, shiftXY=[1,1] )
+        self.assertTrue( all( 0 < len(I.Cells) <= maxdist for I in images ) )
+        cells = [ tuple(c) for I in images for c in I.Cells ]
+        self.assertEqual( sorted(cells), sorted( map(tuple, MyJob.Cell.get_ValidCells()) ) )
+        self.assertTrue( all( s == (1,1) for I in images for s in I.Shifts ) )
+        # parts of one band share its radius & Energy, and only the last part is short:
+        bands = {}
+        for n, I in enumerate(images):
+            bands.setdefault( I.ImageID.rsplit("_R", 1)[1].split("-")[0], [] ).append( (len(I.Cells), radii[n], L.EnergyList[n]) )
+        self.assertEqual( len(bands), 3 )
+        self.assertGreater( max( len(parts) for parts in bands.values() ), 1 )
+        for ID, parts in bands.items():
+            self.assertTrue( all( p[0] == maxdist for p in parts[:-1] ), ID )
+            self.assertEqual( len( set( (p[1], p[2]) for p in parts ) ), 1, ID )
+        self.assertTrue( all( len(I.ImageID) <= 15 for I in images ) )
+        self.assertEqual( len( set( I.ImageID for I in images ) ), len(images) )
+
+    def test_band_edges_and_mask(self):
+        MyJob, Template = self.job()
+        M = asml.CellMask.Rectangle( MyJob.Cell, [-2,-2], [2,2] )
+        images, radii, L = MyJob.generate_RadialCompensation( Template, [0, 50], [20, 30], bands=[0, 10, 20], mask=M )
+        # shots beyond 20 mm are not exposed, and the Cell at 10 mm is in the outer band:
+        self.assertEqual( sorted( len(I.Cells) for I in images ), [1, 8] )
+        self.assertEqual( list(radii), [5.0, 15.0] )
+        with self.assertRaises(ValueError):
+            MyJob.generate_RadialCompensation( Template, [10, 0], [20, 30] )
+
+#end class(RadialTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""
+Tests of the reticle index behind `Job.get_Reticles()`: it must match a scan of the ImageList as Images are added and change reticle.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_reticles.py
+"""
+import os, sys, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+def scan(MyJob):
+    """{ ReticleID : sorted ImageIDs } from the ImageList."""
+    out = {}
+    for I in MyJob.ImageList:
+        out.setdefault( I.get_ReticleID(), [] ).append( I.ImageID )
+    return { R: sorted(IDs) for R, IDs in out.items() }
+
+
+def indexed(MyJob):
+    return { R: sorted( I.ImageID for I in Imgs ) for R, Imgs in MyJob.get_Reticles().items() }
+
+
+class ReticleIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.A = self.Job.Image( "A", "R1" )
+        self.B = self.Job.Image( "B", "R1" )
+        self.C = self.Job.Image( "C", "R2" )
+
+    def test_added_images(self):
+        self.assertEqual( indexed(self.Job), { "R1": ["A", "B"], "R2": ["C"] } )
+        self.assertEqual( self.Job.get_ReticleIDs(), ["R1", "R2"] )
+        self.Job.Image( asml.Images.PM )
+        self.assertEqual( indexed(self.Job), scan(self.Job) )
+        self.assertEqual( self.Job.get_ReticleImages( "NOPE" ), [] )
+
+    def test_set_reticle_id(self):
+        self.B.set_ReticleID( "R2" )
+        self.assertEqual( indexed(self.Job), { "R1": ["A"], "R2": ["B", "C"] } )
+        self.A.set_ReticleID( "R3" )
+        self.assertEqual( indexed(self.Job), scan(self.Job) )
+        self.assertNotIn( "R1", self.Job.get_Reticles() )       # no Images left on it
+        self.assertEqual( self.Job.get_ReticleIDs(), ["R2", "R3"] )
+        self.A.set_ReticleID( "R3" )                            # unchanged
+        self.assertEqual( self.Job.get_ReticleImages("R3"), [self.A] )
+        with self.assertRaises(ValueError):
+            self.A.set_ReticleID( "" )
+        self.assertEqual( indexed(self.Job), scan(self.Job) )
+
+    def test_copy(self):
+        J2 = self.Job.copy()
+        J2.ImageList[0].set_ReticleID( "R9" )
+        self.assertEqual( indexed(J2), scan(J2) )
+        self.assertEqual( indexed(self.Job), { "R1": ["A", "B"], "R2": ["C"] } )
+        self.assertTrue( all( I.parent is J2 for Imgs in J2.get_Reticles().values() for I in Imgs ) )
+
+#end class(ReticleIndexTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests of the stage-route heuristics in `routelib` and `Layer.optimize_Route()`.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_route.py
+"""
+import os, sys, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator import routelib
+
+asml.unset_WARN()
+
+
+def build():
+    """Job with two Images on one Layer, the first also exposed on a second Layer."""
+    MyJob = asml.Job()
+    MyJob.Cell.set_CellSize( [10, 10] )
+    A = MyJob.Image( "A", "R1", sizeXY=[3,3] )
+    B = MyJob.Image( "B", "R1", sizeXY=[2,2], shiftXY=[4,4] )
+    rng = np.random.default_rng(3)
+    A.distribute( rng.permutation( [ [c,r] for c in range(-3,4) for r in range(-3,4) ] ).tolist() )
+    B.distribute( [ [c,r] for c in range(-2,3) for r in (-2, 2) ] )
+    L1 = MyJob.Layer( "L1" )
+    L1.expose_Images( [A, B] )
+    L2 = MyJob.Layer( "L2" )
+    L2.expose_Image( A )
+    return MyJob
+
+
+class RouteTests(unittest.TestCase):
+
+    def test_routes_are_permutations(self):
+        rng = np.random.default_rng(0)
+        for N in (0, 1, 2, 3, 10, 57):
+            XY = rng.uniform( -50, 50, (N,2) )
+            for method in ("serpentine", "nearest", "2opt"):
+                for metric in ("euclidean", "chebyshev"):
+                    order = routelib.plan_route( XY, method=method, metric=metric )
+                    self.assertEqual( sorted(order.tolist()), list(range(N)), (N, method, metric) )
+
+    def test_two_opt_never_longer(self):
+        rng = np.random.default_rng(1)
+        for trial in range(20):
+            XY = rng.uniform( -50, 50, (30,2) )
+            for metric in ("euclidean", "chebyshev"):
+                for start in ( rng.permutation(30), routelib.serpentine_route(XY), routelib.nearest_neighbor_route(XY, metric=metric) ):
+                    order = routelib.two_opt( XY, start, metric=metric )
+                    self.assertEqual( sorted(order.tolist()), list(range(30)) )
+                    self.assertLessEqual( routelib.route_length(XY, order, metric), routelib.route_length(XY, start, metric) + 1e-9 )
+
+    def test_serpentine_grid(self):
+        XY = [ [x,y] for y in (0, 1, 2) for x in (2, 0, 1) ]
+        order = routelib.serpentine_route( XY )
+        self.assertEqual( [ XY[n] for n in order ], [ [0,0], [1,0], [2,0], [2,1], [1,1], [0,1], [0,2], [1,2], [2,2] ] )
+
+    def test_route_length(self):
+        XY = [ [0,0], [3,4], [3,0] ]
+        self.assertEqual( routelib.route_length(XY), 9.0 )
+        self.assertEqual( routelib.route_length(XY, metric="chebyshev"), 8.0 )
+        self.assertEqual( routelib.route_length(XY, order=[0,2,1]), 7.0 )
+        with self.assertRaises(ValueError):
+            routelib.route_length( XY, metric="manhattan" )
+
+    def test_optimize_route(self):
+        MyJob = build()
+        L1 = MyJob.LayerList[0]
+        before = { I.ImageID: sorted( zip( map(tuple, I.Cells), map(tuple, I.Shifts) ) ) for I in MyJob.ImageList }
+        shots, travel, travel_before = L1.optimize_Route( method="2opt" )
+        self.assertLess( travel, travel_before )
+        self.assertEqual( len(shots), 49 + 10 )
+        # each Image's shots together, in exposure order:
+        self.assertEqual( [ I.ImageID for I,c,s in shots ], ["A"]*49 + ["B"]*10 )
+        self.assertEqual( { I.ImageID: sorted( (tuple(c), tuple(s)) for J,c,s in shots if J is I ) for I in MyJob.ImageList }, before )
+        # not applied:
+        self.assertNotEqual( [ list(c) for I,c,s in shots if I.ImageID == "A" ], [ list(c) for c in MyJob.ImageList[0].Cells ] )
+        self.assertEqual( L1.optimize_Route()[2], travel_before )
+
+    def test_apply_keeps_distributions(self):
+        MyJob = build()
+        L1, L2 = MyJob.LayerList
+        before = { I.ImageID: sorted( zip( map(tuple, I.Cells), map(tuple, I.Shifts) ) ) for I in MyJob.ImageList }
+        shots, travel, travel_before = L1.optimize_Route( apply=True )
+        after = { I.ImageID: sorted( zip( map(tuple, I.Cells), map(tuple, I.Shifts) ) ) for I in MyJob.ImageList }
+        self.assertEqual( after, before )
+        # the Images are now in route order, so the route is the current order:
+        self.assertEqual( [ (I.ImageID, list(c)) for I,c,s in shots ], [ (I.ImageID, list(c)) for I in MyJob.ImageList for c in I.Cells ] )
+        self.assertAlmostEqual( L1.optimize_Route( method="serpentine" )[2], travel )
+        # Image "A" is also re-ordered on Layer L2, with the same shots:
+        self.assertAlmostEqual( L2.optimize_Route( method="serpentine" )[2], routelib.route_length( [ c for I,c,s in shots[:49] ] ) * 10 )
+        self.assertEqual( MyJob.get_CellExposures( [0,0], L2 ), [ (MyJob.ImageList[0], L2, [0,0]) ] )
+
+#end class(RouteTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Tests of the thread/context-local DEBUG, WARN & Defaults settings, and of each Job's own copy of the Defaults.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_settings.py
+"""
+import os, sys, threading, unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+class SettingsTests(unittest.TestCase):
+
+    def test_threads_do_not_interfere(self):
+        builtin = asml.get_Defaults().WFR_DIAMETER
+        barrier = threading.Barrier(2)
+        def work(diameter):
+            asml.Defaults.WFR_DIAMETER = diameter
+            barrier.wait()      # both threads have set their value
+            seen = asml.Defaults.WFR_DIAMETER
+            barrier.wait()
+            return seen, asml.Job().defaults.WFR_DIAMETER
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list( pool.map( work, [100.0, 200.0] ) )
+        self.assertEqual( results, [ (100.0, 100.0), (200.0, 200.0) ] )
+        self.assertEqual( asml.Defaults.WFR_DIAMETER, builtin )
+
+    def test_local_settings(self):
+        D = asml.get_Defaults().copy()
+        D.WFR_DIAMETER = 125.0
+        with asml.local_settings(warn=True, defaults=D):
+            self.assertTrue( asml.WARN() )
+            self.assertEqual( asml.Job().defaults.WFR_DIAMETER, 125.0 )
+            asml.Defaults.WFR_DIAMETER = 150.0
+            self.assertEqual( asml.Defaults.WFR_DIAMETER, 150.0 )
+        self.assertFalse( asml.WARN() )
+        self.assertEqual( D.WFR_DIAMETER, 125.0 )      # not changed by setting `Defaults` in the block
+        self.assertIsNot( asml.get_Defaults(), D )
+
+    def test_job_copy_has_own_defaults(self):
+        J = asml.Job()
+        J2 = J.copy()
+        J2.defaults.WFR_DIAMETER = 1.0
+        self.assertNotEqual( J.defaults.WFR_DIAMETER, 1.0 )
+
+#end class(SettingsTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests of `Job.export_Sweep()`: exporting job variants that differ in a few parameters.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_sweep.py
+"""
+import os, sys, json, shutil, tempfile, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+def build():
+    """Job with two Images on two Layers, the second with a lower-case LayerID."""
+    MyJob = asml.Job()
+    MyJob.Cell.set_CellSize( [10, 10] )
+    A = MyJob.Image( "A", "R1", sizeXY=[3,3] )
+    B = MyJob.Image( "B", "R1", sizeXY=[2,2], shiftXY=[4,4] )
+    A.distribute( [[0,0], [1,0], [0,1]] )
+    B.distribute( [[-1,-1], [2,2]] )
+    L1 = MyJob.Layer( "L1" )
+    L1.expose_Images( [A, B], Energy=20, Focus=0.0 )
+    L2 = MyJob.Layer( "L2" )
+    L2.set_LayerID( "lyr2" )
+    L2.expose_Image( A, Energy=25 )
+    return MyJob
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+class SweepTests(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.Job = build()
+
+    def tearDown(self):
+        shutil.rmtree( self.dir )
+
+    def path(self, *names):
+        return os.path.join( self.dir, *names )
+
+    def test_files_and_manifest(self):
+        grid = { "Energy:L1": [18, 22], "MatrixShift": [[0,0], [1,1], [2,2]] }
+        manifest = self.Job.export_Sweep( grid, directory=self.path("s") )
+        self.assertEqual( sorted( os.listdir(self.path("s")) ), [ "Job_%i.txt" % n for n in range(6) ] + ["Job_manifest.json"] )
+        with open( self.path("s", "Job_manifest.json") ) as f:
+            self.assertEqual( json.load(f), manifest )
+        self.assertEqual( manifest["parameters"], ["Energy:L1", "MatrixShift"] )
+        self.assertEqual( [ v["values"] for v in manifest["variants"][:3] ], [ {"Energy:L1": 18, "MatrixShift": s} for s in grid["MatrixShift"] ] )
+        self.assertIn( "22.000000", read( self.path("s", "Job_5.txt") ) )
+
+    def test_base_job_unchanged(self):
+        self.Job.export( self.path("before.txt") )
+        self.Job.export_Sweep( { "Energy:L1": [18, [30, 31]], "LayerShift:L1": [[1,1]] }, directory=self.path("s") )
+        self.Job.export( self.path("after.txt") )
+        self.assertEqual( read(self.path("before.txt")), read(self.path("after.txt")) )
+
+    def test_processes_match_serial(self):
+        grid = { "Focus:L1": [-0.1, 0.1], "comment": ["a", "b"] }
+        self.Job.export_Sweep( grid, directory=self.path("serial") )
+        self.Job.export_Sweep( grid, directory=self.path("pool"), processes=2 )
+        for name in sorted( os.listdir(self.path("serial")) ):
+            self.assertEqual( read(self.path("serial", name)), read(self.path("pool", name)), name )
+
+    def test_rejected_grid_writes_nothing(self):
+        for grid in ( { "Energy:L1": [18], "Bogus": [1] }, { "Energy:L1": [[1, 2, 3]] }, { "Energy:NOLAYER": [18] } ):
+            with self.assertRaises(ValueError):
+                self.Job.export_Sweep( grid, directory=self.path("s") )
+        self.assertFalse( os.path.exists(self.path("s")) )
+        # an existing variant file stops the sweep before anything is written:
+        os.makedirs( self.path("s") )
+        with open( self.path("s", "Job_1.txt"), 'w' ) as f: f.write("x")
+        with self.assertRaises(IOError):
+            self.Job.export_Sweep( { "Energy:L1": [18, 20, 22] }, directory=self.path("s") )
+        self.assertEqual( os.listdir(self.path("s")), ["Job_1.txt"] )
+
+    def test_lowercase_layer_id(self):
+        for key in ("Energy:lyr2", "Energy:LYR2"):
+            d = self.path(key.replace(":", "_"))
+            self.Job.export_Sweep( { key: [33] }, directory=d )
+            self.assertIn( "33.000000", read( os.path.join(d, "Job_0.txt") ) )
+
+#end class(SweepTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests of the tool-time estimates: `Layer.estimate_Time()` and `Job.estimate_Throughput()`.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_tooltime.py
+"""
+import os, sys, unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+
+asml.unset_WARN()
+
+
+class ToolTimeTests(unittest.TestCase):
+
+    def setUp(self):
+        self.Job = asml.Job()
+        self.Job.Cell.set_CellSize( [10, 10] )
+        A = self.Job.Image( "A", "R1", sizeXY=[3,3] )
+        B = self.Job.Image( "B", "R2", sizeXY=[3,3] )
+        A.distribute( [[0,0], [1,0]] )
+        B.distribute( [0,1] )
+        self.L = self.Job.Layer( "L1" )
+        self.L.expose_Images( [A, B], Energy=[20, 40] )
+
+    def test_by_hand(self):
+        t = self.L.estimate_Time()
+        self.assertEqual( (t["shots"], t["steps"], t["images"], t["reticles"]), (3, 2, 2, 2) )
+        self.assertEqual( t["travel"], 20.0 )          # 10 mm, then 10 mm diagonally with both axes moving at once
+        self.assertEqual( (t["image_changes"], t["reticle_changes"], t["marks"]), (1, 2, 0) )    # R1 -> R2, and back for the next wafer
+        self.assertAlmostEqual( t["dose_time"], (20 + 20 + 40)/400.0 + 3*0.05 )
+        self.assertAlmostEqual( t["stage_time"], 2*0.1 + 20/200.0 )
+        self.assertAlmostEqual( t["image_time"], 0.5 )
+        self.assertAlmostEqual( t["reticle_time"], 2*25.0 )
+        self.assertAlmostEqual( t["wafer_time"], t["dose_time"] + t["stage_time"] + t["image_time"] + t["reticle_time"] + t["align_time"] )
+
+    def test_timing_direction(self):
+        t = self.L.estimate_Time()
+        fast = self.L.estimate_Time( timing={"StageSpeed": 400.0, "Intensity": 800.0} )
+        self.assertLess( fast["stage_time"], t["stage_time"] )
+        self.assertLess( fast["dose_time"], t["dose_time"] )
+        self.assertEqual( fast["reticle_time"], t["reticle_time"] )
+        self.assertLess( self.L.estimate_Time( timing={"ReticleChange": 5.0} )["wafer_time"], t["wafer_time"] )
+        # more shots take longer:
+        self.Job.ImageList[1].distribute( [1,1] )
+        more = self.L.estimate_Time()
+        self.assertEqual( more["shots"], 4 )
+        self.assertGreater( more["wafer_time"], t["wafer_time"] )
+        with self.assertRaises(ValueError):
+            self.L.estimate_Time( timing={"Bogus": 1.0} )
+
+    def test_grouping_reticles_is_faster(self):
+        C = self.Job.Image( "C", "R1", sizeXY=[3,3], shiftXY=[5,0] )
+        D = self.Job.Image( "D", "R2", sizeXY=[3,3], shiftXY=[5,0] )
+        C.distribute( [-1,0] )
+        D.distribute( [-1,1] )
+        self.L.expose_Images( [C, D] )
+        t = self.L.estimate_Time()          # R1, R2, R1, R2
+        self.assertEqual( t["reticle_changes"], 4 )
+        A, B = self.Job.ImageList[:2]
+        self.L.set_ExposureOrder( [A, C, B, D] )
+        grouped = self.L.estimate_Time()
+        self.assertEqual( grouped["reticle_changes"], 2 )
+        self.assertEqual( grouped["shots"], t["shots"] )
+        self.assertLess( grouped["wafer_time"], t["wafer_time"] )
+
+    def test_throughput(self):
+        L2 = self.Job.Layer( "L2" )
+        L2.expose_Image( self.Job.ImageList[0] )
+        perlayer, lot = self.Job.estimate_Throughput( wafers=10 )
+        self.assertEqual( sorted(perlayer), ["L1", "L2"] )
+        for LayerID, t in perlayer.items():
+            self.assertAlmostEqual( t["lot_time"], 60.0 + 10*( 30.0 + t["wafer_time"] ) )
+        self.assertAlmostEqual( lot["lot_time"], perlayer["L1"]["lot_time"] + perlayer["L2"]["lot_time"] )
+        self.assertEqual( lot["shots"], 3 + 2 )
+        self.assertEqual( list( self.Job.estimate_Throughput( layers="L2" )[0] ), ["L2"] )
+
+#end class(ToolTimeTests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+"""
+Tests of the wafer profiles and the cached valid-Cell tables used by `Cell.get_ValidCells()`.
+
+Run from the package or tests directory:
+    python -m pytest tests/test_wafer.py
+"""
+import os, sys, glob, shutil, tempfile, unittest
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import ASML_JobCreator as asml
+from ASML_JobCreator import Wafer
+
+asml.unset_WARN()
+
+
+def spiral_valid_cells(MyJob):
+    """The valid Cells as found by the original loop in `Cell.get_ValidCells()`, spiraling out from Cell [0,0] - kept here as the reference."""
+    C, W = MyJob.Cell, MyJob.get_WaferProfile()
+    cell_x, cell_y = C.get_CellSize()
+    matrix_shift_x, matrix_shift_y = C.get_MatrixShift()
+    wafer_diameter = W.Diameter - 2*C.get_RoundEdgeClearance()
+    max_num_cell_x = np.floor(wafer_diameter/cell_x)
+    max_num_cell_y = np.floor(wafer_diameter/cell_y)
+    def get_cell_vertices(i, j):
+        center = np.array([i*cell_x, j*cell_y]) + np.array([matrix_shift_x, matrix_shift_y])
+        return [ center + np.array([sx*cell_x/2, sy*cell_y/2]) for sx,sy in ((1,1), (-1,1), (-1,-1), (1,-1)) ]
+    if W.Notch == "N":
+        Ac = np.rad2deg( np.arcsin( ((W.FlatLength - C.get_FlatEdgeClearance())/2) / (wafer_diameter/2) ) )
+    else:
+        Ac = W.NotchAngle
+    flat_edge_clearance_y = -1 * np.cos( np.deg2rad(Ac) ) * (wafer_diameter/2)
+
+    valid_cells = []
+    cell_index_i, cell_count_i, sign_i = 0, 0, -1
+    while cell_index_i < max_num_cell_x+1:
+        cell_index_j, cell_count_j, sign_j = 0, 0, -1
+        while cell_index_j < max_num_cell_y+1:
+            vertices = get_cell_vertices(cell_index_i, cell_index_j)
+            if not MyJob.ExposeEdgeDie:
+                if not np.any(np.linalg.norm(vertices, axis=1) > wafer_diameter/2):
+                    if not np.any( [y for x,y in vertices] < flat_edge_clearance_y ):
+                        valid_cells.append([cell_index_i, cell_index_j])
+            else:
+                if np.any( np.linalg.norm(vertices, axis=1) <= wafer_diameter/2 ):
+                    if np.any( [y for x,y in vertices] >= flat_edge_clearance_y ):
+                        valid_cells.append([cell_index_i, cell_index_j])
+            cell_count_j += 1
+            sign_j *= -1
+            cell_index_j = cell_index_j + cell_count_j * sign_j
+        cell_count_i += 1
+        sign_i *= -1
+        cell_index_i = cell_index_i + cell_count_i * sign_i
+    return valid_cells
+
+
+class ValidCellTests(unittest.TestCase):
+
+    def job(self, size, shift, wafer="100mm", edge=False, round=0.0, flat=0.0):
+        MyJob = asml.Job()
+        MyJob.set_WaferProfile( wafer )
+        MyJob.Cell.set_CellSize( size )
+        MyJob.Cell.set_MatrixShift( shift )
+        MyJob.Cell.set_RoundEdgeClearance( round )
+        MyJob.Cell.set_FlatEdgeClearance( flat )
+        MyJob.set_ExposeEdgeDie() if edge else MyJob.unset_ExposeEdgeDie()
+        return MyJob
+
+    def test_matches_spiral_loop(self):
+        for wafer in ("100mm", "150mm", "200mm"):
+            for size, shift in ( ([10,10], [0,0]), ([7,6], [3.5,3]), ([4.3,9.1], [1.2,-0.7]) ):
+                for edge in (False, True):
+                    for round, flat in ( (0,0), (3,5) ):
+                        MyJob = self.job( size, shift, wafer, edge, round, flat )
+                        self.assertEqual( MyJob.Cell.get_ValidCells(), spiral_valid_cells(MyJob), (wafer, size, shift, edge, round, flat) )
+
+    def test_disk_cache_round_trip(self):
+        d = tempfile.mkdtemp()
+        try:
+            D = asml.get_Defaults().copy()
+            D.WaferProfile_CacheDir = d
+            # a new WaferProfile, so that its in-memory cache is empty:
+            W = asml.WaferProfile( "test", 100.0, Notch="N", FlatLength=32.5 )
+            MyJob = asml.Job( defaults=D )
+            MyJob.set_WaferProfile( W )
+            MyJob.Cell.set_CellSize( [7,6] )
+            expected = spiral_valid_cells( MyJob )
+            self.assertEqual( MyJob.Cell.get_ValidCells(), expected )
+            files = glob.glob( os.path.join(d, "validcells_*.npz") )
+            self.assertEqual( len(files), 1 )       # from this Job's Defaults, not the current ones
+            # read back from the disk cache only, without calculating the table:
+            W._tables.clear()
+            from ASML_JobCreator import geomlib
+            calculate = geomlib.valid_cell_map
+            def fail(*args): raise AssertionError( "table was calculated, not loaded from the cache" )
+            geomlib.valid_cell_map = fail
+            try:
+                self.assertEqual( MyJob.Cell.get_ValidCells(), expected )
+            finally:
+                geomlib.valid_cell_map = calculate
+            self.assertEqual( len( os.listdir(d) ), 1 )
+        finally:
+            shutil.rmtree( d )
+
+    def test_no_disk_cache_by_default(self):
+        MyJob = asml.Job()
+        self.assertEqual( MyJob.defaults.WaferProfile_CacheDir, "" )
+        self.assertIsNone( Wafer._cache_path( "validcells", (1,), defaults=MyJob.defaults ) )
+
+    def test_cache_path_versioned(self):
+        D = asml.get_Defaults().copy()
+        D.WaferProfile_CacheDir = "somewhere"
+        path = Wafer._cache_path( "validcells", (1,), defaults=D )
+        old, Wafer._CodeVersion = Wafer._code_version(), "other"
+        try:
+            self.assertNotEqual( Wafer._cache_path( "validcells", (1,), defaults=D ), path )
+        finally:
+            Wafer._CodeVersion = old
+
+#end class(ValidCellTests)
+
+
+if __name__ == "__main__":
+    unittest.main()